@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 
 class Algorithm(ABC):
@@ -27,6 +27,56 @@ class Algorithm(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_last_signal(self, data: pd.DataFrame) -> Optional[Tuple[str, int]]:
+        """
+        Returns only the most recent signal and the index of the candle it occurred on,
+        without building the trend segments.
+
+        Args:
+            data (pd.DataFrame): The input DataFrame containing the data.
+
+        Returns:
+            Optional[Tuple[str, int]]: ("BUY" or "SELL", index), or None if no signal is found.
+        """
+        pass
+
+    @abstractmethod
+    def update(self, candle: Dict) -> Optional[str]:
+        """
+        Apply a single new or updated candle to the algorithm's streaming state.
+
+        Args:
+            candle (Dict): A candle with at least "timestamp", "high", "low" and "close".
+
+        Returns:
+            Optional[str]: The current signal, either "BUY", "SELL", or None.
+        """
+        pass
+
+    @abstractmethod
+    def update_from_frame(self, data: pd.DataFrame) -> Optional[str]:
+        """
+        Apply the candles of the DataFrame that the streaming state has not seen yet.
+
+        Args:
+            data (pd.DataFrame): The input DataFrame containing the data.
+
+        Returns:
+            Optional[str]: The current signal, either "BUY", "SELL", or None.
+        """
+        pass
+
+    @abstractmethod
+    def current_signal(self) -> Optional[str]:
+        """
+        Returns the last signal ("BUY" or "SELL") of the streaming state.
+
+        Returns:
+            Optional[str]: The last signal, either "BUY", "SELL", or None if no signal is found.
+        """
+        pass
+
     @abstractmethod
     def simulate_potential_profit(segments: List[Dict], labels: List[Dict]) -> float:
         """
@@ -0,0 +1,231 @@
+import math
+from collections import deque
+from typing import Optional
+
+
+class _StreamState:
+    """
+    Scalar follow line state after a candle has been applied.
+    """
+
+    __slots__ = (
+        "count",
+        "prev_close",
+        "atr",
+        "follow",
+        "trend",
+        "last_signal",
+        "last_signal_index",
+        "last_signal_value",
+        "signal_count",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = math.nan
+        self.atr = math.nan
+        self.follow = math.nan
+        self.trend = 0
+        self.last_signal = None
+        self.last_signal_index = None
+        self.last_signal_value = None
+        self.signal_count = 0
+
+
+class FollowLineStream:
+    """
+    Incremental version of the ToTheMoonAlgorithm follow line.
+
+    Every candle is applied in constant time: the Bollinger Band mean and
+    standard deviation are kept with a sliding Welford window, the ATR with
+    Wilder's RMA, and the follow line and trend carry over from the previous
+    candle.
+
+    The newest candle is kept "open": updating it again (same timestamp) replaces
+    it, and it is only committed to the rolling state once a newer candle
+    arrives. This matches the exchange behaviour of the last kline changing
+    until its interval closes.
+    """
+
+    def __init__(
+        self,
+        atr_period=5,
+        bb_period=21,
+        bb_deviation=1.00,
+        use_atr_filter=True,
+        show_signals=True,
+    ):
+        self.atr_period = atr_period
+        self.bb_period = bb_period
+        self.bb_deviation = bb_deviation
+        self.use_atr_filter = use_atr_filter
+        self.show_signals = show_signals
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all state so the next candle starts a new series.
+        """
+        # Committed closes of the Bollinger window (excluding the open candle).
+        self._window = deque()
+        self._window_mean = 0.0
+        self._window_m2 = 0.0
+        self._committed = _StreamState()
+        self._current = self._committed
+        self._current_close = None
+        self.last_timestamp = None
+
+    @property
+    def count(self) -> int:
+        """Number of candles seen, including the open one."""
+        return self._current.count
+
+    @property
+    def follow_line(self) -> float:
+        return self._current.follow
+
+    @property
+    def trend(self) -> int:
+        return self._current.trend
+
+    @property
+    def atr(self) -> float:
+        return self._current.atr
+
+    def update(self, candle) -> Optional[str]:
+        """
+        Apply a candle to the stream.
+
+        Args:
+            candle: Mapping (dict, pandas row) with "timestamp", "high", "low"
+                    and "close".
+
+        Returns:
+            Optional[str]: The current signal after the update.
+        """
+        timestamp = candle["timestamp"]
+        if self.last_timestamp is not None:
+            if timestamp < self.last_timestamp:
+                return self.current_signal()
+            if timestamp > self.last_timestamp:
+                self._commit()
+
+        self._current_close = float(candle["close"])
+        self._current = self._step(
+            self._committed,
+            float(candle["high"]),
+            float(candle["low"]),
+            self._current_close,
+        )
+        self.last_timestamp = timestamp
+        return self.current_signal()
+
+    def current_signal(self) -> Optional[str]:
+        """
+        The most recent "BUY"/"SELL" signal.
+
+        Mirrors ToTheMoonAlgorithm.get_last_signal: the first signal of a series
+        only opens the first trend segment, so a signal is reported from the
+        second one onwards.
+        """
+        if self._current.signal_count < 2:
+            return None
+        return self._current.last_signal
+
+    def current_signal_index(self) -> Optional[int]:
+        """Index of the candle that produced current_signal()."""
+        if self._current.signal_count < 2:
+            return None
+        return self._current.last_signal_index
+
+    def _commit(self):
+        """
+        Fold the open candle into the rolling window.
+        """
+        if self._current_close is None:
+            return
+        size = self.bb_period - 1
+        if size > 0:
+            if len(self._window) == size:
+                self._window_remove(self._window.popleft())
+            self._window.append(self._current_close)
+            self._window_add(self._current_close)
+        self._committed = self._current
+
+    def _window_add(self, value):
+        n = len(self._window)
+        delta = value - self._window_mean
+        self._window_mean += delta / n
+        self._window_m2 += delta * (value - self._window_mean)
+
+    def _window_remove(self, value):
+        n = len(self._window)
+        if n == 0:
+            self._window_mean = 0.0
+            self._window_m2 = 0.0
+            return
+        delta = value - self._window_mean
+        self._window_mean -= delta / n
+        self._window_m2 -= delta * (value - self._window_mean)
+
+    def _bands(self, close):
+        """
+        Bollinger Bands for the committed window plus the open close.
+        """
+        n = len(self._window) + 1
+        if n < self.bb_period or n < 2:
+            return math.nan, math.nan
+        delta = close - self._window_mean
+        mean = self._window_mean + delta / n
+        m2 = self._window_m2 + delta * (close - mean)
+        stdev = math.sqrt(max(m2, 0.0) / (n - 1))
+        return mean + stdev * self.bb_deviation, mean - stdev * self.bb_deviation
+
+    def _step(self, prev: _StreamState, high, low, close) -> _StreamState:
+        state = _StreamState()
+        state.count = prev.count + 1
+        state.prev_close = close
+
+        # Wilder's RMA of the true range (ewm(alpha=1/period, adjust=False)).
+        if prev.count == 0:
+            true_range = high - low
+            state.atr = true_range
+        else:
+            true_range = max(
+                high - low, abs(high - prev.prev_close), abs(low - prev.prev_close)
+            )
+            alpha = 1 / self.atr_period
+            state.atr = (1 - alpha) * prev.atr + alpha * true_range
+
+        # The first candle never produces a breakout, like the batch loop.
+        new_follow = prev.follow
+        if prev.count > 0:
+            upper, lower = self._bands(close)
+            if close > upper:
+                new_follow = low - state.atr if self.use_atr_filter else low
+                if not math.isnan(prev.follow) and new_follow < prev.follow:
+                    new_follow = prev.follow
+            elif close < lower:
+                new_follow = high + state.atr if self.use_atr_filter else high
+                if not math.isnan(prev.follow) and new_follow > prev.follow:
+                    new_follow = prev.follow
+        state.follow = new_follow
+
+        state.trend = prev.trend
+        if not math.isnan(prev.follow):
+            if new_follow > prev.follow:
+                state.trend = 1
+            elif new_follow < prev.follow:
+                state.trend = -1
+
+        state.last_signal = prev.last_signal
+        state.last_signal_index = prev.last_signal_index
+        state.last_signal_value = prev.last_signal_value
+        state.signal_count = prev.signal_count
+        if self.show_signals and prev.trend != state.trend and prev.trend != 0:
+            state.last_signal = "BUY" if state.trend == 1 else "SELL"
+            state.last_signal_index = state.count - 1
+            state.last_signal_value = new_follow
+            state.signal_count += 1
+
+        return state
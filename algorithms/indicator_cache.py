@@ -0,0 +1,103 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+import numpy as np
+
+
+class IndicatorCache:
+    """
+    Process-wide cache of indicator arrays (SMA, stdev, ATR, ...).
+
+    Entries are keyed by the indicator name, the fingerprints of its input
+    series and its parameters, e.g. ("sma", fingerprint(close), 21). The total
+    size of the cached arrays is kept under `max_bytes` by evicting the least
+    recently used entries. Cached arrays are read-only because they are shared
+    between callers.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(values) -> str:
+        """
+        Content hash of a series or array, including its dtype and length.
+        """
+        array = np.ascontiguousarray(np.asarray(values))
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{array.dtype.str}{array.shape}".encode("ascii"))
+        digest.update(memoryview(array).cast("B"))
+        return digest.hexdigest()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], np.ndarray]):
+        """
+        Return the cached array for `key`, computing and storing it on a miss.
+
+        Args:
+            key (Hashable): Indicator name, input fingerprints and parameters.
+            compute (Callable): Produces the indicator array (or Series) on a miss.
+
+        Returns:
+            np.ndarray: The read-only indicator array.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        # Computed outside the lock so slow indicators don't block other threads.
+        array = np.array(compute(), copy=True)
+        array.flags.writeable = False
+
+        with self._lock:
+            if key in self._entries or array.nbytes > self.max_bytes:
+                return array
+            self._entries[key] = array
+            self._bytes += array.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+        return array
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss counters and current memory use.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Shared by all algorithm instances of the process (orders, chart, sweeps).
+indicator_cache = IndicatorCache()
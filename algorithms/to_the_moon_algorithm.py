@@ -1,7 +1,10 @@
 from algorithms.base_algorithm import Algorithm
+from algorithms.follow_line_stream import FollowLineStream
+from algorithms.indicator_cache import IndicatorCache, indicator_cache
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional
+import math
+from typing import List, Dict, Optional, Tuple
 
 
 class ToTheMoonAlgorithm(Algorithm):
@@ -12,94 +15,209 @@ class ToTheMoonAlgorithm(Algorithm):
         bb_deviation=1.00,
         use_atr_filter=True,
         show_signals=True,
+        cache: IndicatorCache = None,
     ):
         self.atr_period = atr_period
         self.bb_period = bb_period
         self.bb_deviation = bb_deviation
         self.use_atr_filter = use_atr_filter
         self.show_signals = show_signals
+        self.cache = cache if cache is not None else indicator_cache
+        self._stream = None
 
     def calculate_follow_line(self, df):
         df = df.copy()
-        df["sma"] = df["close"].rolling(self.bb_period).mean()
-        df["stdev"] = df["close"].rolling(self.bb_period).std()
-        df["BBUpper"] = df["sma"] + (df["stdev"] * self.bb_deviation)
-        df["BBLower"] = df["sma"] - (df["stdev"] * self.bb_deviation)
-        df["atrValue"] = self.compute_atr(df)
-
-        n = len(df)
-        follow_line = [np.nan] * n
-        i_trend = [0] * n
-        buy = [np.nan] * n
-        sell = [np.nan] * n
-
-        for i in range(n):
-            if i == 0:
-                continue
+        arrays = self.compute_signal_arrays(df)
 
-            bb_signal = 0
-            if df["close"].iloc[i] > df["BBUpper"].iloc[i]:
-                bb_signal = 1
-            elif df["close"].iloc[i] < df["BBLower"].iloc[i]:
-                bb_signal = -1
+        df["Follow Line"] = arrays["follow_line"]
+        df["Buy"] = arrays["shapes_buy"]
+        df["Sell"] = arrays["shapes_sell"]
+        return df
 
-            new_follow = follow_line[i - 1]
+    def compute_signal_arrays(self, df, fingerprints=None) -> Dict[str, np.ndarray]:
+        """
+        Compute the follow line, trend and buy/sell signals as NumPy arrays.
 
-            if bb_signal == 1:
-                new_follow = (
-                    df["low"].iloc[i] - df["atrValue"].iloc[i]
-                    if self.use_atr_filter
-                    else df["low"].iloc[i]
-                )
-                if not np.isnan(follow_line[i - 1]) and new_follow < follow_line[i - 1]:
-                    new_follow = follow_line[i - 1]
-
-            elif bb_signal == -1:
-                new_follow = (
-                    df["high"].iloc[i] + df["atrValue"].iloc[i]
-                    if self.use_atr_filter
-                    else df["high"].iloc[i]
-                )
-                if not np.isnan(follow_line[i - 1]) and new_follow > follow_line[i - 1]:
-                    new_follow = follow_line[i - 1]
-
-            follow_line[i] = new_follow
-            prev_fl = follow_line[i - 1]
-            curr_fl = follow_line[i]
-            i_trend[i] = (
-                i_trend[i - 1]
-                if np.isnan(prev_fl)
-                else (
-                    1
-                    if curr_fl > prev_fl
-                    else -1 if curr_fl < prev_fl else i_trend[i - 1]
-                )
-            )
+        The OHLC columns are pulled into contiguous arrays once, the indicators
+        are computed on them and the follow line recurrence is evaluated in a
+        single pass. Everything that does not depend on the previous follow line
+        value (band breakouts, trend, signals, signal shapes) is vectorized.
 
-            if i_trend[i - 1] == -1 and i_trend[i] == 1:
-                buy[i] = 1.0
-            if i_trend[i - 1] == 1 and i_trend[i] == -1:
-                sell[i] = 1.0
+        Args:
+            df (pd.DataFrame): The input DataFrame containing OHLC data.
+            fingerprints (dict, optional): fingerprints(df), when the caller
+                evaluates the same data repeatedly.
 
-        shapes_buy = [np.nan] * n
-        shapes_sell = [np.nan] * n
+        Returns:
+            Dict[str, np.ndarray]: "follow_line", "trend", "buy", "sell" (boolean
+            signal masks), "shapes_buy", "shapes_sell" (plotting values, NaN where
+            there is no signal) and "atr". Float arrays are float32 when the
+            close column is float32 and float64 otherwise.
+        """
+        dtype = self.price_dtype(df)
+        close = np.ascontiguousarray(df["close"].to_numpy(dtype=dtype))
+        high = np.ascontiguousarray(df["high"].to_numpy(dtype=dtype))
+        low = np.ascontiguousarray(df["low"].to_numpy(dtype=dtype))
 
-        if self.show_signals:
-            for i in range(n):
-                if buy[i] == 1.0:
-                    shapes_buy[i] = follow_line[i] - df["atrValue"].iloc[i]
-                if sell[i] == 1.0:
-                    shapes_sell[i] = follow_line[i] + df["atrValue"].iloc[i]
-
-        df["Follow Line"] = follow_line
-        df["Buy"] = shapes_buy
-        df["Sell"] = shapes_sell
-        df.drop(
-            ["sma", "stdev", "BBUpper", "BBLower", "atrValue"], axis=1, inplace=True
+        upper, lower, atr = self.compute_indicator_arrays(df, fingerprints)
+        return self.follow_line_arrays(close, high, low, upper, lower, atr)
+
+    def compute_indicator_arrays(self, df, fingerprints=None):
+        """
+        Compute the Bollinger Bands and ATR used by the follow line.
+
+        Args:
+            df (pd.DataFrame): The input DataFrame containing OHLC data.
+            fingerprints (dict, optional): fingerprints(df); computed here when
+                omitted, once for all indicators of the call.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: upper band, lower band and ATR.
+        """
+        sma, stdev, atr = self.compute_indicator_inputs(df, fingerprints)
+        return self.bands(sma, stdev) + (atr,)
+
+    def compute_indicator_inputs(self, df, fingerprints=None):
+        """
+        The cached indicators the bands and the follow line are derived from.
+
+        Each depends on a single parameter (bb_period or atr_period), so
+        parameter sets that differ elsewhere share them; the bands are derived
+        with bands(), e.g. only on the slice of the data that is evaluated.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: read-only SMA, stdev and ATR.
+        """
+        dtype = self.price_dtype(df)
+        if fingerprints is None:
+            fingerprints = self.fingerprints(df)
+        close_key = fingerprints["close"]
+        sma = self.cache.get_or_compute(
+            ("sma", close_key, self.bb_period),
+            lambda: df["close"].rolling(self.bb_period).mean().to_numpy(dtype=dtype),
         )
-        return df
+        stdev = self.cache.get_or_compute(
+            ("stdev", close_key, self.bb_period),
+            lambda: df["close"].rolling(self.bb_period).std().to_numpy(dtype=dtype),
+        )
+        atr = self._atr(df, fingerprints=fingerprints)
+        return sma, stdev, atr
+
+    def bands(self, sma, stdev):
+        """
+        Upper and lower Bollinger Band of `bb_deviation` standard deviations.
+        """
+        deviation = stdev * stdev.dtype.type(self.bb_deviation)
+        return sma + deviation, sma - deviation
+
+    def fingerprints(self, df) -> Dict[str, str]:
+        """
+        Cache fingerprints of the high, low and close columns. Hashing is O(n),
+        so callers evaluating the same data many times (parameter sweeps) can
+        compute them once and pass them to compute_signal_arrays.
+        """
+        return {
+            column: self.cache.fingerprint(df[column])
+            for column in ("high", "low", "close")
+        }
+
+    @staticmethod
+    def price_dtype(df):
+        """
+        Float dtype used for the indicator and follow line arrays: float32 for
+        float32 price data (the reduced-precision storage option), else float64.
+        """
+        return np.float32 if df["close"].dtype == np.float32 else np.float64
 
-    def create_trend_segments(self, data):
+    def follow_line_arrays(self, close, high, low, upper, lower, atr):
+        """
+        Evaluate the follow line recurrence and derive trend and signals.
+
+        Args:
+            close, high, low (np.ndarray): Price arrays.
+            upper, lower (np.ndarray): Bollinger Band arrays.
+            atr (np.ndarray): ATR array.
+
+        Returns:
+            Dict[str, np.ndarray]: See compute_signal_arrays.
+        """
+        n = len(close)
+
+        # Band breakouts: 1 above the upper band, -1 below the lower band.
+        # Comparisons against NaN bands are False, exactly like the scalar checks.
+        bb_signal = np.zeros(n, dtype=np.int8)
+        bb_signal[close > upper] = 1
+        bb_signal[(close < lower) & (bb_signal == 0)] = -1
+        if n:
+            bb_signal[0] = 0
+
+        if self.use_atr_filter:
+            up_candidate = low - atr
+            down_candidate = high + atr
+        else:
+            up_candidate = low
+            down_candidate = high
+
+        # The follow line only changes on breakout candles and otherwise carries
+        # the previous value forward, so the recurrence is walked over the
+        # breakout indices only, on plain Python floats.
+        follow_line = np.full(n, np.nan, dtype=close.dtype)
+        breakouts = np.flatnonzero(bb_signal)
+        signals = bb_signal[breakouts].tolist()
+        ups = up_candidate[breakouts].tolist()
+        downs = down_candidate[breakouts].tolist()
+        values = [0.0] * len(signals)
+        prev = np.nan
+        for k, signal in enumerate(signals):
+            if signal == 1:
+                new_follow = ups[k]
+                if not math.isnan(prev) and new_follow < prev:
+                    new_follow = prev
+            else:
+                new_follow = downs[k]
+                if not math.isnan(prev) and new_follow > prev:
+                    new_follow = prev
+            values[k] = new_follow
+            prev = new_follow
+
+        if len(breakouts):
+            # Forward fill each breakout value up to the next breakout.
+            follow_line[breakouts] = values
+            last_breakout = np.where(bb_signal != 0, np.arange(n), -1)
+            np.maximum.accumulate(last_breakout, out=last_breakout)
+            filled = last_breakout >= 0
+            follow_line[filled] = follow_line[last_breakout[filled]]
+
+        # Trend: direction of the last follow line change, 0 until the first change.
+        step = np.zeros(n, dtype=np.int8)
+        if n > 1:
+            step[1:] = np.sign(np.nan_to_num(np.diff(follow_line), nan=0.0))
+        last_step = np.where(step != 0, np.arange(n), 0)
+        np.maximum.accumulate(last_step, out=last_step)
+        trend = step[last_step]
+
+        prev_trend = np.zeros(n, dtype=np.int8)
+        prev_trend[1:] = trend[:-1]
+        buy = (prev_trend == -1) & (trend == 1)
+        sell = (prev_trend == 1) & (trend == -1)
+
+        shapes_buy = np.full(n, np.nan, dtype=close.dtype)
+        shapes_sell = np.full(n, np.nan, dtype=close.dtype)
+        if self.show_signals:
+            shapes_buy[buy] = follow_line[buy] - atr[buy]
+            shapes_sell[sell] = follow_line[sell] + atr[sell]
+
+        return {
+            "follow_line": follow_line,
+            "trend": trend,
+            "buy": buy,
+            "sell": sell,
+            "shapes_buy": shapes_buy,
+            "shapes_sell": shapes_sell,
+            "atr": atr,
+        }
+
+    def create_trend_segments(self, data, fingerprints=None):
         """
         Generate colored trend segments and signal labels for plotting.
 
@@ -108,8 +226,12 @@ class ToTheMoonAlgorithm(Algorithm):
         Each segment represents a period between buy/sell signals, colored blue for uptrends
         (buy) and red for downtrends (sell). Labels are added at each signal point.
 
+        Segments do not copy the follow line: "line_values" is a NumPy view into
+        one follow line array shared by all segments of the call.
+
         Args:
             data (pd.DataFrame): The input DataFrame containing OHLCV data.
+            fingerprints (dict, optional): See compute_signal_arrays.
 
         Returns:
             Tuple[List[dict], List[dict]]:
@@ -118,59 +240,60 @@ class ToTheMoonAlgorithm(Algorithm):
         """
         segments = []
         labels = []
-        start_index = None
-        current_color = None
-
-        df_result = self.calculate_follow_line(data)
-        data = pd.concat([data, df_result[["Follow Line", "Buy", "Sell"]]], axis=1)
-
-        for i in range(len(data)):
-            sell_signal = not pd.isna(data.loc[i, "Sell"]) and data.loc[i, "Sell"] != ""
-            buy_signal = not pd.isna(data.loc[i, "Buy"]) and data.loc[i, "Buy"] != ""
-
-            if sell_signal or buy_signal:
-                if start_index is None:
-                    start_index = i
-                    current_color = "red" if sell_signal else "blue"
-                else:
-                    label_text = "SELL" if current_color == "blue" else "BUY"
-                    labels.append(
-                        {
-                            "position": i,
-                            "value": data.loc[i, "Follow Line"],
-                            "text": label_text,
-                        }
-                    )
-
-                    segments.append(
-                        {
-                            "start_index": start_index,
-                            "end_index": i - 1,
-                            "line_values": data.loc[start_index:i, "Follow Line"]
-                            .iloc[:-1]
-                            .tolist(),
-                            "color": current_color,
-                        }
-                    )
-
-                    start_index = i
-                    current_color = "red" if sell_signal else "blue"
-
-        if start_index is not None:
+
+        arrays = self.compute_signal_arrays(data, fingerprints)
+        follow_line = arrays["follow_line"]
+        is_buy = ~np.isnan(arrays["shapes_buy"])
+        is_sell = ~np.isnan(arrays["shapes_sell"])
+        signal_indices = np.flatnonzero(is_buy | is_sell)
+        if len(signal_indices) == 0:
+            return segments, labels
+
+        # Each signal opens a segment that ends right before the next signal.
+        colors = np.where(is_sell[signal_indices], "red", "blue").tolist()
+        starts = signal_indices.tolist()
+        ends = starts[1:] + [len(follow_line)]
+
+        for k, (start_index, end) in enumerate(zip(starts, ends)):
+            if k > 0:
+                labels.append(
+                    {
+                        "position": start_index,
+                        "value": follow_line[start_index],
+                        "text": "SELL" if colors[k - 1] == "blue" else "BUY",
+                    }
+                )
             segments.append(
                 {
                     "start_index": start_index,
-                    "end_index": len(data) - 1,
-                    "line_values": data.loc[start_index:, "Follow Line"].tolist(),
-                    "color": current_color,
+                    "end_index": end - 1,
+                    "line_values": follow_line[start_index:end],
+                    "color": colors[k],
                 }
             )
 
         return segments, labels
 
-    def compute_atr(self, df, period=5):
-        tr = self.true_range(df)
-        return self.rma(tr, period)
+    def compute_atr(self, df, period=None, fingerprints=None):
+        """
+        ATR of `period` candles (default atr_period) as a new Series; the
+        indicator cache keeps its own read-only copy.
+        """
+        return pd.Series(self._atr(df, period, fingerprints).copy(), index=df.index)
+
+    def _atr(self, df, period=None, fingerprints=None) -> np.ndarray:
+        # Only the ATR itself is cached, not the true range and RMA it is built
+        # from, so it counts against the cache budget once.
+        if period is None:
+            period = self.atr_period
+        if fingerprints is None:
+            fingerprints = self.fingerprints(df)
+        return self.cache.get_or_compute(
+            ("atr", self._ohlc_key(fingerprints), period),
+            lambda: self.rma(self.true_range(df), period).to_numpy(
+                dtype=self.price_dtype(df)
+            ),
+        )
 
     def true_range(self, df):
         close_shifted = df["close"].shift(1)
@@ -183,6 +306,10 @@ class ToTheMoonAlgorithm(Algorithm):
     def rma(self, series, period):
         return series.ewm(alpha=1 / period, adjust=False).mean()
 
+    @staticmethod
+    def _ohlc_key(fingerprints):
+        return tuple(fingerprints[column] for column in ("high", "low", "close"))
+
     def get_last_signal(self, data: pd.DataFrame) -> Optional[str]:
         """
         Returns the last signal ("BUY" or "SELL") from the algorithm's logic.
@@ -193,10 +320,108 @@ class ToTheMoonAlgorithm(Algorithm):
         Returns:
             Optional[str]: The last signal, either "BUY", "SELL", or None if no signal is found.
         """
-        _, labels = self.create_trend_segments(data)
-        if not labels:
+        last_signal = self.find_last_signal(data)
+        if last_signal is None:
             return None
-        return labels[-1]["text"]
+        return last_signal[0]
+
+    def find_last_signal(self, data: pd.DataFrame) -> Optional[Tuple[str, int]]:
+        """
+        Returns the most recent signal and the index of its candle.
+
+        The trend array is scanned backward from the end, so no segments or labels
+        are built. As in create_trend_segments, the first signal of the data only
+        opens the first segment and is not reported on its own.
+
+        Args:
+            data (pd.DataFrame): The input DataFrame containing the data.
+
+        Returns:
+            Optional[Tuple[str, int]]: ("BUY" or "SELL", index), or None if no signal is found.
+        """
+        arrays = self.compute_signal_arrays(data)
+        has_shape = ~(np.isnan(arrays["shapes_buy"]) & np.isnan(arrays["shapes_sell"]))
+        trend = arrays["trend"]
+
+        last_signal = None
+        for i in range(len(trend) - 1, 0, -1):
+            if trend[i] == trend[i - 1] or trend[i - 1] == 0 or not has_shape[i]:
+                continue
+            if last_signal is not None:
+                return last_signal
+            last_signal = ("BUY" if trend[i] == 1 else "SELL", i)
+        return None
+
+    def update(self, candle) -> Optional[str]:
+        """
+        Apply a single new or updated candle to the streaming state.
+
+        A candle with the same timestamp as the previous one replaces it, a newer
+        one is appended and older ones are ignored. Each call costs constant time.
+
+        Args:
+            candle: Mapping (dict, pandas row) with "timestamp", "high", "low" and "close".
+
+        Returns:
+            Optional[str]: The current signal, "BUY", "SELL" or None.
+        """
+        if self._stream is None:
+            self._stream = FollowLineStream(
+                atr_period=self.atr_period,
+                bb_period=self.bb_period,
+                bb_deviation=self.bb_deviation,
+                use_atr_filter=self.use_atr_filter,
+                show_signals=self.show_signals,
+            )
+        return self._stream.update(candle)
+
+    def update_from_frame(self, data: pd.DataFrame) -> Optional[str]:
+        """
+        Feed the candles of `data` that are not in the streaming state yet.
+
+        The first call replays the whole frame; later calls only apply the rows
+        from the last seen timestamp onwards, which is normally the open candle
+        plus at most one new one.
+
+        Args:
+            data (pd.DataFrame or OHLCVBuffer): OHLC data ordered by "timestamp".
+
+        Returns:
+            Optional[str]: The current signal, "BUY", "SELL" or None.
+        """
+        start = 0
+        timestamps = np.asarray(data["timestamp"])
+        if self._stream is not None and self._stream.last_timestamp is not None:
+            start = int(timestamps.searchsorted(self._stream.last_timestamp))
+
+        high = np.asarray(data["high"], dtype=np.float64)
+        low = np.asarray(data["low"], dtype=np.float64)
+        close = np.asarray(data["close"], dtype=np.float64)
+        for i in range(start, len(data)):
+            self.update(
+                {
+                    "timestamp": timestamps[i],
+                    "high": high[i],
+                    "low": low[i],
+                    "close": close[i],
+                }
+            )
+        return self.current_signal()
+
+    def current_signal(self) -> Optional[str]:
+        """
+        Returns the last signal of the streaming state, like get_last_signal does
+        for a full DataFrame.
+        """
+        if self._stream is None:
+            return None
+        return self._stream.current_signal()
+
+    def reset_stream(self):
+        """
+        Forget the streaming state.
+        """
+        self._stream = None
 
     def simulate_potential_profit(self, segments: List[Dict], labels: List[Dict]) -> float:
         """
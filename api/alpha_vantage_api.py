@@ -1,7 +1,6 @@
-import requests
-import tempfile
 import helper.utils  # assuming utils.read_csv exists and is accessible
 import pandas as pd
+from helper.http_session import get_session_pool, stream_body
 from api.base_trading_api import BaseTradingApi
 
 
@@ -14,6 +13,7 @@ class AlphaVantageAPI(BaseTradingApi):
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.http = get_session_pool("alpha_vantage")
 
     def get_historic_data(self, asset_name: str) -> pd.DataFrame:
         # Build the remote CSV URL using the Alpha Vantage API.
@@ -23,23 +23,12 @@ class AlphaVantageAPI(BaseTradingApi):
         ).format(asset=asset_name, apikey=self.api_key)
 
         try:
-            # Download the CSV data.
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors.
-            csv_data = response.text
-
-            # Write CSV data to a temporary file.
-            with tempfile.NamedTemporaryFile(
-                mode="w+", delete=False, suffix=".csv"
-            ) as tmp_file:
-                tmp_file.write(csv_data)
-                tmp_file.flush()  # Ensure data is written to disk.
-                temp_file_path = tmp_file.name
-
-            # Use the utility to read the CSV data.
-            success, result = helper.utils.read_csv(
-                temp_file_path, date_parsing=["timestamp"]
-            )
+            # Parse the CSV data while it downloads.
+            with self.http.get(url, stream=True) as response:
+                response.raise_for_status()  # Raise an exception for HTTP errors.
+                success, result = helper.utils.read_csv(
+                    stream_body(response), date_parsing=["timestamp"]
+                )
             if not success:
                 raise ValueError(f"Failed to load CSV file: {result}")
 
@@ -64,3 +53,8 @@ class AlphaVantageAPI(BaseTradingApi):
         raise NotImplementedError(
             "Fetch asset info functionality is not implemented in AlphaVantageAPI."
         )
+
+    def fetch_portfolio_snapshot(self):
+        raise NotImplementedError(
+            "Portfolio snapshot functionality is not implemented in AlphaVantageAPI."
+        )
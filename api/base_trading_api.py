@@ -1,5 +1,6 @@
 import abc
 import pandas
+from helper.time_utils import to_milliseconds
 
 
 class BaseTradingApi(abc.ABC):
@@ -22,6 +23,67 @@ class BaseTradingApi(abc.ABC):
         """
         pass
 
+    def get_historic_range(
+        self, asset_name: str, interval: str, start, end=None
+    ) -> pandas.DataFrame:
+        """
+        Retrieve historical trading data between two dates.
+
+        The default implementation filters get_historic_data; adapters that can
+        page through the full history should override it.
+
+        Args:
+            asset_name (str): The altasset name.
+            interval (str): The candlestick interval, e.g. "4h".
+            start: First candle, as epoch milliseconds, ISO date string or datetime.
+            end (optional): Last candle, in the same forms. Defaults to now.
+
+        Returns:
+            pandas.DataFrame: A DataFrame containing the historical trading data.
+        """
+        data = self.get_historic_data(asset_name, interval)
+        if data.empty:
+            return data
+        timestamps = data["timestamp"].astype("datetime64[ms]").astype("int64")
+        mask = timestamps >= to_milliseconds(start)
+        if end is not None:
+            mask &= timestamps <= to_milliseconds(end)
+        return data[mask].reset_index(drop=True)
+
+    def has_asset(self, asset_name: str) -> bool:
+        """
+        Check whether the asset can be traded on the platform.
+
+        Adapters without a cheap way to tell return True and let the order fail later.
+
+        Args:
+            asset_name (str): The altasset name.
+
+        Returns:
+            bool: False only if the asset is known not to exist.
+        """
+        return True
+
+    def update_candles(self, candles, asset_name: str, interval: str) -> int:
+        """
+        Bring an OHLCVBuffer up to date with the latest candles of the asset.
+
+        The default implementation downloads the full history; adapters that can
+        request only the newest candles should override it.
+
+        Args:
+            candles (OHLCVBuffer): The buffer to update in place.
+            asset_name (str): The altasset name.
+            interval (str): The candlestick interval, e.g. "4h".
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        data = self.get_historic_data(asset_name, interval)
+        if data.empty:
+            return 0
+        return candles.extend_frame(data)
+
     @abc.abstractmethod
     def buy_order(self, asset_name: str, amount: float) -> bool:
         """
@@ -63,3 +125,14 @@ class BaseTradingApi(abc.ABC):
             tuple: (quantity as float, total worth in USDT as float)
         """
         pass
+
+    @abc.abstractmethod
+    def fetch_portfolio_snapshot(self):
+        """
+        Retrieve the free quantity and USDT worth of every asset in the account
+        with as few requests as possible.
+
+        Returns:
+            PortfolioSnapshot: Balances and values keyed by asset symbol.
+        """
+        pass
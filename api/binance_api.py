@@ -1,12 +1,27 @@
-import requests
 from requests.exceptions import RequestException
 import hmac
+import threading
 import json
 import hashlib
 from urllib.parse import urlencode
 from decimal import Decimal, ROUND_DOWN
+from typing import Optional
 import pandas  # Now importing pandas at the top, without alias
-
+from helper.time_utils import (
+    interval_to_milliseconds,
+    now_milliseconds,
+    to_milliseconds,
+)
+from helper.http_session import HttpSessionPool, get_session_pool
+from helper.kline_decoder import klines_to_frame
+from helper.request_scheduler import RequestScheduler, get_request_scheduler
+from service.symbol_metadata_service import SymbolMetadataService
+from service.clock_sync_service import ClockSyncService
+from service.price_oracle_service import PriceOracleService
+from service.kline_download_service import KlineDownloadService
+from service.market_stream_service import MarketStreamService
+
+from model.portfolio_snapshot import PortfolioSnapshot
 from api.base_trading_api import (
     BaseTradingApi,
 )  # Ensure this exists in your project
@@ -21,12 +36,61 @@ class BinanceAPI(BaseTradingApi):
 
     BASE_URL = "https://api.binance.com"
 
-    def __init__(self, api_key: str, api_secret: str):
+    # Background services (symbol metadata, server clock, prices, market stream)
+    # shared per base URL.
+    _shared_services = {}
+    _shared_services_lock = threading.Lock()
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = None,
+        http: HttpSessionPool = None,
+        scheduler: RequestScheduler = None,
+    ):
         """
         Initialize with your Binance API key and secret.
+
+        Args:
+            api_key (str): The Binance API key.
+            api_secret (str): The Binance API secret.
+            base_url (str, optional): Overrides BASE_URL, e.g. for a local stand-in server.
+            http (HttpSessionPool, optional): Session pool to send requests with. By default
+                all BinanceAPI instances share one pooled keep-alive session.
+            scheduler (RequestScheduler, optional): Rate limit budget to send requests
+                within. By default all BinanceAPI instances share one.
         """
         self.api_key = api_key
         self.api_secret = api_secret
+        self.base_url = base_url or self.BASE_URL
+        self.http = http or get_session_pool("binance")
+        self.scheduler = scheduler or get_request_scheduler("binance")
+
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Send a request once the shared rate limit budget allows it.
+
+        Raises:
+            RateLimitExceeded: If a market data or account request was shed.
+        """
+        return self.scheduler.send(self.http, method, url, **kwargs)
+
+    def _signed_request(self, method: str, url: str, params: dict = None):
+        """
+        Send a signed request. The timestamp and signature are added once the
+        rate limit budget allows sending, so a request that had to wait does
+        not arrive outside its recvWindow.
+        """
+
+        def sign(params: dict) -> dict:
+            params = dict(params, timestamp=self.clock.now(), recvWindow=10000)
+            return self._sign_params(params)
+
+        headers = {"X-MBX-APIKEY": self.api_key}
+        return self._request(
+            method, url, params=params or {}, headers=headers, sign=sign
+        )
 
     def _get_server_time(self) -> int:
         """
@@ -36,14 +100,108 @@ class BinanceAPI(BaseTradingApi):
             int: The server time in milliseconds.
         """
         endpoint = "/api/v3/time"
-        url = self.BASE_URL + endpoint
-        response = requests.get(url)
+        url = self.base_url + endpoint
+        response = self._request("GET", url)
         response.raise_for_status()
         return response.json()["serverTime"]
 
+    def _get_exchange_info(self) -> dict:
+        """
+        Fetch exchangeInfo for all symbols.
+
+        Returns:
+            dict: The exchangeInfo payload.
+        """
+        url = self.base_url + "/api/v3/exchangeInfo"
+        response = self._request("GET", url)
+        response.raise_for_status()
+        return response.json()
+
+    def _get_all_prices(self) -> dict:
+        """
+        Fetch the latest price of every symbol with one bulk ticker request.
+
+        Returns:
+            dict: Prices keyed by symbol (e.g., {"BTCUSDT": 65000.0}).
+        """
+        url = self.base_url + "/api/v3/ticker/price"
+        response = self._request("GET", url)
+        response.raise_for_status()
+        return {item["symbol"]: float(item["price"]) for item in response.json()}
+
+    def _shared_service(self, name: str, factory):
+        """
+        Return the service `name` shared by all instances with this base URL,
+        creating and starting it on first use.
+        """
+        key = (name, self.base_url)
+        with BinanceAPI._shared_services_lock:
+            service = BinanceAPI._shared_services.get(key)
+            if service is None:
+                service = factory()
+                service.start()
+                BinanceAPI._shared_services[key] = service
+            return service
+
+    @property
+    def symbol_metadata(self) -> SymbolMetadataService:
+        """
+        The symbol metadata index shared by all BinanceAPI instances of this base URL.
+        """
+        return self._shared_service(
+            "symbol_metadata", lambda: SymbolMetadataService(self._get_exchange_info)
+        )
+
+    @property
+    def clock(self) -> ClockSyncService:
+        """
+        The server clock offset shared by all BinanceAPI instances of this base URL.
+        """
+        return self._shared_service(
+            "clock", lambda: ClockSyncService(self._get_server_time)
+        )
+
+    @property
+    def prices(self) -> PriceOracleService:
+        """
+        The price table shared by all BinanceAPI instances of this base URL.
+        """
+        return self._shared_service(
+            "prices", lambda: PriceOracleService(self._get_all_prices)
+        )
+
+    @property
+    def market_stream(self) -> Optional[MarketStreamService]:
+        """
+        The running market stream of this base URL, or None.
+        """
+        return BinanceAPI._shared_services.get(("market_stream", self.base_url))
+
+    def start_market_stream(
+        self, assets, interval: str = "4h", stream_url: str = None
+    ) -> MarketStreamService:
+        """
+        Stream candles and prices of the assets, replacing REST polling for them.
+        Starts the stream shared by this base URL, or changes its assets.
+        """
+        stream = self._shared_service(
+            "market_stream",
+            lambda: MarketStreamService(self, interval, stream_url=stream_url),
+        )
+        stream.set_assets(assets)
+        return stream
+
+    def stop_market_stream(self):
+        with BinanceAPI._shared_services_lock:
+            stream = BinanceAPI._shared_services.pop(
+                ("market_stream", self.base_url), None
+            )
+        if stream is not None:
+            stream.stop()
+
     def _get_symbol_filters(self, symbol: str) -> dict:
         """
-        Retrieve the filters for the given symbol from the exchangeInfo endpoint.
+        Retrieve the filters for the given symbol from the cached exchangeInfo.
 
         Args:
             symbol (str): The trading pair (e.g., "BTCUSDT").
@@ -52,18 +210,22 @@ class BinanceAPI(BaseTradingApi):
             dict: A dictionary mapping filter types (e.g., "LOT_SIZE", "MIN_NOTIONAL")
                   to their respective filter data.
         """
-        url = self.BASE_URL + "/api/v3/exchangeInfo"
-        params = {"symbol": symbol}
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        filters = {}
-        if "symbols" in data and len(data["symbols"]) > 0:
-            for f in data["symbols"][0]["filters"]:
-                filters[f["filterType"]] = f
-            return filters
-        else:
+        filters = self.symbol_metadata.get_filters(symbol)
+        if filters is None:
             raise RuntimeError("Symbol information not found for " + symbol)
+        return filters
+
+    def has_asset(self, asset_name: str) -> bool:
+        """
+        Check from the cached exchangeInfo whether the asset trades against USDT.
+
+        Args:
+            asset_name (str): The asset symbol (e.g., "BTC").
+
+        Returns:
+            bool: True if the USDT pair exists and is trading.
+        """
+        return self.symbol_metadata.has_symbol(asset_name.upper() + "USDT")
 
     def _sign_params(self, params: dict) -> dict:
         """
@@ -85,7 +247,7 @@ class BinanceAPI(BaseTradingApi):
         return params
 
     def get_historic_data(
-        self, coin_name: str, interval: str = "1d"
+        self, coin_name: str, interval: str = "1d", float32: bool = False
     ) -> pandas.DataFrame:
         """
         Retrieve historical trading data (candlesticks) for the given coin.
@@ -94,23 +256,13 @@ class BinanceAPI(BaseTradingApi):
             coin_name (str): The coin symbol (e.g., "BTC").
             interval (str, optional): The candlestick interval. For example:
                                       "1d" for daily data (default) or "4h" for 4-hour data.
+            float32 (bool, optional): Store the price and volume columns as float32.
 
         Returns:
             pandas.DataFrame: A DataFrame containing the historical data.
         """
-        symbol = coin_name.upper() + "USDT"
-        endpoint = "/api/v3/klines"
-        params = {
-            "symbol": symbol,
-            "interval": interval,  # Use the method parameter here
-            "limit": 500,  # Adjust the limit as necessary.
-        }
-        url = self.BASE_URL + endpoint
-
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._get_klines(coin_name, interval, 500)
         except RequestException as e:
             print(f"Error fetching historical data: {e}")
             return pandas.DataFrame()  # Return an empty DataFrame
@@ -118,29 +270,140 @@ class BinanceAPI(BaseTradingApi):
         if not data:
             raise ValueError("No data returned from Binance API.")
 
-        columns = [
-            "timestamp",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base_asset_volume",
-            "taker_buy_quote_asset_volume",
-            "ignore",
-        ]
-        df = pandas.DataFrame(data, columns=columns)
-        df = df[["timestamp", "open", "high", "low", "close", "volume"]]
-        df["timestamp"] = pandas.to_datetime(df["timestamp"], unit="ms")
-        df["open"] = df["open"].astype(float)
-        df["high"] = df["high"].astype(float)
-        df["low"] = df["low"].astype(float)
-        df["close"] = df["close"].astype(float)
-        df["volume"] = df["volume"].astype(float)
-        return df
+        return self._klines_to_frame(data, float32)
+
+    def get_historic_range(
+        self,
+        coin_name: str,
+        interval: str,
+        start,
+        end=None,
+        float32: bool = False,
+    ) -> pandas.DataFrame:
+        """
+        Retrieve historical trading data (candlesticks) between two dates, beyond
+        the 1000 candles of a single request.
+
+        The range is paged by startTime/endTime and the pages are fetched
+        concurrently; duplicates are dropped, and gaps are requested again
+        and reported if they remain.
+
+        Args:
+            coin_name (str): The coin symbol (e.g., "BTC").
+            interval (str): The candlestick interval (e.g., "1h", "4h").
+            start: First candle, as epoch milliseconds, ISO date string or datetime.
+            end (optional): Last candle, in the same forms. Defaults to now.
+            float32 (bool, optional): Store the price and volume columns as float32.
+
+        Returns:
+            pandas.DataFrame: A DataFrame containing the historical data.
+        """
+        start_ms = to_milliseconds(start)
+        end_ms = to_milliseconds(end) if end is not None else now_milliseconds()
+        downloader = KlineDownloadService(
+            lambda page_start, page_end, limit: self._get_klines(
+                coin_name, interval, limit, page_start, page_end
+            )
+        )
+        try:
+            result = downloader.download(interval, start_ms, end_ms)
+        except RequestException as e:
+            print(f"Error fetching historical data: {e}")
+            return pandas.DataFrame()  # Return an empty DataFrame
+
+        if result.gaps:
+            print(f"{coin_name} {interval}: {result.summary()}")
+        if not result.klines:
+            raise ValueError("No data returned from Binance API.")
+
+        return self._klines_to_frame(result.klines, float32)
+
+    @staticmethod
+    def _klines_to_frame(data: list, float32: bool = False) -> pandas.DataFrame:
+        """
+        Convert raw klines into the OHLCV DataFrame returned by get_historic_data.
+        """
+        return klines_to_frame(data, float32)
+
+    def _get_klines(
+        self,
+        coin_name: str,
+        interval: str,
+        limit: int,
+        start_ms: int = None,
+        end_ms: int = None,
+    ) -> list:
+        """
+        Fetch raw klines for the given coin, the most recent ones unless a time
+        range is given.
+
+        Args:
+            coin_name (str): The coin symbol (e.g., "BTC").
+            interval (str): The candlestick interval (e.g., "4h").
+            limit (int): Number of candles, at most 1000.
+            start_ms (int, optional): Earliest open time in milliseconds.
+            end_ms (int, optional): Latest open time in milliseconds.
+
+        Returns:
+            list: Klines as returned by Binance, oldest first.
+        """
+        symbol = coin_name.upper() + "USDT"
+        endpoint = "/api/v3/klines"
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_ms is not None:
+            params["startTime"] = start_ms
+        if end_ms is not None:
+            params["endTime"] = end_ms
+        url = self.base_url + endpoint
+        response = self._request("GET", url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def update_candles(self, candles, coin_name: str, interval: str) -> int:
+        """
+        Bring an OHLCVBuffer up to date in place, from the market stream when it
+        carries the asset and interval, otherwise by polling REST.
+
+        Args:
+            candles (OHLCVBuffer): The buffer to update.
+            coin_name (str): The coin symbol (e.g., "BTC").
+            interval (str): The candlestick interval (e.g., "4h").
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        stream = self.market_stream
+        if stream is not None and stream.has_candles(coin_name, interval):
+            return stream.update_candles(candles, coin_name)
+        return self.poll_candles(candles, coin_name, interval)
+
+    def poll_candles(self, candles, coin_name: str, interval: str) -> int:
+        """
+        Bring an OHLCVBuffer up to date in place over REST.
+
+        An empty buffer is filled to its capacity; afterwards only the candles
+        since the newest buffered one are requested (normally the still-open
+        candle and, at most, one that closed since the previous poll).
+
+        Args:
+            candles (OHLCVBuffer): The buffer to update.
+            coin_name (str): The coin symbol (e.g., "BTC").
+            interval (str): The candlestick interval (e.g., "4h").
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        limit = min(candles.capacity, 1000)
+        if len(candles):
+            elapsed = now_milliseconds() - candles.last_timestamp
+            missing = elapsed // interval_to_milliseconds(interval) + 1
+            limit = min(limit, max(2, missing + 1))
+        try:
+            klines = self._get_klines(coin_name, interval, limit)
+        except RequestException as e:
+            print(f"Error fetching historical data: {e}")
+            return 0
+        return candles.extend_klines(klines)
 
     def sell_order(self, coin_name: str, usdt_amount: float) -> dict:
         """
@@ -159,20 +422,16 @@ class BinanceAPI(BaseTradingApi):
         """
         symbol = coin_name.upper() + "USDT"
 
-        # 1. Fetch current price.
-        price_endpoint = "/api/v3/ticker/price"
-        price_url = self.BASE_URL + price_endpoint
-        params_price = {"symbol": symbol}
-
+        # 1. Read current price.
         try:
-            price_response = requests.get(price_url, params=params_price)
-            price_response.raise_for_status()
-            current_price = float(price_response.json()["price"])
+            current_price = self.prices.get_price(symbol)
         except RequestException as e:
             return {
                 "status": "error",
                 "message": f"Sell order could not be requested: {e}",
             }
+        if current_price is None:
+            return {"status": "error", "message": f"No price available for {symbol}."}
 
         # 2. Compute raw quantity.
         raw_quantity = usdt_amount / current_price
@@ -210,22 +469,17 @@ class BinanceAPI(BaseTradingApi):
             }
 
         quantity = float(adjusted_quantity)
-        server_time = self._get_server_time()
 
         # 5. Place the market sell order.
         endpoint = "/api/v3/order"
-        url = self.BASE_URL + endpoint
+        url = self.base_url + endpoint
         params = {
             "symbol": symbol,
             "side": "SELL",
             "type": "MARKET",
             "quantity": quantity,
-            "timestamp": server_time,
-            "recvWindow": 10000,
         }
-        signed_params = self._sign_params(params)
-        headers = {"X-MBX-APIKEY": self.api_key}
-        response = requests.post(url, params=signed_params, headers=headers)
+        response = self._signed_request("POST", url, params)
         if response.status_code != 200:
             return {"status": "error", "message": json.loads(response.text)["msg"]}
         response.raise_for_status()
@@ -251,20 +505,16 @@ class BinanceAPI(BaseTradingApi):
         # return True
         symbol = coin_name.upper() + "USDT"
 
-        # 1. Fetch current price.
-        price_endpoint = "/api/v3/ticker/price"
-        price_url = self.BASE_URL + price_endpoint
-        params_price = {"symbol": symbol}
-
+        # 1. Read current price.
         try:
-            price_response = requests.get(price_url, params=params_price)
-            price_response.raise_for_status()
-            current_price = float(price_response.json()["price"])
+            current_price = self.prices.get_price(symbol)
         except RequestException as e:
             return {
                 "status": "error",
                 "message": f"Buy order could not be requested: {e}",
             }
+        if current_price is None:
+            return {"status": "error", "message": f"No price available for {symbol}."}
 
         # 2. Compute raw quantity.
         raw_quantity = usdt_amount / current_price
@@ -307,22 +557,17 @@ class BinanceAPI(BaseTradingApi):
             }
 
         quantity = float(adjusted_quantity)
-        server_time = self._get_server_time()
 
         # 5. Place the market buy order.
         endpoint = "/api/v3/order"
-        url = self.BASE_URL + endpoint
+        url = self.base_url + endpoint
         params = {
             "symbol": symbol,
             "side": "BUY",
             "type": "MARKET",
             "quantity": quantity,
-            "timestamp": server_time,
-            "recvWindow": 10000,
         }
-        signed_params = self._sign_params(params)
-        headers = {"X-MBX-APIKEY": self.api_key}
-        response = requests.post(url, params=signed_params, headers=headers)
+        response = self._signed_request("POST", url, params)
         if response.status_code != 200:
             return {"status": "error", "message": json.loads(response.text)["msg"]}
         response.raise_for_status()
@@ -341,12 +586,8 @@ class BinanceAPI(BaseTradingApi):
                    Returns (0.0, 0.0) if the asset is not found.
         """
         endpoint = "/api/v3/account"
-        url = self.BASE_URL + endpoint
-        server_time = self._get_server_time()
-        params = {"timestamp": server_time, "recvWindow": 10000}
-        signed_params = self._sign_params(params)
-        headers = {"X-MBX-APIKEY": self.api_key}
-        response = requests.get(url, params=signed_params, headers=headers)
+        url = self.base_url + endpoint
+        response = self._signed_request("GET", url)
         response.raise_for_status()
 
         account_info = response.json()
@@ -362,15 +603,45 @@ class BinanceAPI(BaseTradingApi):
             return quantity, quantity
 
         symbol = asset + "USDT"
-        price_endpoint = "/api/v3/ticker/price"
-        price_url = self.BASE_URL + price_endpoint
-        params_price = {"symbol": symbol}
         try:
-            price_response = requests.get(price_url, params=params_price)
-            price_response.raise_for_status()
-            current_price = float(price_response.json()["price"])
-            total_worth = quantity * current_price
+            current_price = self.prices.get_price(symbol)
+            total_worth = quantity * current_price if current_price else 0.0
         except Exception:
             total_worth = 0.0
 
         return quantity, total_worth
+
+    def fetch_portfolio_snapshot(self) -> PortfolioSnapshot:
+        """
+        Retrieve all free balances of the account valued in USDT.
+
+        One signed /api/v3/account request covers every asset, valued from the
+        shared price table instead of one price request per asset.
+
+        Returns:
+            PortfolioSnapshot: Quantities and USDT values keyed by asset symbol.
+                               Assets without a USDT price are valued at 0.0.
+        """
+        endpoint = "/api/v3/account"
+        url = self.base_url + endpoint
+        response = self._signed_request("GET", url)
+        response.raise_for_status()
+
+        quantities = {}
+        for bal in response.json().get("balances", []):
+            quantity = float(bal["free"])
+            if quantity > 0:
+                quantities[bal["asset"]] = quantity
+
+        try:
+            prices = self.prices.table().prices
+        except Exception:
+            prices = {}
+
+        values = {}
+        for asset, quantity in quantities.items():
+            if asset == "USDT":
+                values[asset] = quantity
+            else:
+                values[asset] = quantity * prices.get(asset + "USDT", 0.0)
+        return PortfolioSnapshot(quantities=quantities, values=values)
@@ -1,4 +1,4 @@
-from PyQt6 import QtCore
+from PyQt6 import QtCore, QtWidgets
 from view.main_view import MainView
 from view.order_view import OrderView
 from view.command_view import CommandView
@@ -39,6 +39,9 @@ class ApplicationManager(QtCore.QObject):
         self.command_view.stopButton.clicked.connect(
             self.orderController.handle_stop_processing_orders
         )
+        QtWidgets.QApplication.instance().aboutToQuit.connect(
+            self.orderController.shutdown
+        )
 
         self.commandController.data_loaded_signal.connect(
             self.graphController.load_data
@@ -0,0 +1,52 @@
+"""
+Benchmark BacktestService on large random-walk histories.
+
+Run from the repository root:
+
+    python -m benchmarks.backtest_benchmark
+    python -m benchmarks.backtest_benchmark --sizes 100000 1000000 5000000
+"""
+
+import argparse
+import time
+
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+from benchmarks.follow_line_benchmark import make_ohlc
+from service.backtest_service import BacktestService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    algorithm = ToTheMoonAlgorithm()
+    print(
+        f"{'rows':>10} {'signals (s)':>12} {'backtest (s)':>13} {'trades':>8} {'final':>12}"
+    )
+    for rows in args.sizes:
+        df = make_ohlc(rows)
+
+        start = time.perf_counter()
+        arrays = algorithm.compute_signal_arrays(df)
+        signals = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = BacktestService.run_arrays(
+            df["open"].to_numpy(),
+            df["close"].to_numpy(),
+            arrays["buy"],
+            arrays["sell"],
+            fee_rate=0.001,
+            slippage=0.0005,
+            timestamps=df["timestamp"].to_numpy(),
+        )
+        backtest = time.perf_counter() - start
+        print(
+            f"{rows:>10} {signals:>12.4f} {backtest:>13.4f} "
+            f"{len(result.trades):>8} {result.final_balance:>12.4g}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Accuracy and memory report for the float32 OHLCV storage option.
+
+Signals computed from float32 data are compared against float64 on random-walk
+histories and, optionally, on your own CSV files. Run from the repository root:
+
+    python -m benchmarks.float32_benchmark
+    python -m benchmarks.float32_benchmark --csv sample.csv --sizes 100000
+"""
+
+import argparse
+from itertools import zip_longest
+
+import numpy as np
+import pandas as pd
+
+from algorithms.indicator_cache import IndicatorCache
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+from benchmarks.follow_line_benchmark import make_ohlc
+from service.backtest_service import BacktestService
+
+
+def to_float32(data: pd.DataFrame) -> pd.DataFrame:
+    float_columns = data.select_dtypes(include="float64").columns
+    return data.astype({column: "float32" for column in float_columns})
+
+
+def signal_events(arrays):
+    """
+    Sorted (index, side) pairs of all buy and sell signals.
+    """
+    buys = [(int(i), "BUY") for i in np.flatnonzero(arrays["buy"])]
+    sells = [(int(i), "SELL") for i in np.flatnonzero(arrays["sell"])]
+    return sorted(buys + sells)
+
+
+def accuracy_report(name: str, data64: pd.DataFrame) -> dict:
+    data32 = to_float32(data64)
+    algorithm = ToTheMoonAlgorithm(cache=IndicatorCache())
+    arrays64 = algorithm.compute_signal_arrays(data64)
+    arrays32 = algorithm.compute_signal_arrays(data32)
+
+    events64 = signal_events(arrays64)
+    events32 = signal_events(arrays32)
+    matching = len(set(events64) & set(events32))
+    first_divergence = None
+    for a, b in zip_longest(events64, events32):
+        if a != b:
+            first_divergence = min(event[0] for event in (a, b) if event is not None)
+            break
+
+    # Follow line error up to the first diverging signal, where both lines agree.
+    end = first_divergence if first_divergence is not None else len(data64)
+    fl64 = arrays64["follow_line"][:end]
+    fl32 = arrays32["follow_line"][:end].astype(np.float64)
+    valid = ~np.isnan(fl64) & ~np.isnan(fl32)
+    relative_error = (
+        float(np.max(np.abs(fl32[valid] - fl64[valid]) / np.abs(fl64[valid])))
+        if valid.any()
+        else 0.0
+    )
+
+    backtest64 = BacktestService.run(data64, algorithm)
+    backtest32 = BacktestService.run(data32, algorithm)
+    return {
+        "dataset": name,
+        "rows": len(data64),
+        "signals_f64": len(events64),
+        "signals_f32": len(events32),
+        "matching": f"{matching / max(len(events64), 1):.2%}",
+        "first_divergence": first_divergence,
+        "last_signal_equal": (events64[-1:] == events32[-1:]),
+        "max_rel_error": relative_error,
+        "final_f64": round(backtest64.final_balance, 4),
+        "final_f32": round(backtest32.final_balance, 4),
+    }
+
+
+def memory_report(rows: int) -> dict:
+    """
+    Bytes held by the OHLCV frame plus the intermediate indicator and follow line
+    arrays, for float64 and float32 storage.
+    """
+    report = {"rows": rows}
+    data64 = make_ohlc(rows)
+    data64["volume"] = 1.0
+    for label, data in (("f64", data64), ("f32", to_float32(data64))):
+        cache = IndicatorCache()
+        algorithm = ToTheMoonAlgorithm(cache=cache)
+        arrays = algorithm.compute_signal_arrays(data)
+        frame_bytes = int(data.memory_usage(deep=True).sum())
+        array_bytes = sum(
+            value.nbytes for value in arrays.values() if value.dtype.kind == "f"
+        )
+        report[f"{label}_MB"] = round(
+            (frame_bytes + array_bytes + cache.stats()["bytes"]) / 1e6, 1
+        )
+    report["saving"] = f"{1 - report['f32_MB'] / report['f64_MB']:.0%}"
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--csv", nargs="*", default=[], help="OHLC CSV files to check.")
+    args = parser.parse_args()
+
+    datasets = [(f"random walk {rows}", make_ohlc(rows)) for rows in args.sizes]
+    for path in args.csv:
+        datasets.append((path, pd.read_csv(path)))
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print("Signal accuracy, float32 vs float64")
+        print(pd.DataFrame([accuracy_report(name, data) for name, data in datasets]))
+        print()
+        print("Memory, OHLCV frame + indicator and follow line arrays")
+        print(pd.DataFrame([memory_report(rows) for rows in args.sizes]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark ToTheMoonAlgorithm.calculate_follow_line against the previous
+row-by-row implementation.
+
+Run from the repository root:
+
+    python -m benchmarks.follow_line_benchmark
+    python -m benchmarks.follow_line_benchmark --sizes 10000 100000 --legacy-limit 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+
+
+def make_ohlc(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a random-walk OHLC frame with the columns the algorithm expects.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, rows))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, rows))
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2020-01-01", periods=rows, freq="min"),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+        }
+    )
+
+
+def legacy_calculate_follow_line(algorithm: ToTheMoonAlgorithm, df: pd.DataFrame):
+    """
+    The per-row implementation calculate_follow_line used before the NumPy kernel.
+    """
+    df = df.copy()
+    df["sma"] = df["close"].rolling(algorithm.bb_period).mean()
+    df["stdev"] = df["close"].rolling(algorithm.bb_period).std()
+    df["BBUpper"] = df["sma"] + (df["stdev"] * algorithm.bb_deviation)
+    df["BBLower"] = df["sma"] - (df["stdev"] * algorithm.bb_deviation)
+    df["atrValue"] = algorithm.compute_atr(df)
+
+    n = len(df)
+    follow_line = [np.nan] * n
+    i_trend = [0] * n
+    buy = [np.nan] * n
+    sell = [np.nan] * n
+
+    for i in range(1, n):
+        bb_signal = 0
+        if df["close"].iloc[i] > df["BBUpper"].iloc[i]:
+            bb_signal = 1
+        elif df["close"].iloc[i] < df["BBLower"].iloc[i]:
+            bb_signal = -1
+
+        new_follow = follow_line[i - 1]
+        if bb_signal == 1:
+            new_follow = (
+                df["low"].iloc[i] - df["atrValue"].iloc[i]
+                if algorithm.use_atr_filter
+                else df["low"].iloc[i]
+            )
+            if not np.isnan(follow_line[i - 1]) and new_follow < follow_line[i - 1]:
+                new_follow = follow_line[i - 1]
+        elif bb_signal == -1:
+            new_follow = (
+                df["high"].iloc[i] + df["atrValue"].iloc[i]
+                if algorithm.use_atr_filter
+                else df["high"].iloc[i]
+            )
+            if not np.isnan(follow_line[i - 1]) and new_follow > follow_line[i - 1]:
+                new_follow = follow_line[i - 1]
+
+        follow_line[i] = new_follow
+        prev_fl = follow_line[i - 1]
+        curr_fl = follow_line[i]
+        i_trend[i] = (
+            i_trend[i - 1]
+            if np.isnan(prev_fl)
+            else (
+                1 if curr_fl > prev_fl else -1 if curr_fl < prev_fl else i_trend[i - 1]
+            )
+        )
+        if i_trend[i - 1] == -1 and i_trend[i] == 1:
+            buy[i] = 1.0
+        if i_trend[i - 1] == 1 and i_trend[i] == -1:
+            sell[i] = 1.0
+
+    shapes_buy = [np.nan] * n
+    shapes_sell = [np.nan] * n
+    if algorithm.show_signals:
+        for i in range(n):
+            if buy[i] == 1.0:
+                shapes_buy[i] = follow_line[i] - df["atrValue"].iloc[i]
+            if sell[i] == 1.0:
+                shapes_sell[i] = follow_line[i] + df["atrValue"].iloc[i]
+
+    df["Follow Line"] = follow_line
+    df["Buy"] = shapes_buy
+    df["Sell"] = shapes_sell
+    df.drop(["sma", "stdev", "BBUpper", "BBLower", "atrValue"], axis=1, inplace=True)
+    return df
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """
+    Return the best wall time of `repeat` calls in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=1_000_000,
+        help="Skip the legacy loop above this many rows (it takes minutes at 1M).",
+    )
+    args = parser.parse_args()
+
+    algorithm = ToTheMoonAlgorithm()
+    print(f"{'rows':>10} {'legacy (s)':>12} {'kernel (s)':>12} {'speedup':>9}")
+    for rows in args.sizes:
+        df = make_ohlc(rows)
+        kernel = time_call(algorithm.calculate_follow_line, df)
+
+        if rows > args.legacy_limit:
+            print(f"{rows:>10} {'skipped':>12} {kernel:>12.4f} {'-':>9}")
+            continue
+
+        start = time.perf_counter()
+        expected = legacy_calculate_follow_line(algorithm, df)
+        legacy = time.perf_counter() - start
+        pd.testing.assert_frame_equal(
+            expected, algorithm.calculate_follow_line(df), check_exact=True
+        )
+        print(f"{rows:>10} {legacy:>12.4f} {kernel:>12.4f} {legacy / kernel:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
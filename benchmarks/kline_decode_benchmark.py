@@ -0,0 +1,113 @@
+"""
+Benchmark decoding raw klines into typed arrays against the previous
+DataFrame-and-astype conversion.
+
+Payloads are built like the JSON body of /api/v3/klines (prices as strings)
+and decoded from the parsed list, as get_historic_data does. Run from the
+repository root:
+
+    python -m benchmarks.kline_decode_benchmark
+    python -m benchmarks.kline_decode_benchmark --sizes 1000 --float32
+"""
+
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.follow_line_benchmark import make_ohlc, time_call
+from helper.kline_decoder import klines_to_frame
+
+
+def make_klines(rows: int) -> list:
+    """
+    Parsed /api/v3/klines payload with `rows` one-minute candles.
+    """
+    ohlc = make_ohlc(rows)
+    open_times = ohlc["timestamp"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    volume = np.random.default_rng(7).uniform(1, 1000, rows)
+    payload = [
+        [
+            int(open_time),
+            f"{open_:.8f}",
+            f"{high:.8f}",
+            f"{low:.8f}",
+            f"{close:.8f}",
+            f"{vol:.8f}",
+            int(open_time) + 59_999,
+            f"{close * vol:.8f}",
+            100,
+            f"{vol / 2:.8f}",
+            f"{close * vol / 2:.8f}",
+            "0",
+        ]
+        for open_time, open_, high, low, close, vol in zip(
+            open_times.tolist(),
+            ohlc["open"].tolist(),
+            ohlc["high"].tolist(),
+            ohlc["low"].tolist(),
+            ohlc["close"].tolist(),
+            volume.tolist(),
+        )
+    ]
+    return json.loads(json.dumps(payload))
+
+
+def legacy_klines_to_frame(data: list, float32: bool = False) -> pd.DataFrame:
+    """
+    The conversion BinanceAPI used before the typed decoder, with the
+    datetime64[ns] timestamps pandas 2 gave it.
+    """
+    columns = [
+        "timestamp",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "close_time",
+        "quote_asset_volume",
+        "number_of_trades",
+        "taker_buy_base_asset_volume",
+        "taker_buy_quote_asset_volume",
+        "ignore",
+    ]
+    df = pd.DataFrame(data, columns=columns)
+    df = df[["timestamp", "open", "high", "low", "close", "volume"]]
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms").astype(
+        "datetime64[ns]"
+    )
+    price_dtype = "float32" if float32 else float
+    for column in ("open", "high", "low", "close", "volume"):
+        df[column] = df[column].astype(price_dtype)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--float32", action="store_true", help="Decode as float32.")
+    args = parser.parse_args()
+
+    print(f"{'candles':>10} {'legacy (ms)':>12} {'decoder (ms)':>13} {'speedup':>9}")
+    for rows in args.sizes:
+        data = make_klines(rows)
+        pd.testing.assert_frame_equal(
+            legacy_klines_to_frame(data, args.float32),
+            klines_to_frame(data, args.float32),
+            check_exact=True,
+        )
+        legacy = time_call(
+            legacy_klines_to_frame, data, args.float32, repeat=args.repeat
+        )
+        decoder = time_call(klines_to_frame, data, args.float32, repeat=args.repeat)
+        print(
+            f"{rows:>10} {legacy * 1000:>12.3f} {decoder * 1000:>13.3f} "
+            f"{legacy / decoder:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+"""
+Local stand-in for the Binance REST and market stream endpoints BinanceAPI uses.
+
+Serves /api/v3/time, exchangeInfo, ticker/price, klines, account and order, plus
+a combined kline/miniTicker WebSocket stream on /stream, with configurable
+latency and error injection. Prices follow a deterministic wave per symbol.
+Point an adapter at it with BinanceAPI(key, secret, base_url=server.url) and
+MarketStreamService(..., stream_url=server.ws_url). Standalone:
+
+    python -m benchmarks.mock_binance_server --port 8080 --latency 0.05
+"""
+
+import argparse
+import base64
+import collections
+import hashlib
+import json
+import math
+import random
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from helper.request_scheduler import RequestScheduler
+from helper.time_utils import interval_to_milliseconds
+
+DEFAULT_ASSETS = (
+    "BTC",
+    "ETH",
+    "BNB",
+    "SOL",
+    "XRP",
+    "ADA",
+    "DOGE",
+    "AVAX",
+    "DOT",
+    "LINK",
+)
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class MockBinanceServer:
+    """
+    Threaded HTTP server answering like Binance, for load tests without the
+    real exchange.
+
+    Every request waits `latency` seconds (plus up to `jitter`), and fails with
+    `error_status` with probability `error_rate`. Weight and order count
+    headers are sent like Binance does, and every request is counted per path.
+    """
+
+    def __init__(
+        self,
+        assets=DEFAULT_ASSETS,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        stream_interval: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            assets (iterable): Assets listed against USDT.
+            latency (float): Seconds added to every request.
+            jitter (float): Up to this many extra random seconds per request.
+            error_rate (float): Share of requests answered with `error_status`.
+            error_status (int): Injected error status, e.g. 500, 429 or 418.
+            stream_interval (float): Seconds between pushes on the WebSocket stream.
+            host (str): Interface to listen on.
+            port (int): Port to listen on, 0 for any free port.
+            seed (int): Seed of the latency jitter and error injection.
+        """
+        self.assets = [asset.upper() for asset in assets]
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_interval = stream_interval
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._weights = collections.deque()  # (time, weight) of the last minute
+        self._used_weight = 0
+        self._orders = collections.deque()  # order times of the last 10 seconds
+        self._order_id = 0
+        self.requests = collections.Counter()
+        self.errors = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ws_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"ws://{host}:{port}"
+
+    def start(self) -> "MockBinanceServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def request_count(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def price(self, asset: str, timestamp_ms: int = None) -> float:
+        """
+        Deterministic price of the asset at a time: a slow wave around a base
+        price, with a faster one on top so the follow line gives signals.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+        base = 10.0 * (self.assets.index(asset) + 1) if asset in self.assets else 1.0
+        hours = timestamp_ms / 3_600_000
+        phase = len(asset)
+        wave = 0.2 * math.sin(hours / 90 + phase) + 0.03 * math.sin(hours / 7)
+        return base * (1 + wave)
+
+    def kline(self, asset: str, open_time: int, step: int) -> list:
+        open_ = self.price(asset, open_time)
+        close = self.price(asset, min(open_time + step, int(time.time() * 1000)))
+        high = max(open_, close) * 1.004
+        low = min(open_, close) * 0.996
+        return [
+            open_time,
+            f"{open_:.8f}",
+            f"{high:.8f}",
+            f"{low:.8f}",
+            f"{close:.8f}",
+            "100.0",
+            open_time + step - 1,
+            "0",
+            1,
+            "0",
+            "0",
+            "0",
+        ]
+
+    def klines(self, asset: str, interval: str, limit: int, start=None, end=None):
+        step = interval_to_milliseconds(interval)
+        now = int(time.time() * 1000)
+        last_open = now // step * step
+        if end is not None:
+            last_open = min(last_open, int(end) // step * step)
+        if start is not None:
+            first_open = -(-int(start) // step) * step
+            last_open = min(last_open, first_open + (limit - 1) * step)
+        else:
+            first_open = last_open - (limit - 1) * step
+        return [
+            self.kline(asset, open_time, step)
+            for open_time in range(first_open, last_open + 1, step)
+        ]
+
+    def _account_weight(self, method: str, path: str, params: dict):
+        weight, _, is_order = RequestScheduler.classify(method, path, params)
+        now = time.monotonic()
+        with self._lock:
+            self.requests[path] += 1
+            self._weights.append((now, weight))
+            self._used_weight += weight
+            while self._weights[0][0] < now - 60:
+                self._used_weight -= self._weights.popleft()[1]
+            if is_order:
+                self._orders.append(now)
+            while self._orders and self._orders[0] < now - 10:
+                self._orders.popleft()
+            return self._used_weight, len(self._orders)
+
+    def _delay_and_fail(self) -> bool:
+        with self._lock:
+            delay = self.latency + self._random.random() * self.jitter
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def _next_order_id(self) -> int:
+        with self._lock:
+            self._order_id += 1
+            return self._order_id
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def _handle(self, method):
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                connection = self.headers.get("Connection", "").lower()
+                if parsed.path == "/stream" and "upgrade" in connection:
+                    server._stream(self, params)
+                    return
+                used_weight, used_orders = server._account_weight(
+                    method, parsed.path, params
+                )
+                headers = {
+                    "X-MBX-USED-WEIGHT-1M": str(used_weight),
+                    "X-MBX-ORDER-COUNT-10S": str(used_orders),
+                }
+                if server._delay_and_fail():
+                    if server.error_status in (418, 429):
+                        headers["Retry-After"] = "1"
+                    self._send(
+                        server.error_status,
+                        {"code": -1000, "msg": "Injected error"},
+                        headers,
+                    )
+                    return
+                status, body = server._route(method, parsed.path, params)
+                self._send(status, body, headers)
+
+            def _send(self, status, body, headers):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def _route(self, method: str, path: str, params: dict):
+        if path == "/api/v3/time":
+            return 200, {"serverTime": int(time.time() * 1000)}
+        if path == "/api/v3/exchangeInfo":
+            return 200, {"symbols": [self._symbol_info(a) for a in self.assets]}
+        if path == "/api/v3/ticker/price":
+            if "symbol" in params:
+                asset = params["symbol"][: -len("USDT")]
+                if asset not in self.assets:
+                    return 400, {"code": -1121, "msg": "Invalid symbol."}
+                return 200, {
+                    "symbol": params["symbol"],
+                    "price": f"{self.price(asset):.8f}",
+                }
+            return 200, [
+                {"symbol": a + "USDT", "price": f"{self.price(a):.8f}"}
+                for a in self.assets
+            ]
+        if path == "/api/v3/klines":
+            asset = params.get("symbol", "")[: -len("USDT")]
+            if asset not in self.assets:
+                return 400, {"code": -1121, "msg": "Invalid symbol."}
+            return 200, self.klines(
+                asset,
+                params.get("interval", "1d"),
+                min(int(params.get("limit", 500)), 1000),
+                params.get("startTime"),
+                params.get("endTime"),
+            )
+        if path == "/api/v3/account":
+            balances = [{"asset": "USDT", "free": "10000.0", "locked": "0.0"}]
+            balances += [
+                {"asset": a, "free": "1.0", "locked": "0.0"} for a in self.assets
+            ]
+            return 200, {"balances": balances}
+        if path == "/api/v3/order" and method == "POST":
+            return 200, {
+                "symbol": params.get("symbol"),
+                "orderId": self._next_order_id(),
+                "side": params.get("side"),
+                "type": params.get("type"),
+                "executedQty": params.get("quantity"),
+                "status": "FILLED",
+            }
+        return 404, {"code": -1, "msg": f"Unknown endpoint {method} {path}"}
+
+    @staticmethod
+    def _symbol_info(asset: str) -> dict:
+        return {
+            "symbol": asset + "USDT",
+            "status": "TRADING",
+            "baseAsset": asset,
+            "quoteAsset": "USDT",
+            "filters": [
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": "0.00001",
+                    "stepSize": "0.00001",
+                },
+                {"filterType": "NOTIONAL", "minNotional": "5.0"},
+            ],
+        }
+
+    def _stream(self, handler, params: dict):
+        """
+        Serve a combined kline/miniTicker stream until the client disconnects.
+        """
+        with self._lock:
+            self.requests["/stream"] += 1
+        key = handler.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest())
+        handler.send_response(101, "Switching Protocols")
+        handler.send_header("Upgrade", "websocket")
+        handler.send_header("Connection", "Upgrade")
+        handler.send_header("Sec-WebSocket-Accept", accept.decode())
+        handler.end_headers()
+        handler.wfile.flush()
+        handler.close_connection = True
+
+        streams = [s for s in params.get("streams", "").split("/") if s]
+        try:
+            while True:
+                now = int(time.time() * 1000)
+                for stream in streams:
+                    symbol, _, kind = stream.partition("@")
+                    asset = symbol.upper()[: -len("USDT")]
+                    if asset not in self.assets:
+                        continue
+                    if kind.startswith("kline_"):
+                        interval = kind[len("kline_") :]
+                        step = interval_to_milliseconds(interval)
+                        k = self.kline(asset, now // step * step, step)
+                        data = {
+                            "e": "kline",
+                            "E": now,
+                            "s": symbol.upper(),
+                            "k": {
+                                "t": k[0],
+                                "T": k[6],
+                                "s": symbol.upper(),
+                                "i": interval,
+                                "o": k[1],
+                                "h": k[2],
+                                "l": k[3],
+                                "c": k[4],
+                                "v": k[5],
+                                "x": False,
+                            },
+                        }
+                    elif kind == "miniTicker":
+                        data = {
+                            "e": "24hrMiniTicker",
+                            "E": now,
+                            "s": symbol.upper(),
+                            "c": f"{self.price(asset, now):.8f}",
+                        }
+                    else:
+                        continue
+                    message = json.dumps({"stream": stream, "data": data}).encode()
+                    handler.wfile.write(self._ws_frame(message))
+                handler.wfile.flush()
+                time.sleep(self.stream_interval)
+        except OSError:
+            pass  # Client went away
+
+    @staticmethod
+    def _ws_frame(payload: bytes) -> bytes:
+        length = len(payload)
+        if length < 126:
+            header = bytes([0x81, length])
+        elif length < 1 << 16:
+            header = bytes([0x81, 126]) + struct.pack("!H", length)
+        else:
+            header = bytes([0x81, 127]) + struct.pack("!Q", length)
+        return header + payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+
+    server = MockBinanceServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        port=args.port,
+    ).start()
+    print(f"Mock Binance listening on {server.url} (streams on {server.ws_url})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+End-to-end order processing throughput against the local mock exchange.
+
+Builds N orders (take profit, stop loss and IntelliFour, spread over the mock's
+assets), each with its own BinanceAPI pointed at a MockBinanceServer, and runs
+full processing cycles with OrderProcessor and AsyncOrderProcessor. Reports
+cycle time, requests per cycle and orders per second for the first (cold)
+cycle and the following (warm) ones. Run from the repository root:
+
+    python -m benchmarks.order_throughput_benchmark
+    python -m benchmarks.order_throughput_benchmark --sizes 10 100 --latency 0.05
+    python -m benchmarks.order_throughput_benchmark --processor async --rate-limit
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from api.binance_api import BinanceAPI
+from benchmarks.mock_binance_server import MockBinanceServer
+from controller.async_order_processor import AsyncOrderProcessor
+from controller.order_processor import OrderProcessor
+from helper.request_scheduler import RequestScheduler
+from model.intelli_four_order import IntelliFourOrder
+from model.stop_loss_order import StopLossOrder
+from model.take_profit_order import TakeProfitOrder
+from service.kline_store_service import kline_store
+
+
+def make_orders(count: int, server: MockBinanceServer, scheduler: RequestScheduler):
+    """
+    `count` orders cycling through the order kinds and the mock's assets. Take
+    profit and stop loss thresholds are out of reach, so they keep waiting.
+    """
+    orders = []
+    for i in range(count):
+        kind = i % 3
+        asset = server.assets[i % len(server.assets)]
+        adapter = BinanceAPI("key", "secret", base_url=server.url, scheduler=scheduler)
+        if kind == 0:
+            order = TakeProfitOrder(i, asset, 1e12, "", "binance", adapter=adapter)
+        elif kind == 1:
+            order = StopLossOrder(i, asset, 0.0, "", "binance", adapter=adapter)
+        else:
+            order = IntelliFourOrder(i, asset, 10.0, "", "binance", adapter=adapter)
+        orders.append(order)
+    return orders
+
+
+def run_cycles(kind: str, orders, server, cycles: int, concurrency: int, orders_file):
+    """
+    (seconds, requests) of each cycle.
+    """
+    results = []
+    if kind == "sync":
+        processor = OrderProcessor(orders, orders_file=orders_file)
+        processor.running = True
+        for _ in range(cycles):
+            requests = server.request_count()
+            started = time.perf_counter()
+            processor.run_cycle()
+            results.append(
+                (time.perf_counter() - started, server.request_count() - requests)
+            )
+        return results
+
+    processor = AsyncOrderProcessor(
+        orders, max_concurrency=concurrency, orders_file=orders_file
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+        processor.running = True
+        for _ in range(cycles):
+            requests = server.request_count()
+            started = time.perf_counter()
+            await processor.run_cycle()
+            results.append(
+                (time.perf_counter() - started, server.request_count() - requests)
+            )
+
+    asyncio.run(run())
+    return results
+
+
+def benchmark(kind: str, size: int, args, workdir: str) -> dict:
+    server = MockBinanceServer(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate
+    ).start()
+    scheduler = (
+        RequestScheduler()
+        if args.rate_limit
+        else RequestScheduler(weight_limit=10**9, order_limit=10**9)
+    )
+    try:
+        orders = make_orders(size, server, scheduler)
+        orders_file = os.path.join(workdir, f"orders_{kind}_{size}.json")
+        results = run_cycles(
+            kind, orders, server, args.cycles, args.concurrency, orders_file
+        )
+    finally:
+        server.stop()
+
+    cold_time, cold_requests = results[0]
+    warm = results[1:] or results
+    warm_time = sum(seconds for seconds, _ in warm) / len(warm)
+    warm_requests = sum(requests for _, requests in warm) / len(warm)
+    usage = scheduler.usage()["weight"]
+    return {
+        "processor": kind,
+        "orders": size,
+        "cold_cycle_s": round(cold_time, 3),
+        "cold_requests": cold_requests,
+        "warm_cycle_s": round(warm_time, 3),
+        "warm_requests": round(warm_requests, 1),
+        "orders_per_s": round(size / warm_time, 1),
+        "rate_wait_s": usage["waited_seconds"],
+        "shed": usage["shed"],
+        "errors": server.errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 100, 1_000, 10_000]
+    )
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument(
+        "--processor", choices=["sync", "async", "both"], default="both"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="Keep to the real Binance rate limits instead of an unlimited budget.",
+    )
+    args = parser.parse_args()
+
+    logging.getLogger("NightOwlTraderLogger").setLevel(logging.WARNING)
+    kinds = ["sync", "async"] if args.processor == "both" else [args.processor]
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep the mock's candles out of the real candle store.
+        kline_store.root = os.path.join(workdir, "klines")
+        for size in args.sizes:
+            for kind in kinds:
+                rows.append(benchmark(kind, size, args, workdir))
+                print(rows[-1])
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print()
+        print(pd.DataFrame(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import pyqtSignal, QObject
+import helper.utils
+
+
+class AsyncOrderProcessor(QObject):
+    """
+    Processes all orders of a cycle concurrently on an asyncio event loop.
+
+    The adapters are blocking, so every order is processed on one of
+    `max_concurrency` worker threads (AbstractOrder.process_async) and the
+    event loop only schedules them. A cycle of N orders therefore takes
+    about N / max_concurrency times the slowest order rather than the sum of
+    all of them; raise `max_concurrency` for many orders, the HTTP session
+    pool keeps up to 20 connections per host. Orders share one portfolio
+    snapshot per platform and cycle, like in OrderProcessor. Orders deciding
+    on that snapshot run one at a time per platform, so after a trade the
+    next one sees a fresh snapshot instead of selling the same holdings again.
+
+    With Qt, start `process_orders` on a thread as with OrderProcessor; the
+    signals reach the UI thread through Qt's queued connections. Headless, run
+    `asyncio.run(processor.run())`. `stop` ends the wait between cycles and
+    cancels the orders of the running cycle. A thread cannot be interrupted,
+    so `run` waits for the requests already sent (bounded by the HTTP
+    timeouts) and saves the orders before it returns.
+
+    Between cycles, `notify` (e.g. from the market stream) processes the
+    orders interested in an asset's event right away, at most once every
+    `min_wake_interval` seconds.
+    """
+
+    order_processed = pyqtSignal()  # Signal to update UI safely
+    processing_finished = pyqtSignal()  # Signal when stopping
+
+    def __init__(
+        self,
+        orders,
+        max_concurrency: int = 8,
+        interval: float = 20,
+        min_wake_interval: float = 2,
+        orders_file: str = "config/orders.json",
+    ):
+        """
+        Args:
+            orders (list): The orders to process.
+            max_concurrency (int): Orders evaluated at the same time.
+            interval (float): Seconds to wait between cycles.
+            min_wake_interval (float): Seconds between cycles started by `notify`.
+            orders_file (str): File the orders are saved to when they change.
+        """
+        super().__init__()
+        self.orders = orders
+        self.max_concurrency = max_concurrency
+        self.interval = interval
+        self.min_wake_interval = min_wake_interval
+        self.orders_file = orders_file
+        self.running = False
+        self.last_cycle_time = None
+        self._loop = None
+        self._stop_event = None
+        self._wake_event = None
+        self._pending = {}  # Orders woken by notify, by id
+        self._tasks = set()  # Order tasks of the running cycle
+        self._cancelled = False
+
+    def process_orders(self):
+        """Runs cycles on a new event loop in the calling thread until stopped."""
+        asyncio.run(self.run())
+
+    async def run(self):
+        """Runs a cycle every `interval` seconds until stopped."""
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
+        self._cancelled = False
+        # Blocking adapter calls run on these threads, one per concurrent order.
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._loop.set_default_executor(executor)
+        self.running = True
+        try:
+            while self.running:
+                await self.run_cycle()
+                deadline = self._loop.time() + self.interval
+                while self.running and await self._wait_for_wake(deadline):
+                    orders = list(self._pending.values())
+                    self._pending.clear()
+                    await self.run_cycle(orders)
+                    # Events of the next moments are handled together.
+                    await self._sleep(self.min_wake_interval)
+        finally:
+            self.running = False
+            # Cancelled orders may still be running on the threads.
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self._cancelled:
+                helper.utils.write_orders(self.orders, self.orders_file)
+            self.processing_finished.emit()  # Notify when stopped
+
+    async def run_cycle(self, orders=None):
+        """Processes every order, or the given ones, once."""
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        snapshots = {}  # One portfolio snapshot task per platform and cycle
+        snapshot_locks = {}  # Serialises the snapshot orders of a platform
+        tasks = [
+            asyncio.ensure_future(
+                self._process_order(order, semaphore, snapshots, snapshot_locks)
+            )
+            for order in (self.orders if orders is None else orders)
+        ]
+        self._tasks.update(tasks)
+        try:
+            # Returns once every order is done or its cancellation has completed.
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._tasks.difference_update(tasks)
+        if any(isinstance(result, asyncio.CancelledError) for result in results):
+            self._cancelled = True
+        self.last_cycle_time = time.perf_counter() - started
+
+    async def _wait_for_wake(self, deadline) -> bool:
+        """
+        Waits until notified orders are pending (True), or until the deadline
+        or stop (False).
+        """
+        waiters = [
+            asyncio.ensure_future(self._wake_event.wait()),
+            asyncio.ensure_future(self._stop_event.wait()),
+        ]
+        timeout = max(deadline - self._loop.time(), 0)
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in waiters:
+            waiter.cancel()
+        if self._stop_event.is_set() or not self._wake_event.is_set():
+            return False
+        self._wake_event.clear()
+        return True
+
+    async def _sleep(self, seconds: float):
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def notify(self, asset: str, event: str):
+        """
+        Process the orders of `asset` interested in `event` soon; safe to call
+        from any thread.
+        """
+        if self._loop is None or not self.running:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wake, asset.upper(), event)
+        except RuntimeError:
+            pass  # The loop has already finished
+
+    def _wake(self, asset: str, event: str):
+        for order in self.orders:
+            if (
+                order.asset.upper() == asset
+                and event in order.stream_events
+                and order.state != order.State.COMPLETED
+            ):
+                self._pending[order.id] = order
+        if self._pending:
+            self._wake_event.set()
+
+    async def _process_order(self, order, semaphore, snapshots, snapshot_locks):
+        if not order.uses_portfolio_snapshot:
+            await self._run_order(order, semaphore, snapshots)
+            return
+        # Taken before a slot, so waiting orders don't hold slots the others need.
+        lock = snapshot_locks.setdefault(order.platform, asyncio.Lock())
+        async with lock:
+            await self._run_order(order, semaphore, snapshots)
+
+    async def _run_order(self, order, semaphore, snapshots):
+        async with semaphore:
+            if not self.running:
+                return  # Stopped while waiting for a free slot
+            before = order.to_dict()
+            trades = order.trades
+            try:
+                await order.process_async(await self._portfolio_snapshot(order, snapshots))
+            except Exception as e:
+                print(f"Processing order {order.id} failed: {e}")
+            if order.trades != trades:
+                # The order traded, balances are no longer current.
+                snapshots.pop(order.platform, None)
+            if order.to_dict() != before:
+                # Only changes are saved, the file holds all orders.
+                helper.utils.write_orders(self.orders, self.orders_file)
+            self.order_processed.emit()  # UI safe update
+
+    async def _portfolio_snapshot(self, order, snapshots):
+        """
+        Snapshot of the order's account, fetched at most once per cycle and
+        platform; orders of the same platform wait for the same request.
+        """
+        if not order.uses_portfolio_snapshot or order.adapter is None:
+            return None
+        if order.state == order.State.COMPLETED:
+            return None
+        task = snapshots.get(order.platform)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_snapshot(order))
+            snapshots[order.platform] = task
+        # Shielded, so a cancelled order does not cancel the others' request.
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _fetch_snapshot(order):
+        try:
+            return await asyncio.to_thread(order.adapter.fetch_portfolio_snapshot)
+        except Exception as e:
+            print(f"Portfolio snapshot failed for {order.platform}: {e}")
+            return None
+
+    def stop(self):
+        """Stops processing; safe to call from any thread."""
+        self.running = False
+        if self._loop is not None and self._stop_event is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._cancel)
+            except RuntimeError:
+                pass  # The loop has already finished
+
+    def _cancel(self):
+        self._stop_event.set()
+        for task in self._tasks:
+            task.cancel()
@@ -73,7 +73,10 @@ class CommandController(QObject):
 
     def retrieve_historic_data(self, order_id):
         try:
-            historic_data = HistoricDataService.get_historic_data(order_id)
+            # Prefetched charts render from memory, others are downloaded first.
+            historic_data = HistoricDataService.get_cached_data(order_id)
+            if historic_data is None:
+                historic_data = HistoricDataService.get_historic_data(order_id)
             self.data_loaded_signal.emit(historic_data)
         except Exception as e:
             QtWidgets.QMessageBox.critical(
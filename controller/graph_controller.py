@@ -2,6 +2,7 @@ from PyQt6 import QtWidgets
 from algorithms.base_algorithm import Algorithm
 from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
 from service.chart_data_service import ChartDataService
+from service.backtest_service import BacktestService
 
 
 class GraphController:
@@ -43,8 +44,17 @@ class GraphController:
 
         # Prepare segments and labels
         segments, labels = self.algorithm.create_trend_segments(self.data)
-        potential_growth = self.algorithm.simulate_potential_profit(segments, labels)
-        title = "100 USD → {:.2f} USD (Simulated)".format(potential_growth)
+        backtest = BacktestService.run(self.data, self.algorithm)
+        title = (
+            "100 USD → {:.2f} USD (Backtest) | Max DD {:.1%} | Sharpe {:.2f} | "
+            "Win rate {:.0%} of {} trades"
+        ).format(
+            backtest.final_balance,
+            backtest.max_drawdown,
+            backtest.sharpe_ratio,
+            backtest.win_rate,
+            len(backtest.trades),
+        )
 
         # Delegate plotting to the view
         self.graph_view.plot_chart(
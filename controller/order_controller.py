@@ -5,15 +5,18 @@ import threading
 import helper.utils
 from helper.logger import log_message
 from model.order_factory import create_order  # Use the factory for order creation
-from controller.order_processor import OrderProcessor
+from controller.async_order_processor import AsyncOrderProcessor
 from model.abstract_order import AbstractOrder  # For type hints
 from api.adapter_factory import AdapterFactory
+from service.chart_prefetch_service import ChartPrefetchService
 
 
 class OrderController(QObject):
     orders_updated_signal = pyqtSignal(object)
     selected_order_changed_signal = pyqtSignal(int)  # id of the selected order
     reset_graph_signal = pyqtSignal()
+    prefetch_progress_signal = pyqtSignal(object)  # ChartPrefetchService.progress()
+    asset_checked_signal = pyqtSignal(object, object, bool)  # inputs, adapter, exists
 
     def __init__(self, orderView):
         super(OrderController, self).__init__()
@@ -23,6 +26,7 @@ class OrderController(QObject):
         self.orders_lock = threading.Lock()  # Lock for thread safety
         self.thread = None  # Store reference to the thread
         self.worker = None
+        self.stream_adapter = None  # Adapter running the market stream
         self.currently_selected_order_id = None
 
         # Connect the Add button click to the add_order method.
@@ -30,9 +34,17 @@ class OrderController(QObject):
         self.orders_updated_signal.connect(self.orderView.update_list)
         self.orderView.order_deleted_signal.connect(self.delete_order_clicked)
         self.orderView.orderListWidget.itemClicked.connect(self.on_item_clicked)
+        self.asset_checked_signal.connect(self.add_checked_order)
+
+        # Warm the chart history of all orders in the background; the progress
+        # is reported from the prefetch threads and shown by the view.
+        self.prefetcher = ChartPrefetchService()
+        self.prefetcher.add_listener(self.prefetch_progress_signal.emit)
+        self.prefetch_progress_signal.connect(self.orderView.update_prefetch_progress)
 
         # Load orders from file on startup.
         self.load_orders()
+        self.prefetcher.start()
 
     def handle_start_processing_orders(self):
         """
@@ -42,15 +54,38 @@ class OrderController(QObject):
             print("Processing is already running!")
             return
 
-        self.worker = OrderProcessor(self.orders)  # Create worker
+        self.worker = AsyncOrderProcessor(self.orders)  # Create worker
         self.worker.order_processed.connect(
             self.handle_order_processed
         )  # UI safe updates
         self.worker.processing_finished.connect(self.handle_processing_finished)
 
-        # Run in a separate Python thread
+        # Run the processor's event loop in a separate Python thread
         self.thread = threading.Thread(target=self.worker.process_orders, daemon=True)
         self.thread.start()
+        self.start_market_stream()
+
+    def start_market_stream(self):
+        """
+        Streams candles and prices of the Binance orders' assets and wakes the
+        orders on updates, instead of waiting for the next polling cycle.
+        """
+        with self.orders_lock:
+            streamed = [
+                order
+                for order in self.orders
+                if order.platform.lower() == "binance"
+                and order.adapter is not None
+                and order.stream_events
+                and order.state != order.State.COMPLETED
+            ]
+        if not streamed:
+            return
+        self.stream_adapter = streamed[0].adapter
+        stream = self.stream_adapter.start_market_stream(
+            order.asset for order in streamed
+        )
+        stream.add_listener(self.worker.notify)
 
     def handle_stop_processing_orders(self):
         """
@@ -58,6 +93,17 @@ class OrderController(QObject):
         """
         if self.worker:
             self.worker.stop()
+        if self.stream_adapter:
+            self.stream_adapter.stop_market_stream()
+            self.stream_adapter = None
+
+    def shutdown(self):
+        """
+        Stops order processing and the chart prefetching when the application
+        quits.
+        """
+        self.handle_stop_processing_orders()
+        self.prefetcher.stop()
 
     def handle_order_processed(self):
         """Runs in the main thread, so it's safe to update the UI"""
@@ -90,6 +136,7 @@ class OrderController(QObject):
                     break
             if order_to_remove:
                 self.orders.remove(order_to_remove)
+            self.prefetcher.set_orders(self.orders)
         helper.utils.write_orders(self.orders)
 
         self.orders_updated_signal.emit(self.orders)
@@ -116,10 +163,46 @@ class OrderController(QObject):
             )
             return
 
-        amount = float(amount_text)
+        inputs = {
+            "asset": asset,
+            "amount": float(amount_text),
+            "position": position,
+            "platform": platform,
+        }
 
         adapter = AdapterFactory.get_adapter(platform)
 
+        # The first asset check may wait for the exchange's symbol list, so it
+        # runs in a separate thread and reports back via asset_checked_signal.
+        self.orderView.addOrderButton.setEnabled(False)
+        threading.Thread(
+            target=self.check_asset, args=(inputs, adapter), daemon=True
+        ).start()
+
+    def check_asset(self, inputs: dict, adapter):
+        """
+        Runs in a worker thread: checks that the platform trades the asset.
+        """
+        try:
+            asset_exists = adapter is None or adapter.has_asset(inputs["asset"])
+        except Exception as e:
+            print(f"Could not verify asset {inputs['asset']}: {e}")
+            asset_exists = True
+        self.asset_checked_signal.emit(inputs, adapter, asset_exists)
+
+    def add_checked_order(self, inputs: dict, adapter, asset_exists: bool):
+        """Runs in the main thread once the asset has been checked."""
+        self.orderView.addOrderButton.setEnabled(True)
+        asset = inputs["asset"]
+        amount = inputs["amount"]
+        position = inputs["position"]
+        platform = inputs["platform"]
+        if not asset_exists:
+            QtWidgets.QMessageBox.warning(
+                None, "Input Error", f"{asset} is not traded on {platform}."
+            )
+            return
+
         with self.orders_lock:
             new_order_id = max([order.id for order in self.orders], default=0) + 1
             order_data = {
@@ -136,6 +219,7 @@ class OrderController(QObject):
             new_order.adapter = adapter
             self.orders.append(new_order)
 
+        self.prefetcher.add_orders([new_order])
         helper.utils.write_orders(self.orders)
         self.orders_updated_signal.emit(self.orders)
 
@@ -153,6 +237,7 @@ class OrderController(QObject):
             orders_data: List[AbstractOrder] = helper.utils.read_orders()
             with self.orders_lock:
                 self.orders = orders_data
+            self.prefetcher.set_orders(orders_data)
 
             # Emit signal to update the view
             self.orders_updated_signal.emit(self.orders)
@@ -7,25 +7,20 @@ class OrderProcessor(QObject):
     order_processed = pyqtSignal()  # Signal to update UI safely
     processing_finished = pyqtSignal()  # Signal when stopping
 
-    def __init__(self, orders):
+    def __init__(self, orders, orders_file="config/orders.json"):
         super().__init__()
         self.orders = orders
+        self.orders_file = orders_file
         self.running = False
         self.stop_event = threading.Event()  # 🔹 Event to interrupt sleep
 
     def process_orders(self):
-        """Continuously processes orders every 10 seconds until stopped."""
+        """Continuously processes orders every 20 seconds until stopped."""
         self.running = True
         self.stop_event.clear()  # Ensure event is reset
 
         while self.running:
-            for order in self.orders:
-                if not self.running:
-                    break  # Exit early if stopped
-
-                order.process()
-                helper.utils.write_orders(self.orders)
-                self.order_processed.emit()  # UI safe update
+            self.run_cycle()
 
             # 🔹 Instead of time.sleep(10), wait but allow early exit
             if self.stop_event.wait(20):
@@ -33,6 +28,43 @@ class OrderProcessor(QObject):
 
         self.processing_finished.emit()  # Notify when stopped
 
+    def run_cycle(self):
+        """Processes every order once."""
+        snapshots = {}  # One portfolio snapshot per platform and cycle
+        for order in self.orders:
+            if not self.running:
+                break  # Exit early if stopped
+
+            before = order.to_dict()
+            trades = order.trades
+            order.process(self._portfolio_snapshot(order, snapshots))
+            if order.trades != trades:
+                # The order traded, balances are no longer current.
+                snapshots.pop(order.platform, None)
+            if order.to_dict() != before:
+                # Only changes are saved, the file holds all orders.
+                helper.utils.write_orders(self.orders, self.orders_file)
+            self.order_processed.emit()  # UI safe update
+
+    @staticmethod
+    def _portfolio_snapshot(order, snapshots):
+        """
+        Snapshot of the order's account, fetched at most once per cycle and platform.
+        Returns None when the order does not use one or it could not be fetched, in
+        which case the order queries its balance itself.
+        """
+        if not order.uses_portfolio_snapshot or order.adapter is None:
+            return None
+        if order.state == order.State.COMPLETED:
+            return None
+        if order.platform not in snapshots:
+            try:
+                snapshots[order.platform] = order.adapter.fetch_portfolio_snapshot()
+            except Exception as e:
+                print(f"Portfolio snapshot failed for {order.platform}: {e}")
+                snapshots[order.platform] = None
+        return snapshots[order.platform]
+
     def stop(self):
         """Stops processing immediately."""
         self.running = False
@@ -0,0 +1,136 @@
+import gzip
+import io
+import threading
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+
+
+class HttpSessionPool:
+    """
+    A requests.Session with a sized connection pool, keep-alive and default timeouts.
+
+    Connections to a host are kept open and reused by later requests, so repeated
+    calls to the same API pay the TCP and TLS handshake only once per pooled
+    connection. The session is safe to share between the GUI thread and the order
+    processing thread.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        max_retries: int = 0,
+    ):
+        """
+        Args:
+            pool_connections (int): Number of hosts to keep connection pools for.
+            pool_maxsize (int): Maximum open connections kept per host.
+            timeout (float or tuple): Default (connect, read) timeout in seconds,
+                used when a request does not pass its own.
+            max_retries (int): Retries for failed connection attempts.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=False,
+        )
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests += 1
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Connection reuse metrics: requests sent, connections opened, and how many
+        requests went over an already open connection.
+        """
+        opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        with self._lock:
+            sent = self._requests
+        return {
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(sent - opened, 0),
+        }
+
+    def close(self):
+        self.session.close()
+
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def stream_body(response: requests.Response) -> BinaryIO:
+    """
+    Readable binary stream over the body of a response requested with
+    stream=True, so it can be parsed while it arrives instead of being held
+    in memory or written to a file first.
+
+    A Content-Encoding (gzip, deflate) is decoded on the way, and a body that
+    is itself gzip-compressed (e.g. a .csv.gz download) is decompressed too.
+    """
+    response.raw.decode_content = True
+    # Keeps the raw stream readable for io wrappers once the body is consumed.
+    response.raw.auto_close = False
+    body = io.BufferedReader(response.raw)
+    if body.peek(len(GZIP_MAGIC))[: len(GZIP_MAGIC)] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=body, mode="rb")
+    return body
+
+
+_pools: Dict[str, HttpSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool(name: str = "default", **settings) -> HttpSessionPool:
+    """
+    Return the process-wide session pool `name`, creating it on first use.
+
+    Args:
+        name (str): Pool name, e.g. one per exchange.
+        **settings: HttpSessionPool arguments, only used when the pool is created.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = HttpSessionPool(**settings)
+            _pools[name] = pool
+        return pool
+
+
+def close_session_pools(name: Optional[str] = None):
+    """
+    Close one named pool, or all of them.
+    """
+    with _pools_lock:
+        names = [name] if name is not None else list(_pools)
+        for pool_name in names:
+            pool = _pools.pop(pool_name, None)
+            if pool is not None:
+                pool.close()
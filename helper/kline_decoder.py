@@ -0,0 +1,54 @@
+from itertools import chain
+from operator import itemgetter
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from helper.time_utils import milliseconds_to_datetime64
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+_open_time = itemgetter(0)
+_price_fields = [itemgetter(index) for index in range(1, len(PRICE_COLUMNS) + 1)]
+
+
+def decode_klines(data: list, float32: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode raw exchange klines ([open_time, open, high, low, close, volume, ...])
+    straight into NumPy arrays, skipping the fields after the volume.
+
+    The prices arrive as strings and are parsed by np.fromiter while filling a
+    preallocated array column by column, without an intermediate object array
+    or DataFrame, so every column is a contiguous row of the result.
+
+    Args:
+        data (list): Klines as decoded from the JSON payload.
+        float32 (bool, optional): Decode prices and volume as float32.
+
+    Returns:
+        tuple: (int64 open times in milliseconds, float prices of shape
+               (5, len(data)) in PRICE_COLUMNS order)
+    """
+    count = len(data)
+    timestamps = np.fromiter(map(_open_time, data), dtype=np.int64, count=count)
+    prices = np.fromiter(
+        chain.from_iterable(map(field, data) for field in _price_fields),
+        dtype=np.float32 if float32 else np.float64,
+        count=count * len(PRICE_COLUMNS),
+    ).reshape(len(PRICE_COLUMNS), count)
+    return timestamps, prices
+
+
+def klines_to_frame(data: list, float32: bool = False) -> pd.DataFrame:
+    """
+    Build the OHLCV DataFrame returned by get_historic_data from raw klines.
+
+    The DataFrame is built on the decoded price arrays without copying them;
+    the timestamps are converted to datetime64[ns] like in every other frame.
+    """
+    timestamps, prices = decode_klines(data, float32)
+    columns = {"timestamp": milliseconds_to_datetime64(timestamps)}
+    for index, column in enumerate(PRICE_COLUMNS):
+        columns[column] = prices[index]
+    return pd.DataFrame(columns, copy=False)
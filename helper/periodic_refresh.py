@@ -0,0 +1,60 @@
+import abc
+import threading
+from typing import Optional
+
+
+class PeriodicRefresh(abc.ABC):
+    """
+    Base of services that keep exchange data current in a background thread.
+
+    After `start`, `_refresh` runs at once and then every `refresh_interval`
+    seconds until `stop`. A failed refresh is logged and retried at the next
+    interval, so the service keeps serving its last good data meanwhile.
+    """
+
+    # Prefix of the message printed when a background refresh fails.
+    refresh_error = "Background refresh failed"
+
+    def __init__(self, refresh_interval: float):
+        """
+        Args:
+            refresh_interval (float): Seconds between background refreshes.
+        """
+        self.refresh_interval = refresh_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abc.abstractmethod
+    def _refresh(self):
+        """
+        One background refresh.
+        """
+
+    @property
+    def running(self) -> bool:
+        """
+        True while the background thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Refresh in the background every `refresh_interval` seconds.
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self._refresh()
+            except Exception as e:
+                print(f"{self.refresh_error}: {e}")
+            if self._stop_event.wait(self.refresh_interval):
+                break
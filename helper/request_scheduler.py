@@ -0,0 +1,267 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from requests.exceptions import RequestException
+
+PRIORITY_ORDER = 0  # Order placement
+PRIORITY_ACCOUNT = 1  # Balances
+PRIORITY_DATA = 2  # Market data
+
+# Share of the budget each priority must leave untouched for the ones above it.
+RESERVE = {PRIORITY_ORDER: 0.0, PRIORITY_ACCOUNT: 0.1, PRIORITY_DATA: 0.2}
+# Seconds a request waits for budget before it is shed (None waits as long as needed).
+MAX_WAIT = {PRIORITY_ORDER: None, PRIORITY_ACCOUNT: 30.0, PRIORITY_DATA: 10.0}
+
+# Request weight per endpoint, (method, path) -> weight; the bulk ticker without
+# a symbol is heavier than a single one.
+ENDPOINT_WEIGHTS = {
+    ("GET", "/api/v3/time"): 1,
+    ("GET", "/api/v3/exchangeInfo"): 20,
+    ("GET", "/api/v3/klines"): 2,
+    ("GET", "/api/v3/ticker/price"): 4,
+    ("GET", "/api/v3/account"): 20,
+    ("POST", "/api/v3/order"): 1,
+}
+ORDER_ENDPOINTS = {("POST", "/api/v3/order")}
+
+
+class RateLimitExceeded(RequestException):
+    """
+    Raised instead of sending a request that would not fit the budget in time.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket of `capacity` tokens refilled evenly over `period` seconds.
+
+    Callers wait in priority order; each priority may only use the tokens
+    above its reserve, so lower priorities can never drain the budget the
+    higher ones need.
+    """
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.period = period
+        self._rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self.shed = 0
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def acquire(self, amount: float, priority: int, max_wait: Optional[float]):
+        """
+        Take `amount` tokens, waiting behind higher priorities and for refills.
+
+        Raises:
+            RateLimitExceeded: If the tokens cannot be had within `max_wait` seconds.
+        """
+        started = time.monotonic()
+        deadline = None if max_wait is None else started + max_wait
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._blocked_until - now
+                    if self._queue[0] == ticket and wait <= 0:
+                        available = self._tokens - RESERVE[priority] * self.capacity
+                        if available >= amount:
+                            self._tokens -= amount
+                            self.waited += now - started
+                            return
+                        wait = (amount - available) / self._rate
+                    if deadline is not None and now + max(wait, 0) > deadline:
+                        self.shed += 1
+                        raise RateLimitExceeded(
+                            f"Request shed, rate limit budget exhausted for {max_wait}s"
+                        )
+                    # Woken early when the queue changes.
+                    self._cond.wait(wait if wait > 0 else None)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def sync_used(self, used: float):
+        """
+        Align with the usage the server reports for the current window.
+        """
+        with self._cond:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, self.capacity - used)
+
+    def block(self, seconds: float):
+        """
+        Hold all requests for `seconds`, e.g. after a 429 or 418 answer.
+        """
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            self._cond.notify_all()
+
+    def usage(self) -> Dict[str, float]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "used": round(self.capacity - self._tokens, 1),
+                "limit": self.capacity,
+                "queued": len(self._queue),
+                "shed": self.shed,
+                "waited_seconds": round(self.waited, 3),
+                "blocked_seconds": round(max(self._blocked_until - now, 0.0), 3),
+            }
+
+
+class RequestScheduler:
+    """
+    Sends exchange requests within the request weight and order rate limits.
+
+    Every request takes its endpoint's weight from a token bucket before it is
+    sent, and order placements also take one order from the order bucket. The
+    buckets are aligned with the X-MBX-USED-WEIGHT-* and X-MBX-ORDER-COUNT-*
+    headers of every answer, and a 429/418 answer holds all requests for its
+    Retry-After. Order placement goes first, then account requests, then
+    market data, which is shed when the budget stays exhausted.
+    """
+
+    def __init__(
+        self,
+        weight_limit: int = 6000,
+        weight_period: float = 60,
+        order_limit: int = 50,
+        order_period: float = 10,
+        headroom: float = 0.9,
+    ):
+        """
+        Args:
+            weight_limit (int): Request weight allowed per `weight_period`.
+            weight_period (float): Seconds of the request weight window.
+            order_limit (int): Orders allowed per `order_period`.
+            order_period (float): Seconds of the order count window.
+            headroom (float): Share of the exchange limits to use at most.
+        """
+        self.weights = TokenBucket(weight_limit * headroom, weight_period)
+        self.orders = TokenBucket(order_limit * headroom, order_period)
+        self.headroom = headroom
+        self.server_usage: Dict[str, int] = {}
+
+    @staticmethod
+    def classify(method: str, url: str, params: dict = None):
+        """
+        (weight, priority, is_order) of a request.
+        """
+        key = (method.upper(), urlparse(url).path)
+        weight = ENDPOINT_WEIGHTS.get(key, 1)
+        if key == ("GET", "/api/v3/ticker/price") and params and "symbol" in params:
+            weight = 2
+        if key in ORDER_ENDPOINTS:
+            return weight, PRIORITY_ORDER, True
+        if key == ("GET", "/api/v3/account"):
+            return weight, PRIORITY_ACCOUNT, False
+        return weight, PRIORITY_DATA, False
+
+    def send(
+        self,
+        http,
+        method: str,
+        url: str,
+        priority: int = None,
+        sign: Callable[[dict], dict] = None,
+        **kwargs,
+    ):
+        """
+        Send a request through `http` (an HttpSessionPool) once the budget allows.
+
+        Args:
+            sign (Callable, optional): Called with the params once the budget is
+                acquired, right before sending; returns the params to send, e.g.
+                with a fresh timestamp and signature.
+
+        Raises:
+            RateLimitExceeded: If the request was shed.
+        """
+        weight, default_priority, is_order = self.classify(
+            method, url, kwargs.get("params")
+        )
+        priority = default_priority if priority is None else priority
+        if is_order:
+            self.orders.acquire(1, priority, MAX_WAIT[priority])
+        self.weights.acquire(weight, priority, MAX_WAIT[priority])
+
+        if sign is not None:
+            kwargs["params"] = sign(kwargs.get("params") or {})
+        response = http.request(method, url, **kwargs)
+        self._read_headers(response)
+        return response
+
+    def _read_headers(self, response):
+        for name, value in response.headers.items():
+            name = name.lower()
+            if not name.startswith(("x-mbx-used-weight-", "x-mbx-order-count-")):
+                continue
+            try:
+                self.server_usage[name] = int(value)
+            except ValueError:
+                continue
+        used_weight = self.server_usage.get("x-mbx-used-weight-1m")
+        if used_weight is not None:
+            self.weights.sync_used(used_weight)
+        used_orders = self.server_usage.get("x-mbx-order-count-10s")
+        if used_orders is not None:
+            self.orders.sync_used(used_orders)
+        if response.status_code in (418, 429):
+            try:
+                retry_after = float(response.headers.get("Retry-After", 60))
+            except ValueError:
+                retry_after = 60.0
+            self.weights.block(retry_after)
+            self.orders.block(retry_after)
+
+    def usage(self) -> Dict[str, dict]:
+        """
+        Current budget use per bucket and the last usage reported by the server.
+        """
+        return {
+            "weight": self.weights.usage(),
+            "orders": self.orders.usage(),
+            "server": dict(self.server_usage),
+        }
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_request_scheduler(name: str = "default", **settings) -> RequestScheduler:
+    """
+    Return the process-wide request scheduler `name`, creating it on first use.
+
+    Args:
+        name (str): Scheduler name, one per exchange since limits are per IP.
+        **settings: RequestScheduler arguments, only used when it is created.
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = RequestScheduler(**settings)
+            _schedulers[name] = scheduler
+        return scheduler
@@ -0,0 +1,60 @@
+import time
+from datetime import datetime, timezone
+from typing import Union
+
+import numpy as np
+
+_INTERVAL_UNITS_MS = {
+    "s": 1000,
+    "m": 60 * 1000,
+    "h": 60 * 60 * 1000,
+    "d": 24 * 60 * 60 * 1000,
+    "w": 7 * 24 * 60 * 60 * 1000,
+    "M": 30 * 24 * 60 * 60 * 1000,
+}
+
+
+def interval_to_milliseconds(interval: str) -> int:
+    """
+    Convert a candlestick interval such as "1m", "4h" or "1d" to milliseconds.
+    Months ("1M") are approximated as 30 days.
+    """
+    try:
+        return int(interval[:-1]) * _INTERVAL_UNITS_MS[interval[-1]]
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Unknown interval: {interval}")
+
+
+def now_milliseconds() -> int:
+    """
+    Current local time in milliseconds since the epoch.
+    """
+    return int(time.time() * 1000)
+
+
+def to_milliseconds(value: Union[int, str, datetime]) -> int:
+    """
+    Convert epoch milliseconds, an ISO date string ("2021-01-01") or a datetime
+    to milliseconds since the epoch. Dates without a timezone are taken as UTC.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def milliseconds_to_datetime64(milliseconds) -> np.ndarray:
+    """
+    Convert epoch milliseconds to datetime64[ns], the timestamp dtype of all
+    candle frames. pandas 2 parses timestamps to nanoseconds while pandas 3
+    keeps the input unit, so the unit is fixed here rather than left to
+    pandas.to_datetime.
+    """
+    return (
+        np.asarray(milliseconds, dtype=np.int64)
+        .view("datetime64[ms]")
+        .astype("datetime64[ns]")
+    )
@@ -7,18 +7,34 @@ from model.order_factory import create_order
 from model.abstract_order import AbstractOrder
 
 
-def read_csv(file_path, date_parsing=None):
+def read_csv(file_path, date_parsing=None, float32=False):
     """
-    Load CSV data from the given file_path.
+    Load CSV data from the given file_path, or from a readable stream such as
+    helper.http_session.stream_body of a download.
+    With float32=True the float columns are stored as float32, which halves their memory
+    and makes the algorithms compute in float32 as well.
     Returns a tuple (success, result): on success, result is the DataFrame; on failure, an error message.
     """
     try:
         data = pandas.read_csv(file_path, parse_dates=date_parsing)
+        # Parsed dates get the nanosecond resolution of all other candle frames.
+        for column in data.select_dtypes(include="datetime").columns:
+            data[column] = data[column].astype("datetime64[ns]")
+        if float32:
+            data = to_float32(data)
         return True, data
     except Exception as e:
         return False, str(e)
 
 
+def to_float32(data):
+    """
+    Returns a copy of the DataFrame with all float64 columns converted to float32.
+    """
+    float_columns = data.select_dtypes(include="float64").columns
+    return data.astype({column: "float32" for column in float_columns})
+
+
 def load_file(parent_widget):
     """
     Prompts a file dialog to load a CSV file.
@@ -0,0 +1,202 @@
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+class WebSocketError(Exception):
+    pass
+
+
+class WebSocketClient:
+    """
+    Minimal RFC 6455 WebSocket client over the standard library.
+
+    Enough for exchange market data streams: ws:// and wss:// URLs, text and
+    binary messages, fragmented messages, and answering the server's pings.
+    Not thread-safe for concurrent receiving; `send_text` and `close` may be
+    called from other threads.
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        """
+        Args:
+            url (str): ws:// or wss:// URL to connect to.
+            timeout (float): Seconds to wait for connecting and for each message.
+        """
+        self.url = url
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._buffer = b""
+
+    def connect(self):
+        """
+        Open the connection and complete the opening handshake.
+        """
+        parsed = urlparse(self.url)
+        if parsed.scheme not in ("ws", "wss"):
+            raise WebSocketError(f"Unsupported URL scheme: {parsed.scheme}")
+        secure = parsed.scheme == "wss"
+        port = parsed.port or (443 if secure else 80)
+        sock = socket.create_connection((parsed.hostname, port), self.timeout)
+        if secure:
+            context = ssl.create_default_context()
+            sock = context.wrap_socket(sock, server_hostname=parsed.hostname)
+        sock.settimeout(self.timeout)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        sock.sendall(request.encode())
+        self._sock = sock
+        self._buffer = b""
+
+        head = self._read_until(b"\r\n\r\n").decode("latin-1")
+        status, *header_lines = head.split("\r\n")
+        if " 101 " not in status + " ":
+            self._close_socket()
+            raise WebSocketError(f"Handshake failed: {status}")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        expected = base64.b64encode(
+            hashlib.sha1((key + _GUID).encode()).digest()
+        ).decode()
+        if headers.get("sec-websocket-accept") != expected:
+            self._close_socket()
+            raise WebSocketError("Handshake failed: bad Sec-WebSocket-Accept")
+
+    def recv(self) -> Optional[str]:
+        """
+        Wait for the next message. Pings are answered on the way.
+
+        Returns:
+            str: The message (binary messages are decoded as UTF-8), or None
+                 once the server has closed the connection.
+        """
+        fragments = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == OPCODE_PING:
+                self._send_frame(OPCODE_PONG, payload)
+            elif opcode == OPCODE_PONG:
+                continue
+            elif opcode == OPCODE_CLOSE:
+                try:
+                    self._send_frame(OPCODE_CLOSE, payload[:2])
+                except OSError:
+                    pass
+                self._close_socket()
+                return None
+            else:
+                fragments.append(payload)
+                if fin:
+                    return b"".join(fragments).decode("utf-8")
+
+    def send_text(self, message: str):
+        self._send_frame(OPCODE_TEXT, message.encode("utf-8"))
+
+    def close(self):
+        """
+        Send a close frame and close the socket without waiting for the answer.
+        """
+        if self._sock is None:
+            return
+        try:
+            self._send_frame(OPCODE_CLOSE, struct.pack("!H", 1000))
+        except OSError:
+            pass
+        self._close_socket()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _close_socket(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                # Wakes up a recv blocked in another thread, which close alone does not.
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        # Client frames are always masked (RFC 6455, 5.3).
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        with self._send_lock:
+            if self._sock is None:
+                raise WebSocketError("Not connected")
+            self._sock.sendall(header + mask + masked)
+
+    def _read_frame(self):
+        first, second = self._read_exact(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", self._read_exact(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", self._read_exact(8))
+        mask = self._read_exact(4) if second & 0x80 else None
+        payload = self._read_exact(length)
+        if mask:
+            payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        return fin, opcode, payload
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            self._fill()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _read_until(self, marker: bytes) -> bytes:
+        while marker not in self._buffer:
+            self._fill()
+        data, _, self._buffer = self._buffer.partition(marker)
+        return data
+
+    def _fill(self):
+        sock = self._sock
+        if sock is None:
+            raise WebSocketError("Not connected")
+        chunk = sock.recv(65536)
+        if not chunk:
+            self._close_socket()
+            raise WebSocketError("Connection closed by the server")
+        self._buffer += chunk
@@ -1,9 +1,12 @@
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Optional
 from api.base_trading_api import BaseTradingApi
 from algorithms.base_algorithm import Algorithm
 from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+from model.portfolio_snapshot import PortfolioSnapshot
 
 
 @dataclass
@@ -14,15 +17,22 @@ class AbstractOrder(ABC):
         COMPLETED = "completed"
         FAILED = "failed"
 
+    # Orders that decide on account balances get the processor's per-cycle snapshot.
+    uses_portfolio_snapshot = False
+    # Market stream events ("kline", "price") of the asset that should wake the order.
+    stream_events = ()
+
     id: int
     asset: str
     amount: float
     position: str
     platform: str
     adapter: BaseTradingApi = None
-    algorithm: Algorithm = ToTheMoonAlgorithm()
+    algorithm: Algorithm = field(default_factory=ToTheMoonAlgorithm)
     state: State = State.NEW
     last_action: str = ""
+    # Buy/sell orders sent to the exchange since loading, not saved.
+    trades: int = field(default=0, repr=False, compare=False)
 
     def to_dict(self):
         return {
@@ -53,5 +63,12 @@ class AbstractOrder(ABC):
         return False
 
     @abstractmethod
-    def process(self) -> None:
+    def process(self, snapshot: Optional[PortfolioSnapshot] = None) -> None:
         pass
+
+    async def process_async(self, snapshot: Optional[PortfolioSnapshot] = None) -> None:
+        """
+        Coroutine version of process used by the asyncio order processor. The
+        blocking process runs on a worker thread, so other orders keep going.
+        """
+        await asyncio.to_thread(self.process, snapshot)
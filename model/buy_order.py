@@ -4,7 +4,7 @@ from helper.logger import log_message
 
 
 class BuyOrder(AbstractOrder, OrderActionMixin):
-    def process(self) -> None:
+    def process(self, snapshot=None) -> None:
         if not self.adapter:
             raise ValueError("No trading adapter assigned to this order.")
 
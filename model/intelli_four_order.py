@@ -1,20 +1,48 @@
+from dataclasses import dataclass, field
 from model.abstract_order import AbstractOrder
+from model.ohlcv_buffer import OHLCVBuffer
 from model.order_action_mixin import OrderActionMixin
 from helper.logger import log_message
+from service.historic_data_cache_service import historic_data_cache
+from service.kline_store_service import kline_store
+from service.market_stream_service import EVENT_KLINE
 
 
+@dataclass(eq=False)
 class IntelliFourOrder(AbstractOrder, OrderActionMixin):
-    def process(self) -> None:
+    stream_events = (EVENT_KLINE,)
+
+    candles: OHLCVBuffer = field(
+        default_factory=lambda: OHLCVBuffer(500), repr=False, compare=False
+    )
+
+    def process(self, snapshot=None) -> None:
         if not self.adapter:
             raise ValueError("No trading adapter assigned to this order.")
 
-        data = self.adapter.get_historic_data(self.asset, "4h")
-        if data.empty:
+        if len(self.candles) == 0:
+            # Start from the stored candles, so only newer ones are downloaded.
+            self.candles.extend_frame(
+                kline_store.to_frame(
+                    self.platform, self.asset, "4h", self.candles.capacity
+                )
+            )
+        changed = self.adapter.update_candles(self.candles, self.asset, "4h")
+        if changed:
+            columns = {
+                column: values[-changed:]
+                for column, values in self.candles.arrays().items()
+            }
+            kline_store.append_arrays(self.platform, self.asset, "4h", columns)
+            # A chart of this asset is then served without downloading again.
+            historic_data_cache.merge_arrays(self.platform, self.asset, "4h", columns)
+        if len(self.candles) == 0:
             self.state = self.State.FAILED
             log_message(f"No historic data for {self.asset} (4h). Order failed.")
             return
 
-        signal = self.algorithm.get_last_signal(data)
+        # Only the candles that changed since the last cycle are applied.
+        signal = self.algorithm.update_from_frame(self.candles)
         if signal is None:
             log_message(f"No signal generated for {self.asset}.")
             return
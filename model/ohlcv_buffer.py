@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from helper.kline_decoder import PRICE_COLUMNS, decode_klines
+from helper.time_utils import milliseconds_to_datetime64
+
+
+class OHLCVBuffer:
+    """
+    Fixed-capacity ring buffer of candles backed by preallocated NumPy arrays.
+
+    Timestamps are int64 milliseconds since the epoch, prices and volume float64.
+    Appending a candle, or replacing the newest one when it has the same
+    timestamp, happens in place. Every value is written twice, at i and
+    i + capacity, so the buffer contents are always one contiguous slice and
+    the column views handed out need no copying.
+    """
+
+    __slots__ = ("capacity", "_timestamps", "_prices", "_head", "_size")
+
+    def __init__(self, capacity: int = 500):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._prices = np.zeros((len(PRICE_COLUMNS), 2 * capacity), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """
+        Zero-copy, read-only view of a column ("timestamp", "open", ..., "volume").
+        """
+        window = slice(self._head, self._head + self._size)
+        if column == "timestamp":
+            view = self._timestamps[window]
+        else:
+            view = self._prices[PRICE_COLUMNS.index(column), window]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def last_timestamp(self):
+        if self._size == 0:
+            return None
+        return int(self._timestamps[self._head + self._size - 1])
+
+    def append(self, timestamp: int, open_, high, low, close, volume=0.0) -> bool:
+        """
+        Add a candle, or replace the newest one if `timestamp` matches it.
+        Candles older than the newest one are ignored.
+
+        Returns:
+            bool: True if the candle was added or replaced.
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            return False
+        if last is None or timestamp > last:
+            if self._size == self.capacity:
+                self._head = (self._head + 1) % self.capacity
+            else:
+                self._size += 1
+
+        slot = (self._head + self._size - 1) % self.capacity
+        for index in (slot, slot + self.capacity):
+            self._timestamps[index] = timestamp
+            self._prices[:, index] = (open_, high, low, close, volume)
+        return True
+
+    def extend_klines(self, klines) -> int:
+        """
+        Append raw exchange klines ([open_time, open, high, low, close, volume, ...]).
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        timestamps, prices = decode_klines(klines)
+        rows = zip(timestamps.tolist(), *prices.tolist())
+        return sum(self.append(*row) for row in rows)
+
+    def extend_frame(self, data: pd.DataFrame) -> int:
+        """
+        Append the rows of an OHLC(V) DataFrame with a datetime "timestamp" column.
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        timestamps = (
+            data["timestamp"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+        )
+        volume = (
+            data["volume"].to_numpy(dtype=np.float64)
+            if "volume" in data
+            else np.zeros(len(data))
+        )
+        rows = zip(
+            timestamps.tolist(),
+            data["open"].to_numpy(dtype=np.float64).tolist(),
+            data["high"].to_numpy(dtype=np.float64).tolist(),
+            data["low"].to_numpy(dtype=np.float64).tolist(),
+            data["close"].to_numpy(dtype=np.float64).tolist(),
+            volume.tolist(),
+        )
+        return sum(self.append(*row) for row in rows)
+
+    def arrays(self) -> dict:
+        """
+        Zero-copy views of all columns.
+        """
+        return {column: self[column] for column in ("timestamp",) + PRICE_COLUMNS}
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Copy the buffer into a DataFrame shaped like BaseTradingApi.get_historic_data.
+        """
+        data = {column: self[column].copy() for column in PRICE_COLUMNS}
+        data["timestamp"] = milliseconds_to_datetime64(self["timestamp"])
+        return pd.DataFrame(data, columns=["timestamp", *PRICE_COLUMNS])
+
+    def copy(self) -> "OHLCVBuffer":
+        """
+        Independent buffer with the same capacity and candles.
+        """
+        other = OHLCVBuffer(self.capacity)
+        other._timestamps[:] = self._timestamps
+        other._prices[:] = self._prices
+        other._head = self._head
+        other._size = self._size
+        return other
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
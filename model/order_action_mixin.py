@@ -3,6 +3,8 @@ from helper.logger import log_message
 
 class OrderActionMixin:
     def _buy(self):
+        # Counted before sending, a failed request may still have been executed.
+        self.trades += 1
         response = self.adapter.buy_order(self.asset, self.amount)
         if response.get("status") == "FILLED":
             self.state = self.State.COMPLETED
@@ -15,6 +17,7 @@ class OrderActionMixin:
             )
 
     def _sell(self):
+        self.trades += 1
         response = self.adapter.sell_order(self.asset, self.amount)
         if response.get("status") == "FILLED":
             self.state = self.State.COMPLETED
@@ -0,0 +1,29 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+
+@dataclass
+class PortfolioSnapshot:
+    """
+    Free balances of an account and their worth in USDT at one point in time.
+    """
+
+    quantities: Dict[str, float]
+    values: Dict[str, float]
+    taken_at: float = field(default_factory=time.time)
+
+    def balance_and_value(self, asset: str) -> Tuple[float, float]:
+        """
+        Same result as BaseTradingApi.fetch_asset_balance_and_value, from the snapshot.
+
+        Returns:
+            tuple: (quantity as float, total worth in USDT as float), (0.0, 0.0) if
+                   the asset is not held.
+        """
+        asset = asset.upper()
+        return self.quantities.get(asset, 0.0), self.values.get(asset, 0.0)
+
+    @property
+    def total_value(self) -> float:
+        return sum(self.values.values())
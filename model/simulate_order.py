@@ -2,6 +2,6 @@ from model.abstract_order import AbstractOrder
 
 
 class SimulateOrder(AbstractOrder):
-    def process(self) -> None:
+    def process(self, snapshot=None) -> None:
         # This order type does nothing (simulation only)
         pass
@@ -1,10 +1,14 @@
 from model.abstract_order import AbstractOrder
 from model.order_action_mixin import OrderActionMixin
 from helper.logger import log_message
+from service.market_stream_service import EVENT_PRICE
 
 
 class StopLossOrder(AbstractOrder, OrderActionMixin):
-    def process(self) -> None:
+    uses_portfolio_snapshot = True
+    stream_events = (EVENT_PRICE,)
+
+    def process(self, snapshot=None) -> None:
         if not self.adapter:
             raise ValueError("No trading adapter assigned to this order.")
 
@@ -12,7 +16,10 @@ class StopLossOrder(AbstractOrder, OrderActionMixin):
             return
 
         # Use 'amount' as the stop-loss threshold for total value
-        _, total_value = self.adapter.fetch_asset_balance_and_value(self.asset)
+        if snapshot is not None:
+            _, total_value = snapshot.balance_and_value(self.asset)
+        else:
+            _, total_value = self.adapter.fetch_asset_balance_and_value(self.asset)
         stop_value = self.amount  # Use amount as the stop-loss threshold
 
         if stop_value is None:
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+
+FILL_NEXT_OPEN = "next_open"
+FILL_CLOSE = "close"
+
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+
+@dataclass
+class BacktestResult:
+    equity_curve: np.ndarray
+    trades: pd.DataFrame
+    initial_balance: float
+    final_balance: float
+    max_drawdown: float
+    sharpe_ratio: float
+    win_rate: float
+
+    @property
+    def total_return(self) -> float:
+        return self.final_balance / self.initial_balance - 1
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "final_balance": self.final_balance,
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "sharpe_ratio": self.sharpe_ratio,
+            "win_rate": self.win_rate,
+            "trades": len(self.trades),
+        }
+
+
+class BacktestService:
+    """
+    Long-only backtest of an algorithm's buy/sell signals.
+
+    The whole balance is invested on a buy signal and sold on the next sell
+    signal. Orders fill at the next candle's open (default) or at the signal
+    candle's close, pay `fee_rate` on both sides and lose `slippage` (as a
+    fraction of the price) against them. Everything is computed with NumPy array
+    operations, so the cost is dominated by computing the signals themselves.
+    """
+
+    @staticmethod
+    def run(
+        data: pd.DataFrame,
+        algorithm: Optional[ToTheMoonAlgorithm] = None,
+        initial_balance: float = 100.0,
+        fill: str = FILL_NEXT_OPEN,
+        fee_rate: float = 0.001,
+        slippage: float = 0.0,
+        periods_per_year: Optional[float] = None,
+    ) -> BacktestResult:
+        """
+        Backtest `algorithm` on OHLC data.
+
+        Args:
+            data (pd.DataFrame): OHLC data, optionally with a "timestamp" column.
+            algorithm (ToTheMoonAlgorithm, optional): Defaults to ToTheMoonAlgorithm().
+            initial_balance (float): Starting balance in USD.
+            fill (str): "next_open" or "close".
+            fee_rate (float): Fee per side as a fraction, 0.001 = 0.1%.
+            slippage (float): Price slippage per fill as a fraction.
+            periods_per_year (float, optional): Candles per year for the Sharpe
+                ratio. Inferred from "timestamp" when omitted.
+
+        Returns:
+            BacktestResult: Equity curve, trades and summary metrics.
+        """
+        algorithm = algorithm or ToTheMoonAlgorithm()
+        arrays = algorithm.compute_signal_arrays(data)
+        timestamps = data["timestamp"].to_numpy() if "timestamp" in data else None
+        if periods_per_year is None:
+            periods_per_year = BacktestService.infer_periods_per_year(timestamps)
+
+        return BacktestService.run_arrays(
+            data["open"].to_numpy(dtype=np.float64),
+            data["close"].to_numpy(dtype=np.float64),
+            arrays["buy"],
+            arrays["sell"],
+            initial_balance=initial_balance,
+            fill=fill,
+            fee_rate=fee_rate,
+            slippage=slippage,
+            periods_per_year=periods_per_year,
+            timestamps=timestamps,
+        )
+
+    @staticmethod
+    def run_arrays(
+        open_,
+        close,
+        buy,
+        sell,
+        initial_balance: float = 100.0,
+        fill: str = FILL_NEXT_OPEN,
+        fee_rate: float = 0.001,
+        slippage: float = 0.0,
+        periods_per_year: float = 365.0,
+        timestamps=None,
+    ) -> BacktestResult:
+        """
+        Backtest precomputed buy/sell signal masks. See run for the arguments.
+        """
+        n = len(close)
+        if fill == FILL_NEXT_OPEN:
+            # A signal on the last candle has no next open to fill at.
+            fill_price = open_
+            buy_exec = np.flatnonzero(buy[:-1]) + 1
+            sell_exec = np.flatnonzero(sell[:-1]) + 1
+        elif fill == FILL_CLOSE:
+            fill_price = close
+            buy_exec = np.flatnonzero(buy)
+            sell_exec = np.flatnonzero(sell)
+        else:
+            raise ValueError(f"Unknown fill mode: {fill}")
+
+        # Position held at the close of each candle: set by buys, cleared by sells.
+        events = np.full(n, np.nan)
+        events[buy_exec] = 1.0
+        events[sell_exec] = 0.0
+        event_index = np.where(np.isnan(events), -1, np.arange(n))
+        np.maximum.accumulate(event_index, out=event_index)
+        position = np.where(event_index >= 0, events[np.maximum(event_index, 0)], 0.0)
+
+        changes = np.diff(position, prepend=0.0)
+        entries = np.flatnonzero(changes == 1)
+        exits = np.flatnonzero(changes == -1)
+        is_open = len(entries) > len(exits)
+
+        entry_price = fill_price[entries] * (1 + slippage)
+        exit_price = fill_price[exits] * (1 - slippage)
+        if is_open:
+            # Mark the open trade to the last close for the trade list.
+            exit_price = np.append(exit_price, close[-1])
+            exits = np.append(exits, n - 1)
+        keep = 1 - fee_rate
+        trade_factor = exit_price / entry_price * keep * keep
+        if is_open:
+            # The final sell of an open trade is not executed, so no exit fee.
+            trade_factor[-1] /= keep
+
+        # Cash available before each trade and after each closed trade.
+        cash_after = initial_balance * np.cumprod(trade_factor)
+        cash_before = np.concatenate(([initial_balance], cash_after[:-1]))
+
+        # Equity: units * close while invested, cash after the last exit otherwise.
+        trade_number = np.cumsum(changes == 1) - 1
+        closed_trades = np.cumsum(changes == -1)
+        invested = position == 1
+        equity = np.where(
+            closed_trades > 0,
+            np.concatenate(([initial_balance], cash_after))[closed_trades],
+            initial_balance,
+        )
+        if invested.any():
+            k = trade_number[invested]
+            units = cash_before[k] * keep / entry_price[k]
+            equity[invested] = units * close[invested]
+
+        final_balance = float(equity[-1]) if n else initial_balance
+        running_max = np.maximum.accumulate(equity) if n else equity
+        max_drawdown = float(np.max(1 - equity / running_max)) if n else 0.0
+
+        returns = equity[1:] / equity[:-1] - 1 if n > 1 else np.empty(0)
+        std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+        sharpe_ratio = (
+            float(returns.mean() / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+        )
+
+        closed_factor = trade_factor[:-1] if is_open else trade_factor
+        win_rate = float(np.mean(closed_factor > 1)) if len(closed_factor) else 0.0
+
+        trades = pd.DataFrame(
+            {
+                "entry_index": entries,
+                "exit_index": exits,
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "return": trade_factor - 1,
+                "open": np.arange(len(entries)) == len(entries) - 1 if is_open else False,
+            }
+        )
+        if timestamps is not None:
+            trades.insert(1, "entry_time", timestamps[entries])
+            trades.insert(3, "exit_time", timestamps[exits])
+
+        return BacktestResult(
+            equity_curve=equity,
+            trades=trades,
+            initial_balance=initial_balance,
+            final_balance=final_balance,
+            max_drawdown=max_drawdown,
+            sharpe_ratio=sharpe_ratio,
+            win_rate=win_rate,
+        )
+
+    @staticmethod
+    def infer_periods_per_year(timestamps) -> float:
+        """
+        Candles per year from the median candle spacing, 365 (daily) if unknown.
+        """
+        if timestamps is None or len(timestamps) < 2:
+            return 365.0
+        try:
+            # Any datetime64 resolution (ms from the kline decoder, ns from pandas).
+            times = np.asarray(pd.to_datetime(timestamps), dtype="datetime64[ns]")
+            spacing = np.median(np.diff(times) / np.timedelta64(1, "s"))
+        except (TypeError, ValueError):
+            return 365.0
+        return SECONDS_PER_YEAR / spacing if spacing > 0 else 365.0
@@ -4,7 +4,9 @@ import pandas as pd
 class ChartDataService:
     @staticmethod
     def prepare_chart_data(data):
-        data["timestamp"] = pd.to_datetime(data["timestamp"], format="%Y-%m-%d")
+        data["timestamp"] = pd.to_datetime(
+            data["timestamp"], format="%Y-%m-%d"
+        ).astype("datetime64[ns]")
         formatted_dates = data["timestamp"].dt.strftime("%d.%m").tolist()
         positions = list(range(len(formatted_dates)))
         grouped = data.groupby(data["timestamp"].dt.to_period("M"))
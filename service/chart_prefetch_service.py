@@ -0,0 +1,185 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from service.historic_data_cache_service import historic_data_cache
+
+
+class ChartPrefetchService:
+    """
+    Keeps the chart history of every order's asset warm in the historic data
+    cache, so selecting an order renders from memory.
+
+    Assets are queued when orders are set or added and downloaded by a few
+    worker threads; the adapters' request schedulers keep the downloads within
+    the exchange rate limits. Once started, every asset is queued again each
+    `refresh_interval` seconds (by default the cache TTL of the interval), which
+    costs a revalidation of the newest candles. Listeners are called with the
+    progress() of the queue after every download, from the worker threads.
+    """
+
+    def __init__(
+        self,
+        cache=historic_data_cache,
+        interval: str = "4h",
+        limit: int = 500,
+        max_workers: int = 4,
+        refresh_interval: float = None,
+    ):
+        """
+        Args:
+            cache (HistoricDataCacheService): Cache to warm.
+            interval (str): Candle interval of the charts.
+            limit (int): Candles per chart.
+            max_workers (int): Downloads running at once.
+            refresh_interval (float, optional): Seconds between refreshes.
+        """
+        self.cache = cache
+        self.interval = interval
+        self.limit = limit
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None else cache.ttl(interval)
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="chart-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._targets: Dict[Hashable, object] = {}
+        self._queued = set()
+        self._done = 0
+        self._total = 0
+        self._failed = 0
+        self._current: Optional[str] = None
+        self._listeners: List[Callable[[dict], None]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(order) -> Hashable:
+        return order.platform.lower(), order.asset.upper()
+
+    def set_orders(self, orders: Iterable):
+        """
+        Prefetch the assets of exactly these orders; assets of removed orders
+        are dropped from the queue.
+        """
+        targets = {
+            self._key(order): order for order in orders if order.adapter is not None
+        }
+        with self._lock:
+            added = [key for key in targets if key not in self._targets]
+            self._targets = targets
+        self._enqueue(added)
+
+    def add_orders(self, orders: Iterable):
+        """
+        Prefetch the assets of these orders in addition to the current ones.
+        """
+        added = []
+        with self._lock:
+            for order in orders:
+                key = self._key(order)
+                if order.adapter is not None and key not in self._targets:
+                    self._targets[key] = order
+                    added.append(key)
+        self._enqueue(added)
+
+    def refresh(self):
+        """
+        Queue every asset again.
+        """
+        with self._lock:
+            keys = list(self._targets)
+        self._enqueue(keys)
+
+    def add_listener(self, callback: Callable[[dict], None]):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[dict], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def progress(self) -> dict:
+        """
+        Downloads done, failed and pending since the queue was last empty, and
+        the asset being downloaded most recently.
+        """
+        with self._lock:
+            return {
+                "done": self._done,
+                "total": self._total,
+                "failed": self._failed,
+                "pending": self._total - self._done,
+                "current": self._current,
+            }
+
+    def start(self):
+        """
+        Refresh all assets every `refresh_interval` seconds in the background.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop refreshing and drop the queued downloads, for good.
+        """
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            self.refresh()
+
+    def _enqueue(self, keys: List[Hashable]):
+        with self._lock:
+            if self._done == self._total:
+                # The previous batch is finished, progress starts over.
+                self._done = self._total = self._failed = 0
+            keys = [key for key in keys if key not in self._queued]
+            self._queued.update(keys)
+            self._total += len(keys)
+        for key in keys:
+            try:
+                self._executor.submit(self._fetch, key)
+            except RuntimeError:
+                # Stopped in the meantime.
+                return
+        if keys:
+            self._notify()
+
+    def _fetch(self, key: Hashable):
+        with self._lock:
+            order = self._targets.get(key)
+            if order is not None:
+                self._current = order.asset
+        failed = False
+        # Orders removed while their asset was queued are skipped.
+        if order is not None and not self._stop_event.is_set():
+            try:
+                self.cache.get(
+                    order.adapter,
+                    order.platform,
+                    order.asset,
+                    self.interval,
+                    self.limit,
+                )
+            except Exception as e:
+                failed = True
+                print(f"Prefetching {order.asset} {self.interval} candles failed: {e}")
+        with self._lock:
+            self._queued.discard(key)
+            self._done += 1
+            self._failed += failed
+        self._notify()
+
+    def _notify(self):
+        progress = self.progress()
+        for listener in list(self._listeners):
+            try:
+                listener(progress)
+            except Exception as e:
+                print(f"Prefetch listener failed: {e}")
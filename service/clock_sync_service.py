@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from helper.periodic_refresh import PeriodicRefresh
+
+
+class ClockSyncService(PeriodicRefresh):
+    """
+    Keeps the offset between the local clock and the exchange clock.
+
+    The offset is measured from a few server time requests, keeping the one with
+    the shortest round trip and assuming the server stamped it halfway through.
+    It is refreshed in a background thread, and signed requests are stamped with
+    local time plus the offset instead of asking the server for its time first.
+    """
+
+    refresh_error = "Server clock sync failed"
+
+    def __init__(
+        self,
+        fetch_server_time: Callable[[], int],
+        refresh_interval: float = 300,
+        samples: int = 3,
+    ):
+        """
+        Args:
+            fetch_server_time (Callable): Returns the server time in milliseconds.
+            refresh_interval (float): Seconds between background measurements.
+            samples (int): Server time requests per measurement.
+        """
+        super().__init__(refresh_interval)
+        self._fetch_server_time = fetch_server_time
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._offset_ms: Optional[float] = None
+        self._rtt_ms: Optional[float] = None
+        self._drift_ms_per_hour = 0.0
+        self._synced_at: Optional[float] = None
+        self._synced_event = threading.Event()
+
+    def sync(self):
+        """
+        Measure the clock offset and round trip time now.
+        """
+        best = None
+        for _ in range(self.samples):
+            sent = time.time() * 1000
+            server_time = self._fetch_server_time()
+            received = time.time() * 1000
+            rtt = received - sent
+            if best is None or rtt < best[1]:
+                best = (server_time - (sent + received) / 2, rtt)
+
+        offset, rtt = best
+        synced_at = time.time()
+        with self._lock:
+            # Drift needs some distance between measurements to mean anything.
+            if self._offset_ms is not None and synced_at - self._synced_at >= 60:
+                hours = (synced_at - self._synced_at) / 3600
+                self._drift_ms_per_hour = (offset - self._offset_ms) / hours
+            self._offset_ms = offset
+            self._rtt_ms = rtt
+            self._synced_at = synced_at
+        self._synced_event.set()
+
+    def now(self) -> int:
+        """
+        Exchange time in milliseconds, from the local clock plus the offset.
+        """
+        if not self._synced_event.is_set():
+            # Wait for a background measurement that is already in flight.
+            if self.running:
+                self._synced_event.wait(15)
+            if not self._synced_event.is_set():
+                self.sync()
+        with self._lock:
+            return int(time.time() * 1000 + self._offset_ms)
+
+    def metrics(self) -> Dict[str, Optional[float]]:
+        """
+        Current offset and round trip in milliseconds, drift in milliseconds per
+        hour between the last two measurements, and when it was last measured.
+        """
+        with self._lock:
+            return {
+                "offset_ms": self._offset_ms,
+                "rtt_ms": self._rtt_ms,
+                "drift_ms_per_hour": self._drift_ms_per_hour,
+                "synced_at": self._synced_at,
+            }
+
+    def _refresh(self):
+        self.sync()
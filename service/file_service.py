@@ -1,6 +1,5 @@
 from helper import utils
-import requests
-import tempfile
+from helper.http_session import get_session_pool, stream_body
 
 
 class FileService:
@@ -10,15 +9,6 @@ class FileService:
 
     @staticmethod
     def read_remote_csv(url):
-        response = requests.get(url)
-        response.raise_for_status()
-        csv_data = response.text
-
-        with tempfile.NamedTemporaryFile(
-            mode="w+", delete=False, suffix=".csv"
-        ) as tmp_file:
-            tmp_file.write(csv_data)
-            tmp_file.flush()
-            temp_file_path = tmp_file.name
-
-        return utils.read_csv(temp_file_path)
+        with get_session_pool().get(url, stream=True) as response:
+            response.raise_for_status()
+            return utils.read_csv(stream_body(response))
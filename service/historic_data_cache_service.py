@@ -0,0 +1,316 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from helper.time_utils import (
+    interval_to_milliseconds,
+    milliseconds_to_datetime64,
+    to_milliseconds,
+)
+from service.kline_store_service import kline_store
+
+
+@dataclass
+class _Entry:
+    frame: pd.DataFrame
+    limit: Optional[int]
+    expires_at: float
+    nbytes: int
+
+
+class HistoricDataCacheService:
+    """
+    Process-wide in-memory cache of historic candles keyed by
+    (platform, symbol, interval), in front of the on-disk kline store.
+
+    A cached series is served as it is until its TTL runs out. The TTL is a
+    share of the candle interval (a 1m chart goes stale sooner than a 1d one),
+    kept between `min_ttl` and `max_ttl` seconds. After that, the next request
+    revalidates it by downloading only the candles from the cached tail
+    onwards; when that fails, the stale series is served. A miss loads the
+    series through the kline store. The total size of the cached frames is
+    kept under `max_bytes` by evicting the least recently used series.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_fraction: float = 1 / 60,
+        min_ttl: float = 5,
+        max_ttl: float = 300,
+        store=kline_store,
+    ):
+        """
+        Args:
+            max_bytes (int): Memory cap of the cached frames.
+            ttl_fraction (float): TTL as a share of the candle interval.
+            min_ttl (float): Shortest TTL in seconds.
+            max_ttl (float): Longest TTL in seconds.
+            store (KlineStoreService): Store that misses are loaded through.
+        """
+        self.max_bytes = max_bytes
+        self.ttl_fraction = ttl_fraction
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.store = store
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._latency = {"hit": 0.0, "miss": 0.0, "revalidation": 0.0}
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale = 0
+        self.evictions = 0
+        for outcome in self._latency:
+            self._latency[outcome] = 0.0
+
+    @staticmethod
+    def _key(platform: str, symbol: str, interval: str) -> Hashable:
+        return platform.lower(), symbol.upper(), interval
+
+    def ttl(self, interval: str) -> float:
+        """
+        Seconds a series of `interval` candles is served without revalidation.
+        """
+        seconds = interval_to_milliseconds(interval) / 1000 * self.ttl_fraction
+        return min(max(seconds, self.min_ttl), self.max_ttl)
+
+    def get(
+        self, adapter, platform: str, symbol: str, interval: str, limit: int = None
+    ) -> pd.DataFrame:
+        """
+        The series, or its last `limit` candles, shaped like
+        BaseTradingApi.get_historic_data.
+
+        Concurrent requests for the same series share one download.
+        """
+        started = time.perf_counter()
+        key = self._key(platform, symbol, interval)
+        with self._lock:
+            entry = self._fresh_entry(key, limit)
+            if entry is not None:
+                self.hits += 1
+                self._latency["hit"] += time.perf_counter() - started
+                return self._window(entry.frame, limit)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Loaded by another caller while this one waited.
+                entry = self._fresh_entry(key, limit)
+                if entry is not None:
+                    self.hits += 1
+                    self._latency["hit"] += time.perf_counter() - started
+                    return self._window(entry.frame, limit)
+                entry = self._entries.get(key)
+                if entry is not None and not self._covers(entry, limit):
+                    entry = None
+
+            if entry is None:
+                frame = self.store.load(adapter, platform, symbol, interval, limit)
+                outcome = "miss"
+            else:
+                frame = self._revalidate(adapter, key, entry)
+                outcome = "revalidation"
+            self._put(key, frame, limit)
+
+            with self._lock:
+                if outcome == "miss":
+                    self.misses += 1
+                else:
+                    self.revalidations += 1
+                self._latency[outcome] += time.perf_counter() - started
+        return self._window(frame, limit)
+
+    def peek(
+        self, platform: str, symbol: str, interval: str, limit: int = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        The cached series, or its last `limit` candles, even when its TTL has
+        run out; None if it is not cached. Never downloads.
+        """
+        started = time.perf_counter()
+        key = self._key(platform, symbol, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._covers(entry, limit):
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._latency["hit"] += time.perf_counter() - started
+        return self._window(entry.frame, limit)
+
+    def merge_arrays(
+        self, platform: str, symbol: str, interval: str, columns: Dict[str, np.ndarray]
+    ) -> bool:
+        """
+        Merge candles polled elsewhere (e.g. by an order) into a cached series
+        and renew its TTL. Series that are not cached are left alone.
+
+        Args:
+            columns (dict): Column arrays ordered by timestamp, int64 millisecond
+                            timestamps as in OHLCVBuffer.arrays().
+
+        Returns:
+            bool: True if a cached series was updated.
+        """
+        if len(columns["timestamp"]) == 0:
+            return False
+        key = self._key(platform, symbol, interval)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        fresh = pd.DataFrame(
+            {
+                column: (
+                    milliseconds_to_datetime64(values)
+                    if column == "timestamp"
+                    else np.asarray(values)
+                )
+                for column, values in columns.items()
+            }
+        )
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._put(key, self._merge(entry.frame, fresh, entry.limit), entry.limit)
+        return True
+
+    def invalidate(self, platform: str = None, symbol: str = None, interval: str = None):
+        """
+        Drop one series, or all of them when no key is given.
+        """
+        with self._lock:
+            if platform is None:
+                keys = list(self._entries)
+            else:
+                keys = [self._key(platform, symbol, interval)]
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry.nbytes
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._reset_counters()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss/revalidation counters, their mean latency and current memory use.
+        """
+        with self._lock:
+            counts = {
+                "hit": self.hits,
+                "miss": self.misses,
+                "revalidation": self.revalidations,
+            }
+            lookups = sum(counts.values())
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+            for outcome, count in counts.items():
+                stats[f"{outcome}_ms"] = (
+                    round(self._latency[outcome] / count * 1000, 3) if count else 0.0
+                )
+            return stats
+
+    def _fresh_entry(self, key: Hashable, limit: Optional[int]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        if not self._covers(entry, limit):
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _covers(entry: _Entry, limit: Optional[int]) -> bool:
+        # An entry loaded with a smaller limit cannot serve a longer window.
+        if entry.limit is None:
+            return True
+        return limit is not None and limit <= entry.limit
+
+    def _revalidate(self, adapter, key: Hashable, entry: _Entry) -> pd.DataFrame:
+        platform, symbol, interval = key
+        cached = entry.frame
+        if cached.empty:
+            return self.store.load(adapter, platform, symbol, interval, entry.limit)
+        # The cached last candle may still have been open, so it is fetched again.
+        last = to_milliseconds(cached["timestamp"].iloc[-1].to_pydatetime())
+        try:
+            fresh = adapter.get_historic_range(symbol, interval, last)
+        except Exception as e:
+            fresh = None
+            print(f"Serving cached {symbol} {interval} candles, update failed: {e}")
+        if fresh is None or fresh.empty:
+            with self._lock:
+                self.stale += 1
+            return cached
+        self.store.append(platform, symbol, interval, fresh)
+        return self._merge(cached, fresh, entry.limit)
+
+    @staticmethod
+    def _merge(cached: pd.DataFrame, fresh: pd.DataFrame, limit: Optional[int]):
+        first = fresh["timestamp"].iloc[0]
+        older = cached[cached["timestamp"] < first]
+        merged = pd.concat([older, fresh[list(cached.columns)]], ignore_index=True)
+        if limit:
+            merged = merged.iloc[-limit:].reset_index(drop=True)
+        return merged
+
+    def _put(self, key: Hashable, frame: pd.DataFrame, limit: Optional[int]):
+        nbytes = int(frame.memory_usage(index=True).sum())
+        entry = _Entry(
+            frame=frame,
+            limit=limit,
+            expires_at=time.monotonic() + self.ttl(key[2]),
+            nbytes=nbytes,
+        )
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    @staticmethod
+    def _window(frame: pd.DataFrame, limit: Optional[int]) -> pd.DataFrame:
+        if limit and len(frame) > limit:
+            frame = frame.iloc[-limit:]
+        return frame.reset_index(drop=True)
+
+
+# Shared by everything that shows or evaluates historic candles (chart, orders).
+historic_data_cache = HistoricDataCacheService()
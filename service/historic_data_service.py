@@ -1,8 +1,22 @@
 from helper import utils
+from service.historic_data_cache_service import historic_data_cache
 
 
 class HistoricDataService:
     @staticmethod
-    def get_historic_data(order_id, interval="4h"):
+    def get_historic_data(order_id, interval="4h", limit=500):
         order = utils.get_order(order_id)
-        return order.adapter.get_historic_data(order.asset, interval)
+        # Served from memory while fresh, then only candles newer than the cached
+        # ones are downloaded.
+        return historic_data_cache.get(
+            order.adapter, order.platform, order.asset, interval, limit
+        )
+
+    @staticmethod
+    def get_cached_data(order_id, interval="4h", limit=500):
+        """
+        The cached candles of the order's asset, e.g. prefetched by
+        ChartPrefetchService, or None without downloading anything.
+        """
+        order = utils.get_order(order_id)
+        return historic_data_cache.peek(order.platform, order.asset, interval, limit)
@@ -0,0 +1,297 @@
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from helper.time_utils import milliseconds_to_datetime64
+from model.ohlcv_buffer import PRICE_COLUMNS
+
+COLUMNS = ("timestamp",) + PRICE_COLUMNS
+
+
+class KlineStoreService:
+    """
+    On-disk candle store keyed by (platform, symbol, interval).
+
+    Every series is a directory of raw column files (int64 millisecond
+    timestamps, float64 prices and volume) holding its closed candles, plus a
+    meta.json holding their count, the generation of the column files and the
+    newest, possibly still open, candle. Reads memory-map the files, so loading
+    a series costs nothing until its values are used.
+
+    Stored rows are never written while they may be mapped. Closed candles are
+    appended past the end of the files, which readers only map up to the row
+    count, and updates of the open candle only replace meta.json. Correcting a
+    closed candle writes the series to the files of a new generation instead;
+    the old files are deleted once nothing maps them anymore.
+    """
+
+    def __init__(self, root: str = "config/klines"):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, platform: str, symbol: str, interval: str) -> str:
+        # "1M" (month) and "1m" (minute) would collide on case-insensitive filesystems.
+        interval_name = interval.replace("M", "mo")
+        return os.path.join(self.root, platform.lower(), symbol.upper(), interval_name)
+
+    @staticmethod
+    def _read_meta(path: str) -> Tuple[int, int, Optional[list]]:
+        """
+        (closed row count, generation, open candle) of a series, (0, 0, None)
+        if nothing is stored.
+        """
+        try:
+            with open(os.path.join(path, "meta.json"), "r") as f:
+                meta = json.load(f)
+            return meta["rows"], meta.get("generation", 0), meta.get("open")
+        except (OSError, ValueError, KeyError):
+            return 0, 0, None
+
+    @staticmethod
+    def _write_meta(path: str, rows: int, generation: int, open_candle: list):
+        # Replaced in one step, so readers never see a partially written file.
+        temp_path = os.path.join(path, "meta.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(
+                {"rows": rows, "generation": generation, "open": open_candle}, f
+            )
+        os.replace(temp_path, os.path.join(path, "meta.json"))
+
+    @staticmethod
+    def _column_path(path: str, column: str, generation: int) -> str:
+        if generation == 0:
+            return os.path.join(path, column + ".bin")
+        return os.path.join(path, f"{column}.{generation}.bin")
+
+    @staticmethod
+    def _dtype(column: str):
+        return np.int64 if column == "timestamp" else np.float64
+
+    def _map_column(
+        self, path: str, column: str, generation: int, rows: int
+    ) -> np.ndarray:
+        if rows == 0:
+            return np.empty(0, dtype=self._dtype(column))
+        return np.memmap(
+            self._column_path(path, column, generation),
+            dtype=self._dtype(column),
+            mode="r",
+            shape=(rows,),
+        )
+
+    def _read(self, path: str) -> Tuple[Dict[str, np.ndarray], Optional[list]]:
+        # Mapped under the lock, so the files cannot be replaced in between.
+        with self._lock:
+            rows, generation, open_candle = self._read_meta(path)
+            columns = {
+                column: self._map_column(path, column, generation, rows)
+                for column in COLUMNS
+            }
+        return columns, open_candle
+
+    def read(self, platform: str, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """
+        Read-only memory-mapped columns of the closed candles of a series, empty
+        arrays if nothing is stored. The open candle is not included, see
+        to_frame().
+        """
+        return self._read(self._path(platform, symbol, interval))[0]
+
+    def last_timestamp(self, platform: str, symbol: str, interval: str) -> Optional[int]:
+        columns, open_candle = self._read(self._path(platform, symbol, interval))
+        if open_candle is not None:
+            return open_candle[0]
+        timestamps = columns["timestamp"]
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def to_frame(
+        self, platform: str, symbol: str, interval: str, limit: int = None
+    ) -> pd.DataFrame:
+        """
+        The stored series, or its last `limit` candles, as a DataFrame shaped like
+        BaseTradingApi.get_historic_data. Only the requested rows are read from disk.
+        """
+        columns, open_candle = self._read(self._path(platform, symbol, interval))
+        start = 0
+        if limit:
+            rows = len(columns["timestamp"])
+            start = max(rows - limit + (open_candle is not None), 0)
+        data = {}
+        for index, column in enumerate(COLUMNS):
+            values = np.array(columns[column][start:])
+            if open_candle is not None:
+                values = np.append(values, np.array(open_candle[index], values.dtype))
+            data[column] = values
+        data["timestamp"] = milliseconds_to_datetime64(data["timestamp"])
+        return pd.DataFrame(data, columns=list(COLUMNS))
+
+    def append_arrays(
+        self, platform: str, symbol: str, interval: str, columns: Dict[str, np.ndarray]
+    ) -> int:
+        """
+        Store candles given as column arrays ordered by timestamp.
+
+        Candles newer than the last stored one are appended, candles with a
+        stored timestamp replace it. Older candles missing from the store
+        cannot be inserted and are skipped.
+
+        The newest candle may still be open, so it is kept in meta.json, where
+        replacing it costs no more than rewriting that small file. It is
+        written to the column files once a newer candle arrives. Only
+        corrections of closed candles need a new generation.
+
+        Returns:
+            int: Number of candles appended or overwritten.
+        """
+        timestamps = np.asarray(columns["timestamp"], dtype=np.int64)
+        if len(timestamps) == 0:
+            return 0
+        values = {
+            column: np.asarray(columns[column], dtype=self._dtype(column))
+            for column in COLUMNS
+        }
+        path = self._path(platform, symbol, interval)
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            rows, generation, open_candle = self._read_meta(path)
+            stored = {
+                column: self._map_column(path, column, generation, rows)
+                for column in COLUMNS
+            }
+            if open_candle is not None:
+                last = open_candle[0]
+            else:
+                last = int(stored["timestamp"][-1]) if rows else None
+            if last is None:
+                new = np.ones(len(timestamps), dtype=bool)
+            else:
+                new = timestamps > last
+            known = np.flatnonzero(~new)
+            positions = np.searchsorted(stored["timestamp"], timestamps[known])
+            matches = positions < rows
+            matches[matches] = (
+                stored["timestamp"][positions[matches]] == timestamps[known[matches]]
+            )
+            if open_candle is not None:
+                reopened = known[timestamps[known] == open_candle[0]]
+                if len(reopened):
+                    open_candle = self._candle(values, reopened[-1])
+            else:
+                reopened = ()
+            overwrite_rows = positions[matches]
+            overwrite_from = known[matches]
+            # Candles received again unchanged need no rewrite.
+            corrected = any(
+                not np.array_equal(
+                    stored[column][overwrite_rows], values[column][overwrite_from]
+                )
+                for column in PRICE_COLUMNS
+            )
+
+            # All candles but the newest one are closed.
+            appended = {column: values[column][new][:-1] for column in COLUMNS}
+            if new.any():
+                if open_candle is not None:
+                    for index, column in enumerate(COLUMNS):
+                        appended[column] = np.concatenate(
+                            [
+                                np.array([open_candle[index]], self._dtype(column)),
+                                appended[column],
+                            ]
+                        )
+                open_candle = self._candle(values, np.flatnonzero(new)[-1])
+            added = len(appended["timestamp"])
+
+            if corrected:
+                generation += 1
+                for column in COLUMNS:
+                    series = np.array(stored[column])
+                    series[overwrite_rows] = values[column][overwrite_from]
+                    with open(self._column_path(path, column, generation), "wb") as f:
+                        f.write(series.tobytes())
+                        f.write(appended[column].tobytes())
+            elif added:
+                for column in COLUMNS:
+                    file_path = self._column_path(path, column, generation)
+                    mode = "r+b" if os.path.exists(file_path) else "w+b"
+                    with open(file_path, mode) as f:
+                        # Bytes past the row count (left by an interrupted
+                        # append) are overwritten, mapped rows are not touched.
+                        f.seek(rows * np.dtype(self._dtype(column)).itemsize)
+                        f.write(appended[column].tobytes())
+            del stored
+
+            # The row count is written last, so readers never see half a candle.
+            self._write_meta(path, rows + added, generation, open_candle)
+            if corrected:
+                self._remove_old_generations(path, generation)
+        return int(new.sum()) + len(overwrite_rows) + len(reopened)
+
+    @staticmethod
+    def _candle(values: Dict[str, np.ndarray], index: int) -> list:
+        return [int(values["timestamp"][index])] + [
+            float(values[column][index]) for column in PRICE_COLUMNS
+        ]
+
+    def _remove_old_generations(self, path: str, generation: int):
+        current = {
+            os.path.basename(self._column_path(path, column, generation))
+            for column in COLUMNS
+        }
+        for name in os.listdir(path):
+            if name.endswith(".bin") and name not in current:
+                try:
+                    os.remove(os.path.join(path, name))
+                except OSError:
+                    # Still mapped by a reader (Windows); removed after a later write.
+                    pass
+
+    def append(self, platform: str, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        Store the rows of an OHLCV DataFrame with a datetime "timestamp" column.
+        """
+        if data.empty:
+            return 0
+        columns = {
+            "timestamp": data["timestamp"]
+            .to_numpy(dtype="datetime64[ms]")
+            .astype(np.int64)
+        }
+        for column in PRICE_COLUMNS:
+            columns[column] = (
+                data[column].to_numpy(dtype=np.float64)
+                if column in data
+                else np.zeros(len(data))
+            )
+        return self.append_arrays(platform, symbol, interval, columns)
+
+    def load(
+        self, adapter, platform: str, symbol: str, interval: str, limit: int = None
+    ) -> pd.DataFrame:
+        """
+        Bring the stored series up to date from the adapter and return it, or its
+        last `limit` candles.
+
+        An empty store is filled with get_historic_data; afterwards only the
+        candles from the last stored one onwards are requested. When the
+        adapter is unreachable, the stored candles are returned as they are.
+        """
+        last = self.last_timestamp(platform, symbol, interval)
+        try:
+            if last is None:
+                fresh = adapter.get_historic_data(symbol, interval)
+            else:
+                fresh = adapter.get_historic_range(symbol, interval, last)
+            self.append(platform, symbol, interval, fresh)
+        except Exception as e:
+            if last is None:
+                raise
+            print(f"Using stored {symbol} {interval} candles, update failed: {e}")
+        return self.to_frame(platform, symbol, interval, limit)
+
+
+kline_store = KlineStoreService()
@@ -0,0 +1,249 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from helper.websocket_client import WebSocketClient
+from model.ohlcv_buffer import OHLCVBuffer
+
+EVENT_KLINE = "kline"
+EVENT_PRICE = "price"
+
+
+class MarketStreamService:
+    """
+    Live candles and prices of a set of assets from one combined WebSocket.
+
+    Each asset is subscribed to its kline stream for `interval` and its
+    miniTicker stream. Candles go into one OHLCVBuffer per asset, prices into
+    the price table of the REST adapter, and listeners are called with
+    (asset, event) after every update. A dropped connection is reopened with
+    backoff, and the candles missed in between are backfilled over REST before
+    streaming resumes.
+    """
+
+    STREAM_URL = "wss://stream.binance.com:9443"
+
+    def __init__(
+        self,
+        rest,
+        interval: str = "4h",
+        capacity: int = 500,
+        stream_url: str = None,
+        timeout: float = 60,
+        max_backoff: float = 30,
+    ):
+        """
+        Args:
+            rest (BinanceAPI): Adapter used for backfilling and whose price table
+                is updated from the stream.
+            interval (str): Candlestick interval of the kline streams.
+            capacity (int): Candles kept per asset.
+            stream_url (str, optional): Overrides STREAM_URL, e.g. for a local stand-in.
+            timeout (float): Seconds without a message before reconnecting.
+            max_backoff (float): Longest wait between reconnect attempts.
+        """
+        self.rest = rest
+        self.interval = interval
+        self.capacity = capacity
+        self.stream_url = stream_url or self.STREAM_URL
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self._assets: List[str] = []
+        self._candles: Dict[str, OHLCVBuffer] = {}
+        self._listeners: List[Callable[[str, str], None]] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[WebSocketClient] = None
+        self.connects = 0
+        self.messages = 0
+        self.last_message_at: Optional[float] = None
+
+    @property
+    def assets(self) -> List[str]:
+        return list(self._assets)
+
+    def set_assets(self, assets: Iterable[str]):
+        """
+        Stream these assets; reconnects if the set changed while running.
+        """
+        assets = sorted({asset.upper() for asset in assets})
+        with self._lock:
+            if assets == self._assets:
+                return
+            self._assets = assets
+            for asset in assets:
+                self._candles.setdefault(asset, OHLCVBuffer(self.capacity))
+        client = self._client
+        if client is not None:
+            client.close()  # The stream loop reconnects with the new streams
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """
+        Call `callback(asset, event)` after each update, event being "kline" or
+        "price". Called on the stream thread, so it should return quickly.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, str], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def has_candles(self, asset: str, interval: str) -> bool:
+        """
+        True if the stream is connected and holds candles of the asset and interval.
+        """
+        if interval != self.interval or self._client is None:
+            return False
+        with self._lock:
+            buffer = self._candles.get(asset.upper())
+            return buffer is not None and len(buffer) > 0
+
+    def update_candles(self, candles: OHLCVBuffer, asset: str) -> int:
+        """
+        Copy the streamed candles newer than (or equal to) the newest one in
+        `candles` into it.
+
+        Returns:
+            int: Number of candles added or replaced.
+        """
+        with self._lock:
+            source = self._candles.get(asset.upper())
+            if source is None or len(source) == 0:
+                return 0
+            columns = source.arrays()
+            last = candles.last_timestamp
+            start = 0 if last is None else int(
+                columns["timestamp"].searchsorted(last)
+            )
+            rows = list(
+                zip(
+                    columns["timestamp"][start:].tolist(),
+                    columns["open"][start:].tolist(),
+                    columns["high"][start:].tolist(),
+                    columns["low"][start:].tolist(),
+                    columns["close"][start:].tolist(),
+                    columns["volume"][start:].tolist(),
+                )
+            )
+        return sum(candles.append(*row) for row in rows)
+
+    def url(self) -> str:
+        streams = []
+        for asset in self._assets:
+            symbol = asset.lower() + "usdt"
+            streams.append(f"{symbol}@kline_{self.interval}")
+            streams.append(f"{symbol}@miniTicker")
+        return f"{self.stream_url}/stream?streams={'/'.join(streams)}"
+
+    def backfill(self):
+        """
+        Fetch the candles missing since the newest buffered one over REST.
+
+        The candles are fetched into a copy of the buffer without holding the
+        lock, so readers are not blocked by the requests, and the copy replaces
+        the buffer afterwards. The buffers are only written on the stream
+        thread, which runs the backfill, so nothing is lost by the swap.
+        """
+        for asset in self.assets:
+            with self._lock:
+                buffer = self._candles.get(asset)
+                if buffer is None:
+                    continue
+                backfilled = buffer.copy()
+            try:
+                self.rest.poll_candles(backfilled, asset, self.interval)
+            except Exception as e:
+                print(f"Backfill of {asset} {self.interval} failed: {e}")
+                continue
+            with self._lock:
+                if self._candles.get(asset) is buffer:
+                    self._candles[asset] = backfilled
+
+    def handle_message(self, message: str):
+        """
+        Apply one combined stream message.
+        """
+        data = json.loads(message).get("data", {})
+        self.messages += 1
+        self.last_message_at = time.time()
+        symbol = data.get("s", "")
+        if not symbol.endswith("USDT"):
+            return
+        asset = symbol[: -len("USDT")]
+        event_type = data.get("e")
+        if event_type == "kline":
+            kline = data["k"]
+            with self._lock:
+                buffer = self._candles.get(asset)
+                if buffer is None:
+                    return
+                buffer.append(
+                    int(kline["t"]),
+                    float(kline["o"]),
+                    float(kline["h"]),
+                    float(kline["l"]),
+                    float(kline["c"]),
+                    float(kline["v"]),
+                )
+            self._notify(asset, EVENT_KLINE)
+        elif event_type == "24hrMiniTicker":
+            self.rest.prices.update({symbol: float(data["c"])})
+            self._notify(asset, EVENT_PRICE)
+
+    def _notify(self, asset: str, event: str):
+        for callback in self._listeners:
+            try:
+                callback(asset, event)
+            except Exception as e:
+                print(f"Market stream listener failed: {e}")
+
+    def start(self):
+        """
+        Stream in a background thread until stopped.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._stream_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        client = self._client
+        if client is not None:
+            client.close()
+
+    def _stream_loop(self):
+        backoff = 1
+        while not self._stop_event.is_set():
+            if not self._assets:
+                self._stop_event.wait(1)
+                continue
+            client = WebSocketClient(self.url(), timeout=self.timeout)
+            try:
+                client.connect()
+                # Backfill after connecting, so no candle falls between the two;
+                # messages received meanwhile wait in the socket.
+                self.backfill()
+                self._client = client
+                self.connects += 1
+                if client.url != self.url():
+                    client.close()  # Assets changed while connecting
+                backoff = 1
+                while not self._stop_event.is_set():
+                    message = client.recv()
+                    if message is None:
+                        break
+                    self.handle_message(message)
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                print(f"Market stream disconnected: {e}")
+            finally:
+                self._client = None
+                client.close()
+            if self._stop_event.wait(backoff):
+                break
+            backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,175 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from algorithms.indicator_cache import indicator_cache
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+
+OHLC_COLUMNS = ["open", "high", "low", "close"]
+
+# Per-worker DataFrame built once from the shared OHLC block.
+_worker_data: Optional[pd.DataFrame] = None
+_worker_fingerprints: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class SweepResult:
+    table: pd.DataFrame
+    combinations: int
+    elapsed: float
+    cache_stats: Dict[str, int]
+
+    @property
+    def combos_per_second(self) -> float:
+        return self.combinations / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def share_ohlc(data: pd.DataFrame) -> shared_memory.SharedMemory:
+    """
+    Copy the OHLC columns of `data` into a new shared memory block laid out as a
+    (4, rows) float64 array in OHLC_COLUMNS order.
+
+    The caller owns the block and must close() and unlink() it.
+    """
+    rows = len(data)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 4 * rows * 8))
+    block = np.ndarray((4, rows), dtype=np.float64, buffer=shm.buf)
+    for k, column in enumerate(OHLC_COLUMNS):
+        block[k] = data[column].to_numpy(dtype=np.float64)
+    return shm
+
+
+def attach_ohlc(name: str, rows: int) -> pd.DataFrame:
+    """
+    Build an OHLC DataFrame from a block created by share_ohlc.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray((4, rows), dtype=np.float64, buffer=shm.buf)
+        return pd.DataFrame(
+            {column: block[k].copy() for k, column in enumerate(OHLC_COLUMNS)}
+        )
+    finally:
+        shm.close()
+
+
+def _init_worker(name: str, rows: int):
+    global _worker_data, _worker_fingerprints
+    _worker_data = attach_ohlc(name, rows)
+    # The data never changes, so it is hashed once instead of per combination.
+    _worker_fingerprints = ToTheMoonAlgorithm().fingerprints(_worker_data)
+
+
+def _evaluate(params: Dict):
+    result = ParameterSweepService.evaluate(_worker_data, params, _worker_fingerprints)
+    return result, os.getpid(), indicator_cache.stats()
+
+
+class ParameterSweepService:
+    """
+    Grid search of ToTheMoonAlgorithm parameters on a process pool.
+
+    The OHLC data is copied once into shared memory; every worker builds its
+    DataFrame from it when it starts, so tasks only carry the parameter dict.
+    Indicators shared between combinations (e.g. the SMA of one bb_period for
+    every bb_deviation) come from each worker's indicator cache; the summed
+    hit/miss counters are returned with the results.
+    """
+
+    @staticmethod
+    def build_grid(grid: Dict[str, Iterable]) -> List[Dict]:
+        """
+        Expand {"bb_period": [20, 21], ...} into a list of parameter dicts.
+        """
+        keys = list(grid.keys())
+        return [
+            dict(zip(keys, values))
+            for values in itertools.product(*(list(grid[key]) for key in keys))
+        ]
+
+    @staticmethod
+    def evaluate(data: pd.DataFrame, params: Dict, fingerprints: Dict = None) -> Dict:
+        """
+        Run simulate_potential_profit for a single parameter combination.
+
+        Args:
+            fingerprints (dict, optional): ToTheMoonAlgorithm.fingerprints(data).
+        """
+        algorithm = ToTheMoonAlgorithm(**params)
+        segments, labels = algorithm.create_trend_segments(data, fingerprints)
+        final_balance = algorithm.simulate_potential_profit(segments, labels)
+        return {**params, "final_balance": final_balance, "signals": len(labels)}
+
+    @staticmethod
+    def run(
+        data: pd.DataFrame,
+        grid: Dict[str, Iterable],
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int, float], None]] = None,
+    ) -> SweepResult:
+        """
+        Evaluate every combination of the parameter grid.
+
+        Args:
+            data (pd.DataFrame): OHLC(V) data to evaluate on.
+            grid (Dict[str, Iterable]): Values per ToTheMoonAlgorithm parameter, e.g.
+                {"atr_period": [5, 7], "bb_period": [20, 21], "bb_deviation": [1.0],
+                 "use_atr_filter": [True, False]}.
+            max_workers (int, optional): Worker processes, defaults to the CPU count.
+            progress_callback (callable, optional): Called as (done, total,
+                combos_per_second) while results come in.
+
+        Returns:
+            SweepResult: Results ranked by final balance, best first.
+        """
+        combinations = ParameterSweepService.build_grid(grid)
+        total = len(combinations)
+        max_workers = max_workers or os.cpu_count() or 1
+        # Few large chunks keep the IPC overhead low, enough chunks keep workers busy.
+        chunksize = max(1, total // (max_workers * 4))
+
+        results = []
+        worker_cache_stats = {}
+        start = time.perf_counter()
+        shm = share_ohlc(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(shm.name, len(data)),
+            ) as executor:
+                for result, pid, cache_stats in executor.map(
+                    _evaluate, combinations, chunksize=chunksize
+                ):
+                    results.append(result)
+                    worker_cache_stats[pid] = cache_stats
+                    if progress_callback and (
+                        len(results) % chunksize == 0 or len(results) == total
+                    ):
+                        elapsed = time.perf_counter() - start
+                        progress_callback(len(results), total, len(results) / elapsed)
+        finally:
+            shm.close()
+            shm.unlink()
+        elapsed = time.perf_counter() - start
+
+        table = pd.DataFrame(results)
+        if not table.empty:
+            table = table.sort_values(
+                "final_balance", ascending=False, kind="stable"
+            ).reset_index(drop=True)
+            table.insert(0, "rank", range(1, len(table) + 1))
+        cache_stats = {
+            counter: sum(stats[counter] for stats in worker_cache_stats.values())
+            for counter in ("hits", "misses", "evictions")
+        }
+        return SweepResult(
+            table=table, combinations=total, elapsed=elapsed, cache_stats=cache_stats
+        )
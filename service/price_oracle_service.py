@@ -0,0 +1,146 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from helper.periodic_refresh import PeriodicRefresh
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """
+    Prices of all symbols as of one point in time.
+    """
+
+    prices: Dict[str, float]
+    updated_at: float
+    # When a stream last pushed each symbol's price after `updated_at`.
+    streamed_at: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+    def age_of(self, symbol: str) -> float:
+        """
+        Seconds since the price of the symbol was last updated.
+        """
+        updated_at = self.streamed_at.get(symbol.upper(), self.updated_at)
+        return time.time() - updated_at
+
+    def get(self, symbol: str) -> Optional[float]:
+        return self.prices.get(symbol.upper())
+
+
+class PriceOracleService(PeriodicRefresh):
+    """
+    In-memory table of the latest price of every symbol.
+
+    The table is filled from one request for all symbols (the bulk ticker) and
+    refreshed in a background thread every `refresh_interval` seconds; a stream
+    can push newer prices in between via `update`, and the background refresh
+    pauses while it does. Readers get prices that are at most `max_age` seconds
+    old; a stale table is refreshed before answering.
+    """
+
+    refresh_error = "Price refresh failed"
+
+    def __init__(
+        self,
+        fetch_prices: Callable[[], Dict[str, float]],
+        refresh_interval: float = 5,
+        max_age: float = 10,
+    ):
+        """
+        Args:
+            fetch_prices (Callable): Returns the price of every symbol, keyed by symbol.
+            refresh_interval (float): Seconds between background refreshes.
+            max_age (float): Default staleness limit in seconds for reads.
+        """
+        super().__init__(refresh_interval)
+        self._fetch_prices = fetch_prices
+        self.max_age = max_age
+        self._table: Optional[PriceTable] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._streamed_at = 0.0
+
+    def refresh(self):
+        """
+        Download the prices of all symbols and replace the table. Stream prices
+        pushed while the download was running are kept, as they are newer.
+        """
+        started = time.time()
+        prices = self._fetch_prices()
+        with self._lock:
+            table = self._table
+            streamed_at = {}
+            if table:
+                for symbol, updated_at in table.streamed_at.items():
+                    if updated_at > started:
+                        prices[symbol] = table.prices[symbol]
+                        streamed_at[symbol] = updated_at
+            self._table = PriceTable(
+                prices=prices, updated_at=time.time(), streamed_at=streamed_at
+            )
+
+    def update(self, prices: Dict[str, float]):
+        """
+        Merge prices pushed by a stream into the table. Only the pushed symbols
+        count as updated, as a stream may cover only some symbols.
+        """
+        now = time.time()
+        with self._lock:
+            table = self._table
+            merged = dict(table.prices) if table else {}
+            merged.update(prices)
+            streamed_at = dict(table.streamed_at) if table else {}
+            streamed_at.update(dict.fromkeys(prices, now))
+            self._table = PriceTable(
+                prices=merged,
+                updated_at=table.updated_at if table else 0.0,
+                streamed_at=streamed_at,
+            )
+            self._streamed_at = now
+
+    @property
+    def streaming(self) -> bool:
+        """
+        True while a stream has pushed prices within the last `max_age` seconds.
+        """
+        return time.time() - self._streamed_at <= self.max_age
+
+    def table(self, max_age: float = None) -> PriceTable:
+        """
+        The current price table, refreshed first if it is older than `max_age`
+        seconds. All prices read from one table are consistent with each other.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        table = self._table
+        if table is None or table.age > max_age:
+            # Only one reader refreshes, the others use its result.
+            with self._refresh_lock:
+                table = self._table
+                if table is None or table.age > max_age:
+                    self.refresh()
+                    table = self._table
+        return table
+
+    def get_price(self, symbol: str, max_age: float = None) -> Optional[float]:
+        """
+        Latest price of the symbol, or None if the exchange does not list it.
+        A price pushed by a stream within `max_age` seconds is returned as is.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        table = self._table
+        if table is not None and table.age_of(symbol) <= max_age:
+            return table.get(symbol)
+        return self.table(max_age).get(symbol)
+
+    def _refresh(self):
+        # Streamed symbols are current already; readers of the others refresh
+        # the table on demand once it is older than their `max_age`.
+        if self.streaming:
+            return
+        with self._refresh_lock:
+            self.refresh()
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from helper.periodic_refresh import PeriodicRefresh
+
+
+class SymbolMetadataService(PeriodicRefresh):
+    """
+    In-memory index of exchange symbols and their trading filters.
+
+    The full exchangeInfo is loaded once and indexed by symbol, then refreshed
+    in a background thread every `ttl` seconds. Symbol existence and filter
+    lookups (LOT_SIZE, NOTIONAL, ...) are answered from memory.
+    """
+
+    refresh_error = "Symbol metadata refresh failed"
+
+    def __init__(self, fetch_exchange_info: Callable[[], dict], ttl: float = 3600):
+        """
+        Args:
+            fetch_exchange_info (Callable): Returns the exchangeInfo payload for all
+                symbols ({"symbols": [{"symbol", "status", "filters"}, ...]}).
+            ttl (float): Seconds between background refreshes.
+        """
+        super().__init__(refresh_interval=ttl)
+        self._fetch_exchange_info = fetch_exchange_info
+        self._symbols: Dict[str, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._loaded_event = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def loaded_at(self) -> Optional[float]:
+        return self._loaded_at
+
+    def refresh(self):
+        """
+        Download exchangeInfo and rebuild the symbol index.
+        """
+        data = self._fetch_exchange_info()
+        symbols = {}
+        for info in data.get("symbols", []):
+            symbols[info["symbol"]] = {
+                "status": info.get("status"),
+                "base_asset": info.get("baseAsset"),
+                "quote_asset": info.get("quoteAsset"),
+                "filters": {f["filterType"]: f for f in info.get("filters", [])},
+            }
+        with self._lock:
+            self._symbols = symbols
+            self._loaded_at = time.time()
+        self._loaded_event.set()
+
+    def _ensure_loaded(self, timeout: float = 15):
+        if self._loaded_event.is_set():
+            return
+        # Wait for a background load that is already in flight before sending another.
+        if self.running:
+            self._loaded_event.wait(timeout)
+        if not self._loaded_event.is_set():
+            self.refresh()
+
+    def has_symbol(self, symbol: str) -> bool:
+        """
+        True if the symbol exists and is currently trading.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            info = self._symbols.get(symbol.upper())
+        return info is not None and info["status"] in (None, "TRADING")
+
+    def get_filters(self, symbol: str) -> Optional[Dict[str, dict]]:
+        """
+        Filters of the symbol keyed by filter type, or None if it does not exist.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            info = self._symbols.get(symbol.upper())
+        return info["filters"] if info else None
+
+    def _refresh(self):
+        self.refresh()
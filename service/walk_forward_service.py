@@ -0,0 +1,239 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+from service.backtest_service import BacktestService, FILL_NEXT_OPEN
+from service.parameter_sweep_service import (
+    ParameterSweepService,
+    attach_ohlc,
+    share_ohlc,
+)
+
+# Per-worker state set up by _init_worker.
+_worker_data: Optional[pd.DataFrame] = None
+_worker_options: Optional[Dict] = None
+_worker_fingerprints: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame
+    equity_curve: pd.Series
+    elapsed: float
+
+
+def _init_worker(name: str, rows: int, options: Dict):
+    global _worker_data, _worker_options, _worker_fingerprints
+    _worker_data = attach_ohlc(name, rows)
+    _worker_options = options
+    # Hashed once for all windows of the worker instead of once per window.
+    _worker_fingerprints = ToTheMoonAlgorithm().fingerprints(_worker_data)
+
+
+def _run_window(window: Tuple[int, int, int]) -> Dict:
+    return WalkForwardService.run_window(
+        _worker_data, window, fingerprints=_worker_fingerprints, **_worker_options
+    )
+
+
+class WalkForwardService:
+    """
+    Walk-forward optimization of ToTheMoonAlgorithm.
+
+    The history is split into rolling train/test windows. For every window the
+    parameter grid is backtested on the train part, and the best parameters are
+    then backtested on the following test part, which the optimization never
+    saw. Windows run in parallel on a process pool.
+
+    The rolling statistics (SMA and stdev per bb_period, ATR per atr_period)
+    are computed on the whole history through the indicator cache, so a
+    worker reuses them across windows and parameter sets within the cache's
+    memory budget; the bands are derived per window on its slice. The follow
+    line itself is evaluated per window because it depends on where the
+    window starts.
+    """
+
+    @staticmethod
+    def split(
+        rows: int, train_size: int, test_size: int, step: Optional[int] = None
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Rolling (train_start, test_start, test_end) windows over `rows` candles.
+
+        Args:
+            rows (int): Length of the history.
+            train_size (int): Candles per train window.
+            test_size (int): Candles per test window.
+            step (int, optional): Shift between windows, defaults to test_size so
+                the test windows are contiguous. Must not be smaller than
+                test_size, overlapping test windows would be counted twice in
+                the combined equity curve.
+        """
+        step = step or test_size
+        if step < test_size:
+            raise ValueError(
+                f"step ({step}) must be at least test_size ({test_size}), "
+                "the test windows would overlap."
+            )
+        windows = []
+        train_start = 0
+        while train_start + train_size + test_size <= rows:
+            test_start = train_start + train_size
+            windows.append((train_start, test_start, test_start + test_size))
+            train_start += step
+        return windows
+
+    @staticmethod
+    def run_window(
+        data: pd.DataFrame,
+        window: Tuple[int, int, int],
+        combinations: List[Dict],
+        objective: str = "final_balance",
+        fill: str = FILL_NEXT_OPEN,
+        fee_rate: float = 0.001,
+        slippage: float = 0.0,
+        periods_per_year: float = 365.0,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> Dict:
+        """
+        Optimize on the train part of `window` and evaluate on its test part.
+
+        Args:
+            fingerprints (dict, optional): ToTheMoonAlgorithm.fingerprints(data),
+                when several windows of the same data are run.
+        """
+        start = time.perf_counter()
+        train_start, test_start, test_end = window
+        open_ = data["open"].to_numpy(dtype=np.float64)
+        high = data["high"].to_numpy(dtype=np.float64)
+        low = data["low"].to_numpy(dtype=np.float64)
+        close = data["close"].to_numpy(dtype=np.float64)
+
+        if fingerprints is None:
+            fingerprints = ToTheMoonAlgorithm().fingerprints(data)
+
+        def backtest(algorithm, begin, split, end):
+            # The follow line runs from `begin`, trades are only taken from `split`.
+            span = slice(begin, end)
+            sma, stdev, atr = algorithm.compute_indicator_inputs(data, fingerprints)
+            upper, lower = algorithm.bands(sma[span], stdev[span])
+            arrays = algorithm.follow_line_arrays(
+                close[span], high[span], low[span], upper, lower, atr[span]
+            )
+            offset = split - begin
+            return BacktestService.run_arrays(
+                open_[split:end],
+                close[split:end],
+                arrays["buy"][offset:],
+                arrays["sell"][offset:],
+                fill=fill,
+                fee_rate=fee_rate,
+                slippage=slippage,
+                periods_per_year=periods_per_year,
+            )
+
+        best_params, best_score = None, -np.inf
+        for params in combinations:
+            result = backtest(
+                ToTheMoonAlgorithm(**params), train_start, train_start, test_start
+            )
+            score = result.summary()[objective]
+            if score > best_score:
+                best_params, best_score = params, score
+
+        test = backtest(
+            ToTheMoonAlgorithm(**best_params), train_start, test_start, test_end
+        )
+        return {
+            "train_start": train_start,
+            "test_start": test_start,
+            "test_end": test_end,
+            "params": best_params,
+            "train_score": best_score,
+            **{f"test_{key}": value for key, value in test.summary().items()},
+            "equity_curve": test.equity_curve,
+            "elapsed": time.perf_counter() - start,
+        }
+
+    @staticmethod
+    def run(
+        data: pd.DataFrame,
+        grid: Dict[str, Iterable],
+        train_size: int,
+        test_size: int,
+        step: Optional[int] = None,
+        objective: str = "final_balance",
+        fill: str = FILL_NEXT_OPEN,
+        fee_rate: float = 0.001,
+        slippage: float = 0.0,
+        max_workers: Optional[int] = None,
+    ) -> WalkForwardResult:
+        """
+        Run the walk-forward optimization.
+
+        Args:
+            data (pd.DataFrame): OHLC data, optionally with a "timestamp" column.
+            grid (Dict[str, Iterable]): Parameter grid, see ParameterSweepService.run.
+            train_size (int): Candles per train window.
+            test_size (int): Candles per test window.
+            step (int, optional): Shift between windows, defaults to test_size.
+            objective (str): Backtest summary key to maximize on the train part,
+                e.g. "final_balance" or "sharpe_ratio".
+            fill, fee_rate, slippage: Backtest settings, see BacktestService.run.
+            max_workers (int, optional): Worker processes, defaults to the CPU count.
+
+        Returns:
+            WalkForwardResult: One row per window (best parameters, train score,
+            test metrics, elapsed seconds) and the combined out-of-sample equity
+            curve, starting from 100.
+        """
+        windows = WalkForwardService.split(len(data), train_size, test_size, step)
+        if not windows:
+            raise ValueError("Not enough data for a single train/test window.")
+
+        timestamps = data["timestamp"].to_numpy() if "timestamp" in data else None
+        options = {
+            "combinations": ParameterSweepService.build_grid(grid),
+            "objective": objective,
+            "fill": fill,
+            "fee_rate": fee_rate,
+            "slippage": slippage,
+            "periods_per_year": BacktestService.infer_periods_per_year(timestamps),
+        }
+
+        start = time.perf_counter()
+        shm = share_ohlc(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count() or 1,
+                initializer=_init_worker,
+                initargs=(shm.name, len(data), options),
+            ) as executor:
+                results = list(executor.map(_run_window, windows))
+        finally:
+            shm.close()
+            shm.unlink()
+        elapsed = time.perf_counter() - start
+
+        # Chain the test equity curves: each window starts with the previous balance.
+        curves, balance = [], 100.0
+        for result in results:
+            curve = result.pop("equity_curve")
+            curves.append(curve / 100.0 * balance)
+            balance = curves[-1][-1] if len(curve) else balance
+        index = np.concatenate(
+            [np.arange(result["test_start"], result["test_end"]) for result in results]
+        )
+        if timestamps is not None:
+            index = timestamps[index]
+        equity_curve = pd.Series(np.concatenate(curves), index=index, name="equity")
+
+        return WalkForwardResult(
+            windows=pd.DataFrame(results), equity_curve=equity_curve, elapsed=elapsed
+        )
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from service.backtest_service import BacktestService
+
+FOUR_HOURS_MS = 4 * 60 * 60 * 1000
+
+
+@pytest.mark.parametrize(
+    "timestamps",
+    [
+        # As produced by helper.kline_decoder.klines_to_frame.
+        pd.Series((np.arange(10, dtype=np.int64) * FOUR_HOURS_MS).view("datetime64[ms]")),
+        pd.date_range("2024-01-01", periods=10, freq="4h"),
+    ],
+    ids=["ms", "ns"],
+)
+def test_infer_periods_per_year_any_resolution(timestamps):
+    assert BacktestService.infer_periods_per_year(timestamps) == pytest.approx(2190)
+
+
+def test_infer_periods_per_year_unknown():
+    assert BacktestService.infer_periods_per_year(None) == 365.0
+
+
+def brute_force_backtest(open_, close, buy, sell, fill, fee_rate, slippage):
+    """
+    Candle by candle reference of BacktestService.run_arrays: returns the
+    equity curve and the (entry, exit, entry price, exit price) of each trade.
+    """
+    n = len(close)
+    if fill == "next_open":
+        fill_price = open_
+        buy_exec = np.zeros(n, dtype=bool)
+        sell_exec = np.zeros(n, dtype=bool)
+        buy_exec[1:] = buy[:-1]
+        sell_exec[1:] = sell[:-1]
+    else:
+        fill_price, buy_exec, sell_exec = close, buy, sell
+
+    cash, units, entry = 100.0, 0.0, None
+    equity, trades = [], []
+    for i in range(n):
+        # A sell executed on the same candle as a buy wins.
+        if sell_exec[i] and entry is not None:
+            exit_price = fill_price[i] * (1 - slippage)
+            cash = units * exit_price * (1 - fee_rate)
+            trades.append((entry[0], i, entry[1], exit_price))
+            units, entry = 0.0, None
+        elif buy_exec[i] and not sell_exec[i] and entry is None:
+            entry_price = fill_price[i] * (1 + slippage)
+            units = cash * (1 - fee_rate) / entry_price
+            entry = (i, entry_price)
+        equity.append(units * close[i] if entry is not None else cash)
+    if entry is not None:
+        trades.append((entry[0], n - 1, entry[1], close[-1]))
+    return np.array(equity), trades
+
+
+@pytest.mark.parametrize("fill", ["next_open", "close"])
+def test_run_arrays_matches_a_candle_by_candle_loop(fill):
+    rng = np.random.default_rng(7)
+    n = 500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    buy = rng.random(n) < 0.05
+    sell = rng.random(n) < 0.05
+
+    result = BacktestService.run_arrays(
+        open_, close, buy, sell, fill=fill, fee_rate=0.001, slippage=0.0005
+    )
+    equity, trades = brute_force_backtest(
+        open_, close, buy, sell, fill, fee_rate=0.001, slippage=0.0005
+    )
+
+    assert len(trades) > 10
+    np.testing.assert_allclose(result.equity_curve, equity, rtol=1e-12)
+    assert result.final_balance == pytest.approx(equity[-1], rel=1e-12)
+    assert result.trades["entry_index"].tolist() == [t[0] for t in trades]
+    assert result.trades["exit_index"].tolist() == [t[1] for t in trades]
+    np.testing.assert_allclose(result.trades["entry_price"], [t[2] for t in trades])
+    np.testing.assert_allclose(result.trades["exit_price"], [t[3] for t in trades])
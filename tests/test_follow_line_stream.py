@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from algorithms.follow_line_stream import FollowLineStream
+from algorithms.indicator_cache import IndicatorCache
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+
+PARAMS = {"atr_period": 5, "bb_period": 21, "bb_deviation": 1.0}
+
+
+def random_walk(rows=300, seed=42):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(rng.normal(0, 0.01, rows).cumsum())
+    spread = close * rng.uniform(0.001, 0.01, rows)
+    return pd.DataFrame(
+        {
+            "timestamp": np.arange(rows) * 60_000,
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+        }
+    )
+
+
+def batch_last_label(algorithm, data):
+    _, labels = algorithm.create_trend_segments(data)
+    if not labels:
+        return None
+    return labels[-1]["text"], labels[-1]["position"]
+
+
+def assert_matches_batch(stream, algorithm, data):
+    expected = batch_last_label(algorithm, data)
+    if expected is None:
+        assert stream.current_signal() is None
+        assert stream.current_signal_index() is None
+    else:
+        assert (stream.current_signal(), stream.current_signal_index()) == expected
+    follow_line = algorithm.compute_signal_arrays(data)["follow_line"][-1]
+    if math.isnan(follow_line):
+        assert math.isnan(stream.follow_line)
+    else:
+        assert stream.follow_line == pytest.approx(follow_line, rel=1e-9)
+
+
+@pytest.mark.parametrize("use_atr_filter", [True, False])
+def test_stream_matches_batch_segments(use_atr_filter):
+    data = random_walk()
+    algorithm = ToTheMoonAlgorithm(
+        use_atr_filter=use_atr_filter, cache=IndicatorCache(), **PARAMS
+    )
+    stream = FollowLineStream(use_atr_filter=use_atr_filter, **PARAMS)
+
+    signals = 0
+    for i, candle in enumerate(data.to_dict("records")):
+        stream.update(candle)
+        assert_matches_batch(stream, algorithm, data.iloc[: i + 1])
+        signals += stream.current_signal() is not None
+    assert signals > 0
+
+
+def test_open_candle_revisions_are_not_committed():
+    data = random_walk(seed=7)
+    algorithm = ToTheMoonAlgorithm(cache=IndicatorCache(), **PARAMS)
+    stream = FollowLineStream(**PARAMS)
+
+    for i, candle in enumerate(data.to_dict("records")):
+        # The open candle first spikes, then settles on its final values.
+        spike = dict(candle, high=candle["high"] * 1.2, close=candle["close"] * 1.15)
+        stream.update(spike)
+        stream.update(candle)
+        assert stream.count == i + 1
+        assert_matches_batch(stream, algorithm, data.iloc[: i + 1])
+
+
+def test_find_last_signal_matches_last_segment():
+    data = random_walk(seed=3)
+    algorithm = ToTheMoonAlgorithm(cache=IndicatorCache(), **PARAMS)
+
+    outcomes = set()
+    for end in range(1, len(data) + 1, 7):
+        window = data.iloc[:end]
+        expected = batch_last_label(algorithm, window)
+        assert algorithm.find_last_signal(window) == expected
+        assert algorithm.get_last_signal(window) == (expected and expected[0])
+        outcomes.add(expected is None)
+    # Both the windows without a signal and those with one were covered.
+    assert outcomes == {True, False}
+
+
+def test_find_last_signal_without_signal():
+    data = random_walk(rows=60)
+    data[["high", "low", "close"]] = 100.0
+    algorithm = ToTheMoonAlgorithm(cache=IndicatorCache(), **PARAMS)
+
+    assert algorithm.create_trend_segments(data) == ([], [])
+    assert algorithm.find_last_signal(data) is None
+    assert algorithm.get_last_signal(data) is None
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from algorithms.indicator_cache import IndicatorCache
+from algorithms.to_the_moon_algorithm import ToTheMoonAlgorithm
+
+
+def make_ohlc(rows=200, seed=1):
+    close = 100 + np.random.default_rng(seed).normal(0, 1, rows).cumsum()
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close}
+    )
+
+
+def test_repeated_fingerprint_hits_the_cache():
+    cache = IndicatorCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(10.0)
+
+    data = make_ohlc()
+    key = ("sma", cache.fingerprint(data["close"]), 21)
+    first = cache.get_or_compute(key, compute)
+    # Equal values in another object have the same fingerprint.
+    key = ("sma", cache.fingerprint(data["close"].copy()), 21)
+    second = cache.get_or_compute(key, compute)
+
+    assert len(calls) == 1
+    assert second is first
+    assert not first.flags.writeable
+
+
+def test_entries_are_evicted_least_recently_used_within_the_budget():
+    cache = IndicatorCache(max_bytes=3 * 80)
+    for key in ("a", "b", "c"):
+        cache.get_or_compute(key, lambda: np.zeros(10))
+    cache.get_or_compute("a", lambda: np.ones(10))  # "b" is now the oldest
+    cache.get_or_compute("d", lambda: np.zeros(10))
+
+    assert cache.get_or_compute("a", lambda: np.ones(10))[0] == 0
+    assert cache.get_or_compute("b", lambda: np.ones(10))[0] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+    # Larger than the whole budget: returned, but not cached.
+    cache.get_or_compute("e", lambda: np.zeros(100))
+    assert cache.stats()["entries"] == 3
+
+
+def test_stats_count_hits_misses_and_evictions():
+    cache = IndicatorCache(max_bytes=80)
+    cache.get_or_compute("a", lambda: np.zeros(10))
+    cache.get_or_compute("a", lambda: np.zeros(10))
+    cache.get_or_compute("b", lambda: np.zeros(10))
+
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 1,
+        "hit_rate": 1 / 3,
+        "entries": 1,
+        "bytes": 80,
+        "max_bytes": 80,
+    }
+    cache.clear()
+    assert cache.stats()["misses"] == 0
+
+
+def test_algorithm_caches_each_indicator_once():
+    cache = IndicatorCache()
+    algorithm = ToTheMoonAlgorithm(cache=cache)
+    data = make_ohlc()
+
+    first = algorithm.compute_signal_arrays(data)
+    # SMA, stdev and ATR.
+    assert cache.stats()["entries"] == 3
+    second = algorithm.compute_signal_arrays(data.copy())
+    assert cache.stats()["hits"] == 3
+    np.testing.assert_array_equal(first["follow_line"], second["follow_line"])
+
+    atr = algorithm.compute_atr(data)
+    atr.iloc[0] = -1.0  # A copy, the cached ATR is untouched.
+    assert algorithm.compute_atr(data).iloc[0] != -1.0
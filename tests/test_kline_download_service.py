@@ -0,0 +1,95 @@
+import threading
+
+from service.kline_download_service import KlineDownloadService
+
+HOUR = 60 * 60 * 1000
+
+
+def kline(open_time, close=1.0):
+    return [open_time, "1", "2", "0.5", str(close), "10", open_time + HOUR - 1]
+
+
+class FakeExchange:
+    """
+    Hourly klines from 0 on, except during `outage`; the pages listed in
+    `short_once` come back empty on their first request.
+    """
+
+    def __init__(self, outage=None, short_once=()):
+        self.outage = outage
+        self.short_once = set(short_once)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def fetch_page(self, start_ms, end_ms, limit):
+        with self._lock:
+            self.requests.append((start_ms, end_ms))
+            if start_ms in self.short_once:
+                self.short_once.discard(start_ms)
+                return []
+        open_times = range(start_ms - start_ms % HOUR, end_ms + 1, HOUR)
+        return [
+            kline(t)
+            for t in open_times
+            if t >= start_ms
+            and not (self.outage and self.outage[0] <= t <= self.outage[1])
+        ][:limit]
+
+
+def test_stitch_drops_overlapping_and_duplicate_candles():
+    pages = [
+        [kline(0), kline(HOUR), kline(2 * HOUR, close=1.0)],
+        # Overlaps the previous page with a newer copy of its last candle.
+        [kline(2 * HOUR, close=2.0), kline(3 * HOUR)],
+        # Out of order, with the same open time twice.
+        [kline(5 * HOUR), kline(4 * HOUR), kline(5 * HOUR, close=3.0)],
+    ]
+
+    klines, duplicates = KlineDownloadService.stitch(pages)
+
+    assert [k[0] for k in klines] == [t * HOUR for t in range(6)]
+    assert duplicates == 2
+    # The last copy of a candle wins.
+    assert klines[2][4] == "2.0"
+    assert klines[5][4] == "3.0"
+
+
+def test_find_gaps():
+    klines = [kline(t * HOUR) for t in (0, 1, 2, 5, 6, 9)]
+
+    assert KlineDownloadService.find_gaps(klines, "1h") == [
+        (2 * HOUR, 5 * HOUR),
+        (6 * HOUR, 9 * HOUR),
+    ]
+    assert KlineDownloadService.find_gaps(klines[:3], "1h") == []
+
+
+def test_download_refetches_a_short_page():
+    exchange = FakeExchange(short_once=[10 * HOUR])
+    service = KlineDownloadService(
+        exchange.fetch_page, page_size=10, requests_per_second=1000
+    )
+
+    result = service.download("1h", 0, 39 * HOUR)
+
+    assert [k[0] for k in result.klines] == [t * HOUR for t in range(40)]
+    assert result.gaps == []
+    assert result.duplicates == 0
+    # 4 pages, then the hole of the short one again.
+    assert result.pages == 5
+    assert exchange.requests[-1] == (10 * HOUR, 19 * HOUR)
+
+
+def test_download_reports_gaps_that_remain():
+    exchange = FakeExchange(outage=(12 * HOUR, 14 * HOUR))
+    service = KlineDownloadService(
+        exchange.fetch_page, page_size=10, requests_per_second=1000
+    )
+
+    result = service.download("1h", 0, 29 * HOUR)
+
+    assert len(result.klines) == 27
+    assert result.gaps == [(11 * HOUR, 15 * HOUR)]
+    # Requested once more before being reported.
+    assert exchange.requests[-1] == (12 * HOUR, 14 * HOUR)
+    assert result.pages == 4
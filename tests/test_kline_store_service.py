@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+
+from service.kline_store_service import COLUMNS, KlineStoreService
+
+
+def make_columns(timestamps, close):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    close = np.asarray(close, dtype=np.float64)
+    columns = {column: close for column in COLUMNS[1:]}
+    columns["timestamp"] = timestamps
+    return columns
+
+
+def column_files(tmp_path):
+    return sorted(
+        name
+        for name in os.listdir(tmp_path / "binance" / "BTC" / "4h")
+        if name.endswith(".bin")
+    )
+
+
+def test_open_candle_updates_do_not_rewrite_the_series(tmp_path):
+    store = KlineStoreService(str(tmp_path))
+    store.append_arrays("Binance", "BTC", "4h", make_columns([1, 2, 3], [1, 2, 3]))
+    files = column_files(tmp_path)
+    assert files == sorted(f"{column}.bin" for column in COLUMNS)
+    mapped = store.read("Binance", "BTC", "4h")
+    assert mapped["close"].tolist() == [1, 2]
+
+    # Ticks of the open candle.
+    for close in (30, 31, 32):
+        assert store.append_arrays(
+            "Binance", "BTC", "4h", make_columns([3], [close])
+        ) == 1
+    assert column_files(tmp_path) == files
+    assert store.to_frame("Binance", "BTC", "4h")["close"].tolist() == [1, 2, 32]
+    assert store.last_timestamp("Binance", "BTC", "4h") == 3
+
+    # The stored candles received again unchanged, and a new open candle.
+    assert store.append_arrays(
+        "Binance", "BTC", "4h", make_columns([2, 3, 4], [2, 32, 4])
+    ) == 3
+    assert column_files(tmp_path) == files
+    assert mapped["close"].tolist() == [1, 2]
+    columns = store.read("Binance", "BTC", "4h")
+    assert columns["timestamp"].tolist() == [1, 2, 3]
+    assert columns["close"].tolist() == [1, 2, 32]
+    frame = store.to_frame("Binance", "BTC", "4h", limit=2)
+    assert frame["close"].tolist() == [32, 4]
+
+
+def test_correcting_a_closed_candle_writes_a_new_generation(tmp_path):
+    store = KlineStoreService(str(tmp_path))
+    store.append_arrays("Binance", "BTC", "4h", make_columns([1, 2, 3], [1, 2, 3]))
+    mapped = store.read("Binance", "BTC", "4h")
+
+    assert store.append_arrays(
+        "Binance", "BTC", "4h", make_columns([2, 3], [20, 3])
+    ) == 2
+
+    assert mapped["close"].tolist() == [1, 2]
+    assert store.to_frame("Binance", "BTC", "4h")["close"].tolist() == [1, 20, 3]
+    # The files of the previous generation are gone.
+    assert column_files(tmp_path) == sorted(f"{column}.1.bin" for column in COLUMNS)
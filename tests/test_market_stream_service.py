@@ -0,0 +1,61 @@
+import json
+import threading
+
+from model.ohlcv_buffer import OHLCVBuffer
+from service.market_stream_service import MarketStreamService
+
+MINUTE = 60_000
+
+
+class BlockingRest:
+    """
+    Backfills candles 3..5 once released, like a slow REST poll.
+    """
+
+    def __init__(self):
+        self.prices = {}
+        self.polling = threading.Event()
+        self.release = threading.Event()
+
+    def poll_candles(self, candles, asset, interval):
+        self.polling.set()
+        assert self.release.wait(5)
+        return sum(
+            candles.append(t * MINUTE, 1.0, 2.0, 0.5, float(t)) for t in range(3, 6)
+        )
+
+
+def kline_message(t, close):
+    kline = {"t": t * MINUTE, "o": "1", "h": "2", "l": "0.5", "c": str(close), "v": "0"}
+    return json.dumps({"data": {"e": "kline", "s": "BTCUSDT", "k": kline}})
+
+
+def test_backfill_is_merged_without_blocking_readers():
+    rest = BlockingRest()
+    service = MarketStreamService(rest, interval="1m", capacity=10)
+    service.set_assets(["BTC"])
+    for t in range(4):
+        service.handle_message(kline_message(t, t))
+
+    backfill = threading.Thread(target=service.backfill)
+    backfill.start()
+    assert rest.polling.wait(5)
+
+    # Readers are served the buffered candles while the poll is running.
+    target = OHLCVBuffer(10)
+    assert service.update_candles(target, "BTC") == 4
+    assert target["close"].tolist() == [0, 1, 2, 3]
+
+    rest.release.set()
+    backfill.join(5)
+    assert not backfill.is_alive()
+
+    # Candle 3 was still open and is replaced, 4 and 5 are new.
+    assert service.update_candles(target, "BTC") == 3
+    assert target["timestamp"].tolist() == [t * MINUTE for t in range(6)]
+    assert target["close"].tolist() == [0, 1, 2, 3, 4, 5]
+
+    # Streaming continues on the merged buffer.
+    service.handle_message(kline_message(6, 6))
+    assert service.update_candles(target, "BTC") == 2
+    assert target["close"].tolist()[-2:] == [5, 6]
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from controller.async_order_processor import AsyncOrderProcessor  # noqa: E402
+from controller.order_processor import OrderProcessor  # noqa: E402
+from model.abstract_order import AbstractOrder  # noqa: E402
+from model.order_action_mixin import OrderActionMixin  # noqa: E402
+from model.portfolio_snapshot import PortfolioSnapshot  # noqa: E402
+from model.take_profit_order import TakeProfitOrder  # noqa: E402
+
+
+class FakeAdapter:
+    """
+    Account holding one asset worth `price` per unit; selling empties it.
+    """
+
+    def __init__(self, asset="BTC", quantity=1.0, price=100.0):
+        self.asset = asset
+        self.quantity = quantity
+        self.price = price
+        self.sells = []
+        self.snapshots = 0
+        self._lock = threading.Lock()
+
+    def fetch_portfolio_snapshot(self):
+        with self._lock:
+            self.snapshots += 1
+            return PortfolioSnapshot(
+                {self.asset: self.quantity}, {self.asset: self.quantity * self.price}
+            )
+
+    def fetch_asset_balance_and_value(self, asset):
+        with self._lock:
+            return self.quantity, self.quantity * self.price
+
+    def sell_order(self, asset, amount):
+        time.sleep(0.05)  # Leaves room for a concurrent order to interleave
+        with self._lock:
+            self.sells.append(asset)
+            self.quantity = 0.0
+        return {"status": "FILLED"}
+
+
+class TradeAndContinueOrder(AbstractOrder, OrderActionMixin):
+    """
+    Sells and keeps running, like IntelliFourOrder after a signal.
+    """
+
+    def process(self, snapshot=None):
+        if self.last_action != "sell":
+            self._sell()
+        self.state = self.State.IN_PROGRESS
+
+
+class SnapshotRecordingOrder(AbstractOrder):
+    uses_portfolio_snapshot = True
+
+    def process(self, snapshot=None):
+        self.seen = snapshot.balance_and_value(self.asset)
+
+
+def take_profit(order_id, adapter, target=50.0):
+    return TakeProfitOrder(order_id, adapter.asset, target, "", "binance", adapter=adapter)
+
+
+def test_async_processor_does_not_sell_the_same_holdings_twice(tmp_path):
+    adapter = FakeAdapter()
+    orders = [take_profit(1, adapter), take_profit(2, adapter)]
+    processor = AsyncOrderProcessor(orders, orders_file=str(tmp_path / "orders.json"))
+    processor.running = True
+
+    asyncio.run(processor.run_cycle())
+
+    assert adapter.sells == ["BTC"]
+    states = sorted(order.state.value for order in orders)
+    assert states == ["completed", "in_progress"]
+
+
+def test_sync_processor_refreshes_snapshot_after_trade_in_progress(tmp_path):
+    adapter = FakeAdapter()
+    trader = TradeAndContinueOrder(1, "BTC", 1.0, "", "binance", adapter=adapter)
+    recorder = SnapshotRecordingOrder(2, "BTC", 1.0, "", "binance", adapter=adapter)
+    # The recorder comes first, so the cycle's snapshot exists before the trade.
+    first = SnapshotRecordingOrder(3, "BTC", 1.0, "", "binance", adapter=adapter)
+    processor = OrderProcessor(
+        [first, trader, recorder], orders_file=str(tmp_path / "orders.json")
+    )
+    processor.running = True
+
+    processor.run_cycle()
+
+    assert trader.state == AbstractOrder.State.IN_PROGRESS
+    assert first.seen == (1.0, 100.0)
+    assert recorder.seen == (0.0, 0.0)
+    assert adapter.snapshots == 2
+
+
+class BlockingOrder(AbstractOrder):
+    """
+    Holds its worker thread until released, like a slow exchange request.
+    """
+
+    def __init__(self, *args, release, started, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = release
+        self.started = started
+
+    def process(self, snapshot=None):
+        self.started.set()
+        self.release.wait(5)
+        self.state = self.State.COMPLETED
+
+
+def test_async_processor_stop_cancels_the_running_cycle(tmp_path):
+    release, started = threading.Event(), threading.Event()
+    blocking = BlockingOrder(
+        1, "BTC", 1.0, "", "binance", release=release, started=started
+    )
+    waiting = SnapshotRecordingOrder(2, "ETH", 1.0, "", "binance")
+    orders_file = tmp_path / "orders.json"
+    processor = AsyncOrderProcessor(
+        [blocking, waiting], max_concurrency=1, orders_file=str(orders_file)
+    )
+    thread = threading.Thread(target=processor.process_orders)
+    thread.start()
+    assert started.wait(5)
+
+    processor.stop()
+    deadline = time.monotonic() + 5
+    while processor.last_cycle_time is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # The cycle is over while the request is still in flight.
+    assert processor.last_cycle_time is not None
+    assert thread.is_alive()
+    assert not hasattr(waiting, "seen")
+
+    release.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    # The result of the request is saved once its thread is done.
+    assert '"completed"' in orders_file.read_text()
@@ -0,0 +1,30 @@
+import threading
+
+from helper.periodic_refresh import PeriodicRefresh
+
+
+class FlakyRefresh(PeriodicRefresh):
+    refresh_error = "Flaky refresh failed"
+
+    def __init__(self):
+        super().__init__(refresh_interval=0.01)
+        self.calls = 0
+        self.recovered = threading.Event()
+
+    def _refresh(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("offline")
+        self.recovered.set()
+
+
+def test_failed_refresh_is_logged_and_retried(capsys):
+    service = FlakyRefresh()
+    service.start()
+    assert service.recovered.wait(5)
+    assert service.running
+
+    service.stop()
+    service._thread.join(5)
+    assert not service.running
+    assert "Flaky refresh failed: offline" in capsys.readouterr().out
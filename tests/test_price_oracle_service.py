@@ -0,0 +1,46 @@
+import time
+
+from service.price_oracle_service import PriceOracleService
+
+
+class FakeTicker:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_prices(self):
+        self.calls += 1
+        return {"BTCUSDT": 100.0, "ETHUSDT": 10.0}
+
+
+def test_stream_prices_are_fresh_and_pause_the_poll():
+    ticker = FakeTicker()
+    oracle = PriceOracleService(ticker.fetch_prices, max_age=10)
+    oracle.refresh()
+    # The bulk table is 60 seconds old.
+    table = oracle._table
+    oracle._table = type(table)(table.prices, updated_at=time.time() - 60)
+
+    oracle.update({"BTCUSDT": 101.0})
+
+    assert oracle.streaming
+    assert oracle.get_price("btcusdt") == 101.0
+    assert ticker.calls == 1
+    oracle._refresh()
+    assert ticker.calls == 1
+
+    # Symbols the stream does not cover are still refreshed on demand.
+    assert oracle.get_price("ETHUSDT") == 10.0
+    assert ticker.calls == 2
+
+
+def test_poll_resumes_when_the_stream_goes_quiet():
+    ticker = FakeTicker()
+    oracle = PriceOracleService(ticker.fetch_prices, max_age=10)
+    oracle.update({"BTCUSDT": 101.0})
+    oracle._streamed_at -= 60
+
+    assert not oracle.streaming
+    oracle._refresh()
+    assert ticker.calls == 1
+    # The streamed price predates the download and is replaced.
+    assert oracle.get_price("BTCUSDT") == 100.0
@@ -0,0 +1,100 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from helper.request_scheduler import (
+    PRIORITY_ACCOUNT,
+    PRIORITY_DATA,
+    PRIORITY_ORDER,
+    RateLimitExceeded,
+    RequestScheduler,
+    TokenBucket,
+)
+
+KLINES_URL = "https://api.binance.com/api/v3/klines"
+ORDER_URL = "https://api.binance.com/api/v3/order"
+
+
+class FakeHttp:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append((method, url))
+        return SimpleNamespace(status_code=self.status_code, headers=self.headers)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_higher_priorities_go_first_under_contention():
+    bucket = TokenBucket(capacity=10, period=0.5)
+    bucket.acquire(10, PRIORITY_ORDER, None)  # Drained, refills 1 token per 50 ms
+    served = []
+
+    def request(priority):
+        bucket.acquire(1, priority, None)
+        served.append(priority)
+
+    threads = []
+    # Queued from the lowest priority to the highest.
+    for priority in (PRIORITY_DATA, PRIORITY_ACCOUNT, PRIORITY_ORDER):
+        thread = threading.Thread(target=request, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        wait_for(lambda: bucket.usage()["queued"] == len(threads))
+    for thread in threads:
+        thread.join(5)
+
+    assert served == [PRIORITY_ORDER, PRIORITY_ACCOUNT, PRIORITY_DATA]
+
+
+def test_market_data_is_shed_past_max_wait():
+    # Refilled at 0.009 weight per second, far slower than MAX_WAIT allows.
+    scheduler = RequestScheduler(weight_limit=10, weight_period=1000)
+    scheduler.weights.acquire(9, PRIORITY_ORDER, None)
+    http = FakeHttp()
+
+    started = time.monotonic()
+    with pytest.raises(RateLimitExceeded):
+        scheduler.send(http, "GET", KLINES_URL, params={"symbol": "BTCUSDT"})
+
+    # Shed at once instead of waiting, and never sent.
+    assert time.monotonic() - started < 1
+    assert http.sent == []
+    assert scheduler.usage()["weight"]["shed"] == 1
+
+
+def test_used_weight_header_syncs_the_budget():
+    scheduler = RequestScheduler()
+    http = FakeHttp(headers={"X-MBX-USED-WEIGHT-1M": "5000"})
+
+    scheduler.send(http, "GET", KLINES_URL, params={"symbol": "BTCUSDT"})
+
+    usage = scheduler.usage()
+    assert usage["server"] == {"x-mbx-used-weight-1m": 5000}
+    assert usage["weight"]["used"] >= 5000
+
+
+@pytest.mark.parametrize("status_code", [429, 418])
+def test_rate_limit_answer_blocks_all_requests(status_code):
+    scheduler = RequestScheduler()
+    scheduler.send(
+        FakeHttp(status_code, {"Retry-After": "0.3"}), "GET", KLINES_URL, params={}
+    )
+    assert scheduler.usage()["weight"]["blocked_seconds"] > 0.2
+
+    # Even order placement waits for the window to pass.
+    http = FakeHttp()
+    started = time.monotonic()
+    scheduler.send(http, "POST", ORDER_URL, params={})
+    assert time.monotonic() - started >= 0.25
+    assert http.sent == [("POST", ORDER_URL)]
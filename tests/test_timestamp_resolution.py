@@ -0,0 +1,36 @@
+import io
+
+import numpy as np
+
+from helper.kline_decoder import klines_to_frame
+from helper.utils import read_csv
+from model.ohlcv_buffer import OHLCVBuffer
+from service.kline_store_service import KlineStoreService
+
+KLINES = [
+    [1_700_000_000_000 + index * 60_000, "1.0", "2.0", "0.5", "1.5", "10.0"]
+    for index in range(3)
+]
+
+
+def test_candle_frames_have_nanosecond_timestamps(tmp_path):
+    decoded = klines_to_frame(KLINES)
+    buffer = OHLCVBuffer(10)
+    buffer.extend_klines(KLINES)
+    store = KlineStoreService(str(tmp_path))
+    store.append("Binance", "BTC", "1m", decoded)
+    success, csv = read_csv(
+        io.StringIO("timestamp,close\n2024-01-01,1.0\n2024-01-02,2.0\n"),
+        date_parsing=["timestamp"],
+    )
+    assert success
+
+    frames = [
+        decoded,
+        buffer.to_dataframe(),
+        store.to_frame("Binance", "BTC", "1m"),
+        csv,
+    ]
+    for frame in frames:
+        assert frame["timestamp"].dtype == np.dtype("datetime64[ns]")
+    assert (decoded["timestamp"] == buffer.to_dataframe()["timestamp"]).all()
@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import socket
+import struct
+import threading
+
+import pytest
+
+from helper.websocket_client import (
+    OPCODE_CLOSE,
+    OPCODE_CONTINUATION,
+    OPCODE_PING,
+    OPCODE_PONG,
+    OPCODE_TEXT,
+    WebSocketClient,
+)
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def frame(opcode, payload, fin=True, mask=None):
+    header = bytes([(0x80 if fin else 0) | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header += bytes([mask_bit | length])
+    elif length < 1 << 16:
+        header += bytes([mask_bit | 126]) + struct.pack("!H", length)
+    else:
+        header += bytes([mask_bit | 127]) + struct.pack("!Q", length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        header += mask
+    return header + payload
+
+
+def read_exact(conn, size):
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        assert chunk
+        data += chunk
+    return data
+
+
+def read_frame(conn):
+    """
+    (opcode, payload) of a frame sent by the client, which must be masked.
+    """
+    first, second = read_exact(conn, 2)
+    assert second & 0x80
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", read_exact(conn, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", read_exact(conn, 8))
+    mask = read_exact(conn, 4)
+    payload = read_exact(conn, length)
+    return first & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+@pytest.fixture
+def server():
+    """
+    Local WebSocket server running `script(conn)` after the handshake;
+    returns a connected client and a function waiting for the script's result.
+    """
+    listener = socket.create_server(("127.0.0.1", 0))
+    threads = []
+
+    def start(script):
+        received = {}
+
+        def serve():
+            conn, _ = listener.accept()
+            with conn:
+                request = b""
+                while b"\r\n\r\n" not in request:
+                    request += conn.recv(4096)
+                key = next(
+                    line.split(b":", 1)[1].strip()
+                    for line in request.split(b"\r\n")
+                    if line.lower().startswith(b"sec-websocket-key")
+                )
+                accept = base64.b64encode(
+                    hashlib.sha1(key + _GUID.encode()).digest()
+                )
+                conn.sendall(
+                    b"HTTP/1.1 101 Switching Protocols\r\n"
+                    b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                    b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+                )
+                received["result"] = script(conn)
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        threads.append(thread)
+        port = listener.getsockname()[1]
+        client = WebSocketClient(f"ws://127.0.0.1:{port}/stream", timeout=5)
+        client.connect()
+
+        def result():
+            thread.join(5)
+            return received["result"]
+
+        return client, result
+
+    yield start
+    for thread in threads:
+        thread.join(5)
+    listener.close()
+
+
+def test_masked_and_extended_length_frames(server):
+    medium = "m" * 300  # 16-bit length
+    large = "l" * 70_000  # 64-bit length
+
+    def script(conn):
+        conn.sendall(frame(OPCODE_TEXT, b"short", mask=b"\x01\x02\x03\x04"))
+        conn.sendall(frame(OPCODE_TEXT, medium.encode(), mask=b"\xff\x00\xaa\x55"))
+        conn.sendall(frame(OPCODE_TEXT, large.encode()))
+
+    client, _ = server(script)
+    assert client.recv() == "short"
+    assert client.recv() == medium
+    assert client.recv() == large
+    client.close()
+
+
+def test_fragmented_message_with_interleaved_ping(server):
+    def script(conn):
+        conn.sendall(frame(OPCODE_TEXT, b"hel", fin=False))
+        conn.sendall(frame(OPCODE_PING, b"keepalive"))
+        conn.sendall(frame(OPCODE_CONTINUATION, "lo wörld".encode()[:5], fin=False))
+        conn.sendall(frame(OPCODE_CONTINUATION, "lo wörld".encode()[5:]))
+        return read_frame(conn)
+
+    client, result = server(script)
+    assert client.recv() == "hello wörld"
+    assert result() == (OPCODE_PONG, b"keepalive")
+    client.close()
+
+
+def test_ping_is_answered_with_pong(server):
+    def script(conn):
+        conn.sendall(frame(OPCODE_PING, b"abc"))
+        conn.sendall(frame(OPCODE_TEXT, b"after"))
+        return read_frame(conn)
+
+    client, result = server(script)
+    assert client.recv() == "after"
+    assert result() == (OPCODE_PONG, b"abc")
+    client.close()
+
+
+def test_close_is_echoed_and_ends_the_stream(server):
+    def script(conn):
+        conn.sendall(frame(OPCODE_CLOSE, struct.pack("!H", 1001) + b"going away"))
+        return read_frame(conn)
+
+    client, result = server(script)
+    assert client.recv() is None
+    assert not client.connected
+    assert result() == (OPCODE_CLOSE, struct.pack("!H", 1001))
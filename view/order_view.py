@@ -18,6 +18,7 @@ class OrderView(QtWidgets.QWidget):
         # Find the QListWidget in the UI.
         self.orderListWidget = self.findChild(QtWidgets.QListWidget, "orderListWidget")
         self.positionComboBox = self.findChild(QComboBox, "positionComboBox")
+        self.prefetchProgressBar.hide()
         self.orders_lock = threading.Lock()  # Lock for thread safety
 
     def add_custom_list_item(self, order: AbstractOrder):
@@ -54,6 +55,24 @@ class OrderView(QtWidgets.QWidget):
             for order in orders:
                 self.add_custom_list_item(order)
 
+    @QtCore.pyqtSlot(object)
+    def update_prefetch_progress(self, progress: dict):
+        """
+        Show the chart prefetch queue (ChartPrefetchService.progress()).
+        """
+        if progress["pending"]:
+            self.prefetchProgressBar.setMaximum(progress["total"])
+            self.prefetchProgressBar.setValue(progress["done"])
+            self.prefetchProgressBar.show()
+            self.prefetchLabel.setText(
+                f"Loading charts {progress['done']}/{progress['total']}"
+                f" ({progress['current'] or '...'})"
+            )
+            return
+        self.prefetchProgressBar.hide()
+        failed = f", {progress['failed']} failed" if progress["failed"] else ""
+        self.prefetchLabel.setText(f"Charts ready ({progress['total']}{failed})")
+
     def clear_input_fields(self):
         self.assetLineEdit.clear()
         self.amountLineEdit.clear()